@@ -2,10 +2,9 @@
 
 SONIC_BGPCFGD = sonic_bgpcfgd-1.0-py3-none-any.whl
 $(SONIC_BGPCFGD)_SRC_PATH = $(SRC_PATH)/sonic-bgpcfgd
-# These dependencies are only needed because they are dependencies
-# of sonic-config-engine and bgpcfgd explicitly calls sonic-cfggen
-# as part of its unit tests.
-# TODO: Refactor unit tests so that these dependencies are not needed
+# bgpcfgd imports the jinja2 filters of sonic-config-engine (ip_filters)
+# to render the FRR templates, and its unit tests call sonic-cfggen.
+# The other dependencies are the dependencies of sonic-config-engine.
 
 $(SONIC_BGPCFGD)_DEPENDS += $(SONIC_CONFIG_ENGINE_PY3) \
                             $(SONIC_YANG_MGMT_PY3) \
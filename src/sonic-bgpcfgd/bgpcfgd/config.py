@@ -1,23 +1,63 @@
+import re
+import time
+
+from collections import OrderedDict
+
+from .log import log_crit, log_debug
+
+
 class ConfigMgr(object):
     """ The class represents frr configuration """
-    def __init__(self, frr):
+    def __init__(self, frr, commit_interval=0.0):
+        """
+        Constructor
+        :param frr: FRR object
+        :param commit_interval: seconds to collect changes for, before they are written to FRR.
+                                Changes are written by the first commit() after the interval
+                                has passed since the oldest change was pushed.
+        """
         self.frr = frr
+        self.commit_interval = commit_interval
         self.current_config = None
         self.current_config_raw = None
+        self.current_config_index = None
         self.changes = ""
         self.peer_groups_to_restart = []
+        self.pending_since = None
+        self.metrics = {
+            'commits': 0,
+            'failed_commits': 0,
+            'lines': 0,
+            'peer_group_restarts': 0,
+            'last_lines': 0,
+            'last_delay': 0.0,
+            'last_latency': 0.0,
+            'max_latency': 0.0,
+            'total_latency': 0.0,
+        }
 
     def reset(self):
         """ Reset stored config """
-        self.current_config = None
-        self.current_config_raw = None
+        self.expire()
         self.changes = ""
         self.peer_groups_to_restart = []
+        self.pending_since = None
 
-    def update(self):
-        """ Read current config from FRR """
+    def expire(self):
+        """ Drop the config read from FRR, the next update() will read it again """
         self.current_config = None
         self.current_config_raw = None
+        self.current_config_index = None
+
+    def update(self):
+        """
+        Read current config from FRR. The config is read at most once per commit cycle:
+        it is kept until the next commit(), unless there are changes to write before.
+        """
+        if self.changes.strip() != "" and not self.commit(force=True):
+            log_crit("ConfigMgr::update(): can't write pending changes before reading the config")
+        if self.current_config_raw is not None:
+            return
         out = self.frr.get_config()
         text = []
         for line in out.split('\n'):
@@ -26,6 +66,7 @@ class ConfigMgr(object):
             text.append(line)
         text += ["     "]  # Add empty line to have something to work on, if there is no text
         self.current_config_raw = text
+        self.current_config_index = None  # built from the new text on the next get_index()
         self.current_config = self.to_canonical(out)  # FIXME: use text as an input
 
     def push_list(self, cmdlist):
@@ -33,6 +74,7 @@ class ConfigMgr(object):
         Prepare new changes for FRR. The changes should be committed by self.commit()
         :param cmdlist: configuration change for FRR. Type: List of Strings
         """
+        self.mark_pending()
         self.changes += "\n".join(cmdlist) + "\n"
 
     def push(self, cmd):
@@ -40,9 +82,15 @@ class ConfigMgr(object):
         Prepare new changes for FRR. The changes should be committed by self.commit()
         :param cmd: configuration change for FRR. Type: String
         """
+        self.mark_pending()
         self.changes += cmd + "\n"
         return True
 
+    def mark_pending(self):
+        """ Remember when the oldest uncommitted change was pushed """
+        if self.pending_since is None:
+            self.pending_since = time.monotonic()
+
     def restart_peer_groups(self, peer_groups):
         """
         Schedule peer_groups for restart on commit
@@ -50,21 +98,70 @@ class ConfigMgr(object):
         """
         self.peer_groups_to_restart.extend(peer_groups)
 
-    def commit(self):
+    def get_commit_timeout(self):
         """
-        Write configuration change to FRR.
-        :return: True if change was applied successfully, False otherwise
+        Get the time left until the pending changes are due to be committed
+        :return: number of seconds, or None if there are no pending changes
         """
         if self.changes.strip() == "":
+            return None
+        if self.pending_since is None:
+            return 0.0
+        return max(0.0, self.pending_since + self.commit_interval - time.monotonic())
+
+    def commit(self, force=False):
+        """
+        Write configuration change to FRR, in one vtysh invocation for the configuration
+        and one for the peer-group restarts.
+        :param force: write the changes, even if the commit interval hasn't passed yet
+        :return: True if change was applied successfully or postponed, False otherwise
+        """
+        self.expire()
+        if self.changes.strip() == "":
+            return True
+        if not force and self.get_commit_timeout() > 0.0:
             return True
+        start = time.monotonic()
+        delay = start - self.pending_since if self.pending_since is not None else 0.0
+        lines = self.changes.count("\n")
+        peer_groups = sorted(set(self.peer_groups_to_restart))
         rc_write = self.frr.write(self.changes)
-        rc_restart = self.frr.restart_peer_groups(self.peer_groups_to_restart)
+        rc_restart = self.frr.restart_peer_groups(peer_groups)
         self.reset()
+        self.update_metrics(lines, len(peer_groups), delay, time.monotonic() - start, rc_write and rc_restart)
         return rc_write and rc_restart
 
+    def update_metrics(self, lines, peer_groups, delay, latency, success):
+        """ Account a commit in the metrics """
+        self.metrics['commits'] += 1
+        if not success:
+            self.metrics['failed_commits'] += 1
+        self.metrics['lines'] += lines
+        self.metrics['peer_group_restarts'] += peer_groups
+        self.metrics['last_lines'] = lines
+        self.metrics['last_delay'] = delay
+        self.metrics['last_latency'] = latency
+        self.metrics['max_latency'] = max(self.metrics['max_latency'], latency)
+        self.metrics['total_latency'] += latency
+        log_debug("ConfigMgr::commit(): %d lines, %d peer-groups restarted, waited %.3fs, took %.3fs"
+                  % (lines, peer_groups, delay, latency))
+
+    def get_metrics(self):
+        """ Get a copy of the commit metrics """
+        return dict(self.metrics)
+
     def get_text(self):
         return self.current_config_raw
 
+    def get_index(self):
+        """
+        Get the index of the config read by update()
+        :return: ConfigIndex object
+        """
+        if self.current_config_index is None:
+            self.current_config_index = ConfigIndex(self.current_config_raw or [])
+        return self.current_config_index
+
     @staticmethod
     def to_canonical(raw_config):
         """
@@ -111,4 +208,90 @@ class ConfigMgr(object):
             spaces = len(lines) - 1
             out += " " * spaces + lines[-1] + "\n"
 
-        return out
\ No newline at end of file
+        return out
+
+
+class ConfigIndex(object):
+    """ Prefix-lists, community-lists, route-maps and peer-groups of a FRR config, indexed by name """
+    RE_PREFIX_LIST = re.compile(r'^(ip|ipv6) prefix-list (\S+) seq (\S+) (.*)$')
+    RE_COMMUNITY_LIST = re.compile(r'^bgp community-list standard (\S+) permit (.*)$')
+    RE_ROUTE_MAP = re.compile(r'^route-map (\S+) (permit|deny) (\d+)$')
+    RE_PEER_GROUP = re.compile(r'^\s*neighbor (\S+) peer-group$')
+    RE_NEIGHBOR_ROUTE_MAP_IN = re.compile(r'^\s*neighbor (\S+) route-map (\S+) in$')
+
+    def __init__(self, text):
+        """
+        Build the index in a single pass over the config
+        :param text: config lines, as returned by ConfigMgr.get_text()
+        """
+        self.prefix_lists = {}        # (family, name) -> list of rules, without sequence numbers
+        self.community_lists = {}     # name -> value of the first 'permit' entry
+        self.route_maps = {}          # name -> OrderedDict: sequence number -> (action, list of entry lines)
+        self.peer_groups = []         # peer-group names in the config order
+        self.neighbor_route_maps_in = {}  # neighbor or peer-group -> name of the inbound route-map
+        entry_lines = None
+        for line in text:
+            s_line = line.strip()
+            if entry_lines is not None and line[:1].isspace():
+                entry_lines.append(s_line)
+            else:
+                entry_lines = None
+            if s_line.startswith('neighbor '):
+                self.__index_neighbor(line)
+            elif line.startswith('route-map '):
+                result = self.RE_ROUTE_MAP.match(line)
+                if result:
+                    name, action, seq = result.groups()
+                    entry_lines = []
+                    self.route_maps.setdefault(name, OrderedDict())[int(seq)] = action, entry_lines
+            elif line.startswith('ip') and ' prefix-list ' in line:
+                result = self.RE_PREFIX_LIST.match(line.rstrip())
+                if result:
+                    family, name, _, rule = result.groups()
+                    self.prefix_lists.setdefault((family, name), []).append(rule)
+            elif s_line.startswith('bgp community-list standard '):
+                result = self.RE_COMMUNITY_LIST.match(s_line)
+                if result and result.group(1) not in self.community_lists:
+                    self.community_lists[result.group(1)] = result.group(2)
+
+    def __index_neighbor(self, line):
+        result = self.RE_PEER_GROUP.match(line)
+        if result:
+            self.peer_groups.append(result.group(1))
+            return
+        result = self.RE_NEIGHBOR_ROUTE_MAP_IN.match(line)
+        if result:
+            self.neighbor_route_maps_in.setdefault(result.group(1), result.group(2))
+
+    def get_prefix_list(self, family, name):
+        """
+        Get rules of a prefix-list
+        :param family: 'ip' or 'ipv6'
+        :param name: name of the prefix-list
+        :return: a list of rules, like 'permit 10.0.0.0/8 le 32', or None if the prefix-list doesn't exist
+        """
+        return self.prefix_lists.get((family, name))
+
+    def get_community_list(self, name):
+        """
+        Get the value of a standard community-list
+        :param name: name of the community-list
+        :return: the community value, or None if the community-list doesn't exist
+        """
+        return self.community_lists.get(name)
+
+    def get_route_map(self, name):
+        """
+        Get entries of a route-map
+        :param name: name of the route-map
+        :return: OrderedDict: sequence number -> (action, list of stripped entry lines)
+        """
+        return self.route_maps.get(name, OrderedDict())
+
+    def get_route_map_in(self, neighbor):
+        """
+        Get the inbound route-map of a neighbor or a peer-group
+        :param neighbor: neighbor address or peer-group name
+        :return: name of the route-map, or None
+        """
+        return self.neighbor_route_maps_in.get(neighbor)
@@ -9,6 +9,15 @@ class Directory(object):
     def __init__(self):
         self.data = defaultdict(dict)  # storage. A key is a slot name, a value is a dictionary with data
         self.notify = defaultdict(lambda: defaultdict(list))  # registered callbacks: slot -> path -> handlers[]
+        self.notify_index = defaultdict(lambda: defaultdict(set))  # slot -> first key of the path -> paths
+        self.notified = set()  # (slot, path) pairs which handlers were notified as available
+        self.key_waiters = defaultdict(lambda: defaultdict(list))  # one-shot callbacks: slot -> key -> handlers[]
+        self.versions = defaultdict(int)  # slot -> number of changes of the slot
+        self.counters = {
+            'puts': 0,           # number of put() calls
+            'notifications': 0,  # number of handlers called on a path becoming available
+            'key_wakeups': 0,    # number of handlers called on a key being put
+        }
 
     @staticmethod
     def get_slot_name(db, table):
@@ -71,12 +80,58 @@ class Directory(object):
         """
         slot = self.get_slot_name(db, table)
         self.data[slot][key] = value
-        if slot in self.notify:
-            for path in self.notify[slot].keys():
-                if self.path_exist(db, table, path):
-                    for handler in self.notify[slot][path]:
+        self.versions[slot] += 1
+        self.counters['puts'] += 1
+        if slot in self.key_waiters:
+            self.__wake_key_waiters(slot, key)
+        if slot in self.notify_index:
+            paths = self.__get_dependent_paths(slot, key)
+            # The new value could miss a path the old value had
+            self.__forget_unavailable(slot, paths)
+            for path in paths:
+                if (slot, path) not in self.notified and self.path_traverse(slot, path)[0]:
+                    self.notified.add((slot, path))
+                    for handler in list(self.notify[slot][path]):
+                        self.counters['notifications'] += 1
                         handler()
 
+    def __get_dependent_paths(self, slot, key):
+        """
+        Get subscribed paths of the slot which could be changed by putting or removing the key
+        :param slot: slot name
+        :param key: changed key
+        :return: a list of paths
+        """
+        index = self.notify_index[slot]
+        paths = list(index.get(key, ()))
+        if key != '':
+            paths.extend(index.get('', ()))
+        return paths
+
+    def __wake_key_waiters(self, slot, key):
+        """
+        Run and forget handlers which are waiting for the key or for any key in the slot
+        :param slot: slot name
+        :param key: the key which was put
+        """
+        waiters = self.key_waiters[slot]
+        handlers = waiters.pop(key, []) + waiters.pop(None, [])
+        if not waiters:
+            del self.key_waiters[slot]
+        for handler in handlers:
+            self.counters['key_wakeups'] += 1
+            handler()
+
+    def __forget_unavailable(self, slot, paths):
+        """
+        Forget notifications about paths which are not available anymore, so they are notified again when added back
+        :param slot: slot name
+        :param paths: paths to check
+        """
+        for path in paths:
+            if (slot, path) in self.notified and not self.path_traverse(slot, path)[0]:
+                self.notified.discard((slot, path))
+
     def get(self, db, table, key):
         """
         Get a value from the storage
@@ -98,6 +153,16 @@ class Directory(object):
         slot = self.get_slot_name(db, table)
         return self.data[slot]
 
+    def get_slot_version(self, db, table):
+        """
+        Get a number which changes every time the slot is changed. It allows to cache objects derived from the slot
+        :param db: db name
+        :param table: table name
+        :return: version of the slot
+        """
+        slot = self.get_slot_name(db, table)
+        return self.versions.get(slot, 0)
+
     def remove(self, db, table, key):
         """
         Remove a value from the storage
@@ -109,6 +174,8 @@ class Directory(object):
         if slot in self.data:
             if key in self.data[slot]:
                 del self.data[slot][key]
+                self.versions[slot] += 1
+                self.__forget_unavailable(slot, self.__get_dependent_paths(slot, key))
             else:
                 log_err("Directory: Can't remove key '%s' from slot '%s'. The key doesn't exist" % (key, slot))
         else:
@@ -123,6 +190,8 @@ class Directory(object):
         slot = self.get_slot_name(db, table)
         if slot in self.data:
             del self.data[slot]
+            self.versions[slot] += 1
+            self.__forget_unavailable(slot, list(self.notify[slot].keys()) if slot in self.notify else [])
         else:
             log_err("Directory: Can't remove slot '%s'. The slot doesn't exist" % slot)
 
@@ -149,11 +218,34 @@ class Directory(object):
 
     def subscribe(self, deps, handler):
         """
-        Subscribe the handler to be run as soon as all dependencies are presented
-        :param deps:
-        :param handler:
-        :return:
+        Subscribe the handler to be run as soon as all dependencies are presented.
+        The handler runs every time one of the dependencies becomes available, not on every change of the slot
+        :param deps: list of dependencies
+        :param handler: callback without arguments
         """
         for db, table, path in deps:
             slot = self.get_slot_name(db, table)
-            self.notify[slot][path].append(handler)
\ No newline at end of file
+            self.notify[slot][path].append(handler)
+            self.notify_index[slot][path.split("/", 1)[0]].add(path)
+            if self.path_traverse(slot, path)[0]:
+                self.notified.add((slot, path))
+
+    def wait_key(self, db, table, key, handler):
+        """
+        Run the handler once, as soon as the key is put into the storage
+        :param db: db name
+        :param table: table name
+        :param key: key to wait for. None to wait for any key of the table
+        :param handler: callback without arguments
+        """
+        slot = self.get_slot_name(db, table)
+        self.key_waiters[slot][key].append(handler)
+
+    def get_counters(self):
+        """
+        Get the notification counters and the number of pending one-shot handlers
+        :return: dictionary with counters
+        """
+        counters = dict(self.counters)
+        counters['key_waiters'] = sum(len(handlers) for waiters in self.key_waiters.values() for handlers in waiters.values())
+        return counters
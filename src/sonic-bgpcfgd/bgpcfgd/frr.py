@@ -5,6 +5,7 @@ import tempfile
 
 from bgpcfgd.log import log_err, log_info, log_warn, log_crit
 from .vars import g_debug
+from .stats import g_stats
 from .utils import run_command
 
 
@@ -32,7 +33,8 @@ class FRR(object):
 
     @staticmethod
     def get_config():
-        ret_code, out, err = run_command(["vtysh", "-c", "show running-config"])
+        with g_stats.timer("vtysh|get_config"):
+            ret_code, out, err = run_command(["vtysh", "-c", "show running-config"])
         if ret_code != 0:
             log_crit("can't update running config: rc=%d out='%s' err='%s'" % (ret_code, out, err))
             return ""
@@ -45,7 +47,8 @@ class FRR(object):
         with open(tmp_filename, 'w') as fp:
             fp.write("%s\n" % config_text)
         command = ["vtysh", "-f", tmp_filename]
-        ret_code, out, err = run_command(command)
+        with g_stats.timer("vtysh|write"):
+            ret_code, out, err = run_command(command)
         if ret_code != 0:
             err_tuple = tmp_filename, ret_code, out, err
             log_err("ConfigMgr::commit(): can't push configuration from file='%s', rc='%d', stdout='%s', stderr='%s'" % err_tuple)
@@ -57,11 +60,21 @@ class FRR(object):
     @staticmethod
     def restart_peer_groups(peer_groups):
         """ Restart peer-groups which support BBR
+        All peer-groups are restarted by one vtysh invocation. vtysh stops on the first failing command,
+        so in case of a failure the peer-groups are restarted one by one to restart and report all of them.
         :param peer_groups: List of peer_groups to restart
         :return: True if restart of all peer-groups was successful, False otherwise
         """
+        peer_groups = sorted(set(peer_groups))
+        if len(peer_groups) > 1:
+            command = ["vtysh"]
+            for peer_group in peer_groups:
+                command += ["-c", "clear bgp peer-group %s soft in" % peer_group]
+            rc, _, _ = run_command(command, hide_errors=True)
+            if rc == 0:
+                return True
         res = True
-        for peer_group in sorted(peer_groups):
+        for peer_group in peer_groups:
             rc, out, err = run_command(["vtysh", "-c", "clear bgp peer-group %s soft in" % peer_group])
             if rc != 0:
                 log_value = peer_group, rc, out, err
@@ -18,6 +18,7 @@ from .managers_intf import InterfaceMgr
 from .managers_setsrc import ZebraSetSrc
 from .managers_static_rt import StaticRouteMgr
 from .runner import Runner, signal_handler
+from .stats import profile_signal_handler
 from .template import TemplateFabric
 from .utils import read_constants
 from .frr import FRR
@@ -29,11 +30,13 @@ def do_work():
     frr = FRR(["bgpd", "zebra", "staticd"])
     frr.wait_for_daemons(seconds=20)
     #
+    constants = read_constants()
+    commit_interval = constants.get('bgp', {}).get('commit', {}).get('interval', 0.0)
     common_objs = {
         'directory': Directory(),
-        'cfg_mgr':   ConfigMgr(frr),
+        'cfg_mgr':   ConfigMgr(frr, commit_interval),
         'tf':        TemplateFabric(),
-        'constants': read_constants(),
+        'constants': constants,
     }
     managers = [
         # Config DB managers
@@ -75,6 +78,7 @@ def main():
         syslog.openlog('bgpcfgd')
         signal.signal(signal.SIGTERM, signal_handler)
         signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGUSR1, profile_signal_handler)
         do_work()
     except KeyboardInterrupt:
         log_notice("Keyboard interrupt")
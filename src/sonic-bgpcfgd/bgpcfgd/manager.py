@@ -1,6 +1,10 @@
+from collections import OrderedDict, defaultdict
+from functools import partial
+
 from swsscommon import swsscommon
 
 from .log import log_debug, log_err
+from .stats import g_stats
 
 
 class Manager(object):
@@ -19,7 +23,16 @@ class Manager(object):
         self.deps = deps
         self.db_name = database
         self.table_name = table_name
-        self.set_queue = []
+        self.set_queue = []  # 'SET' messages which wait for the dependencies of the manager
+        self.blocked = OrderedDict()  # 'SET' messages which set_handler() returned False for: id -> (key, data, waits)
+        self.blocked_by = defaultdict(list)  # (db, table, key) the blocked messages wait for -> ids of the messages
+        self.key_waits = set()  # (db, table, key) which have a handler registered with Directory.wait_key()
+        self.blocked_id = 0
+        self.waits = None  # keys reported by set_handler() with self.wait_for()
+        self.counters = {
+            'wakeups': 0,  # number of times the manager was notified about an available dependency
+            'retries': 0,  # number of set_handler() calls for queued messages
+        }
         self.directory.subscribe(deps, self.on_deps_change)  # subscribe this class method on directory changes
 
     def get_database(self):
@@ -37,12 +50,15 @@ class Manager(object):
         :param op: operation on the table entry. Could be either 'SET' or 'DEL'
         :param data: associated data of the event. Empty for 'DEL' operation.
         """
+        with g_stats.timer("handler|%s|%s" % (self.table_name, op)):
+            self.handle(key, op, data)
+
+    def handle(self, key, op, data):
+        """ Implementation of self.handler() """
         if op == swsscommon.SET_COMMAND:
             if self.directory.available_deps(self.deps):  # all required dependencies are set in the Directory?
-                res = self.set_handler(key, data)
-                if not res:  # set handler returned False, which means it is not ready to process is. Save it for later.
+                if not self.run_set_handler(key, data):
                     log_debug("'SET' handler returned NOT_READY for the Manager: %s" % self.__class__)
-                    self.set_queue.append((key, data))
             else:
                 log_debug("Not all dependencies are met for the Manager: %s" % self.__class__)
                 self.set_queue.append((key, data))
@@ -51,16 +67,125 @@ class Manager(object):
         else:
             log_err("Invalid operation '%s' for key '%s'" % (op, key))
 
+    def handler_bulk(self, items):
+        """
+        This method is executed on a batch of 'SET' events, like the entries which are in the table at start.
+        :param items: a list of (key, data) tuples
+        """
+        if self.directory.available_deps(self.deps):
+            with g_stats.timer("handler|%s|SET_BULK" % self.table_name):
+                self.set_handler_bulk(items)
+        else:
+            log_debug("Not all dependencies are met for the Manager: %s" % self.__class__)
+            self.set_queue.extend(items)
+
+    def set_handler_bulk(self, items):
+        """
+        Process a batch of 'SET' messages. Managers may override it to prepare the configuration
+        for the whole batch at once. Every message should still be passed to self.run_set_handler(),
+        so the messages which aren't ready are saved for later.
+        :param items: a list of (key, data) tuples
+        """
+        for key, data in items:
+            self.run_set_handler(key, data)
+
+    def run_set_handler(self, key, data):
+        """
+        Run set_handler(). If it isn't ready to process the message, save the message until
+        one of the keys reported with self.wait_for() is put into the Directory.
+        Without reported keys the message waits for any change in the tables of the manager dependencies
+        :param key: key of the table entry
+        :param data: associated data of the event
+        :return: the result of set_handler()
+        """
+        saved_waits, self.waits = self.waits, []
+        try:
+            res = self.set_handler(key, data)
+            waits = self.waits
+        finally:
+            self.waits = saved_waits
+        if not res:
+            if not waits:
+                waits = [(db, table, None) for db, table, _ in self.deps]
+            if waits:
+                self.block(key, data, waits)
+            else:  # nothing to wait for. Keep it as it was
+                self.set_queue.append((key, data))
+        return res
+
+    def wait_for(self, db, table, key=None):
+        """
+        Report from set_handler() which key in the Directory the message waits for.
+        Must be followed by returning False from set_handler()
+        :param db: db name
+        :param table: table name
+        :param key: key of the table. None means any key of the table
+        """
+        if self.waits is not None:
+            self.waits.append((db, table, key))
+
+    def block(self, key, data, waits):
+        """
+        Save a message until one of the keys is put into the Directory
+        :param key: key of the table entry
+        :param data: associated data of the event
+        :param waits: list of (db, table, key) tuples
+        """
+        self.blocked_id += 1
+        waits = set(waits)
+        self.blocked[self.blocked_id] = key, data, waits
+        for wait in waits:
+            if wait not in self.key_waits:
+                self.key_waits.add(wait)
+                self.directory.wait_key(*wait, handler=partial(self.on_key_change, wait))
+            self.blocked_by[wait].append(self.blocked_id)
+
+    def on_key_change(self, wait):
+        """
+        This method is being executed when a key, which blocked messages wait for, is put into the Directory
+        :param wait: (db, table, key) tuple
+        """
+        self.counters['wakeups'] += 1
+        self.key_waits.discard(wait)
+        for blocked_id in self.blocked_by.pop(wait, []):
+            if blocked_id in self.blocked:
+                key, data, waits = self.blocked.pop(blocked_id)
+                self.forget_blocked_id(blocked_id, waits)
+                self.counters['retries'] += 1
+                self.run_set_handler(key, data)
+
+    def forget_blocked_id(self, blocked_id, waits):
+        """
+        Remove the id of a message, which isn't blocked anymore, from the lists of the other keys it waited for
+        :param blocked_id: id of the message
+        :param waits: (db, table, key) tuples the message waited for
+        """
+        for wait in waits:
+            if wait in self.blocked_by:
+                ids = self.blocked_by[wait]
+                if blocked_id in ids:
+                    ids.remove(blocked_id)
+                if not ids:
+                    del self.blocked_by[wait]
+
     def on_deps_change(self):
-        """ This method is being executed on every dependency change """
+        """ This method is being executed when one of the dependencies becomes available """
+        self.counters['wakeups'] += 1
         if not self.directory.available_deps(self.deps):
             return
-        new_queue = []
-        for key, data in self.set_queue:
-            res = self.set_handler(key, data)
-            if not res:
-                new_queue.append((key, data))
-        self.set_queue = new_queue
+        queue, self.set_queue = self.set_queue, []
+        self.counters['retries'] += len(queue)
+        self.set_handler_bulk(queue)
+
+    def get_counters(self):
+        """
+        Get queue lengths and wakeup counters of the manager
+        :return: dictionary with counters
+        """
+        counters = dict(self.counters)
+        counters['set_queue'] = len(self.set_queue)
+        counters['blocked'] = len(self.blocked)
+        return counters
 
     def set_handler(self, key, data):
         """ Placeholder for 'SET' command """
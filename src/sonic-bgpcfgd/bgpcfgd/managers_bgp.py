@@ -1,4 +1,7 @@
+import hashlib
 import json
+from collections import OrderedDict
+
 from swsscommon import swsscommon
 
 import jinja2
@@ -6,12 +9,15 @@ import netaddr
 
 from .log import log_warn, log_err, log_info, log_debug, log_crit
 from .manager import Manager
+from .stats import g_stats
 from .template import TemplateFabric
 from .utils import run_command
 
 
 class BGPPeerGroupMgr(object):
     """ This class represents peer-group and routing policy for the peer_type """
+    MAX_RENDERED = 64  # maximum number of cached rendered peer-groups and policies
+
     def __init__(self, common_objs, base_template):
         """
         Construct the object
@@ -23,6 +29,20 @@ class BGPPeerGroupMgr(object):
         tf = common_objs['tf']
         self.policy_template = tf.from_file(base_template + "policies.conf.j2")
         self.peergroup_template = tf.from_file(base_template + "peer-group.conf.j2")
+        self.stats_name = "render|" + base_template.rstrip("/").split("/")[-1]
+        self.bulk_updates = None
+        self.rendered = {}  # hash of the rendering inputs -> (policy, peer-group commands)
+        self.applied = {}   # (entity, vrf) -> (the commands which were pushed last time, failed commits count then)
+
+    def begin_bulk(self):
+        """ Postpone the updates until end_bulk(). The peer-group and policy are rendered once per vrf then """
+        self.bulk_updates = OrderedDict()
+
+    def end_bulk(self):
+        """ Render and push the updates postponed since begin_bulk() """
+        updates, self.bulk_updates = self.bulk_updates, None
+        for name, kwargs in (updates or {}).values():
+            self.update(name, **kwargs)
 
     def update(self, name, **kwargs):
         """
@@ -30,42 +50,90 @@ class BGPPeerGroupMgr(object):
         :param name: name of the peer. Used for logging only
         :param kwargs: dictionary with parameters for rendering
         """
-        rc_policy = self.update_policy(name, **kwargs)
-        rc_pg = self.update_pg(name, **kwargs)
-        return rc_policy and rc_pg
+        if self.bulk_updates is not None:
+            # peer-group and policy templates don't depend on the peer, but on the vrf and the Directory data
+            self.bulk_updates[kwargs['vrf']] = name, kwargs
+            return True
+        key = self.get_inputs_hash(kwargs)
+        if key not in self.rendered:
+            policy = self.render_policy(name, **kwargs)
+            pg = self.render_pg(name, **kwargs)
+            if policy is None or pg is None:
+                return False
+            if len(self.rendered) >= self.MAX_RENDERED:
+                self.rendered.clear()
+            self.rendered[key] = policy, pg
+        policy, pg = self.rendered[key]
+        self.update_entity_if_changed(("policy", kwargs['vrf']), policy, "Routing policy for peer '%s'" % name)
+        self.update_entity_if_changed(("peer-group", kwargs['vrf']), pg, "Peer-group for peer '%s'" % name)
+        return True
+
+    @staticmethod
+    def get_inputs_hash(kwargs):
+        """
+        Calculate a hash of the parameters which the peer-group and policy templates depend on.
+        The peer related parameters are not included, as the templates don't use them
+        :param kwargs: dictionary with parameters for rendering
+        :return: hash as a string
+        """
+        inputs = [
+            kwargs['vrf'],
+            kwargs['bgp_asn'],
+            kwargs['loopback0_ipv4'],
+            kwargs['CONFIG_DB__DEVICE_METADATA'],
+            kwargs['CONFIG_DB__BGP_BBR'],
+            sorted(kwargs['CONFIG_DB__LOOPBACK_INTERFACE'].keys()),
+            kwargs.get('allow_list_default_action'),
+        ]
+        return hashlib.sha1(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
 
-    def update_policy(self, name, **kwargs):
+    def render_policy(self, name, **kwargs):
         """
-        Update routing policy for the peer
+        Render routing policy for the peer
         :param name: name of the peer. Used for logging only
         :param kwargs: dictionary with parameters for rendering
+        :return: rendered policy, None if the rendering failed
         """
         try:
-            policy = self.policy_template.render(**kwargs)
+            with g_stats.timer(self.stats_name + "|policy"):
+                return self.policy_template.render(**kwargs)
         except jinja2.TemplateError as e:
             log_err("Can't render policy template name: '%s': %s" % (name, str(e)))
-            return False
-        self.update_entity(policy, "Routing policy for peer '%s'" % name)
-        return True
+            return None
 
-    def update_pg(self, name, **kwargs):
+    def render_pg(self, name, **kwargs):
         """
-        Update peer-group for the peer
+        Render peer-group for the peer
         :param name: name of the peer. Used for logging only
         :param kwargs: dictionary with parameters for rendering
+        :return: rendered peer-group commands, None if the rendering failed
         """
         try:
-            pg = self.peergroup_template.render(**kwargs)
+            with g_stats.timer(self.stats_name + "|peer-group"):
+                pg = self.peergroup_template.render(**kwargs)
         except jinja2.TemplateError as e:
             log_err("Can't render peer-group template: '%s': %s" % (name, str(e)))
-            return False
+            return None
 
         if kwargs['vrf'] == 'default':
-            cmd = ('router bgp %s\n' % kwargs['bgp_asn']) + pg
+            return ('router bgp %s\n' % kwargs['bgp_asn']) + pg
         else:
-            cmd = ('router bgp %s vrf %s\n' % (kwargs['bgp_asn'], kwargs['vrf'])) + pg
-        self.update_entity(cmd, "Peer-group for peer '%s'" % name)
-        return True
+            return ('router bgp %s vrf %s\n' % (kwargs['bgp_asn'], kwargs['vrf'])) + pg
+
+    def update_entity_if_changed(self, entity, cmd, txt):
+        """
+        Send commands to FRR, unless they are the same as the commands which were sent for the entity last time
+        :param entity: (entity type, vrf) tuple
+        :param cmd: commands to send in a raw form
+        :param txt: text for the syslog output
+        """
+        # A commit failed after the push drops the commands, so they must be pushed again
+        failed_commits = self.cfg_mgr.get_metrics()['failed_commits']
+        if self.applied.get(entity) == (cmd, failed_commits):
+            log_debug("%s is not changed" % txt)
+            return
+        self.applied[entity] = cmd, failed_commits
+        self.update_entity(cmd, txt)
 
     def update_entity(self, cmd, txt):
         """
@@ -137,8 +205,27 @@ class BGPPeerMgrBase(Manager):
 
         self.peers = self.load_peers()
         self.peer_group_mgr = BGPPeerGroupMgr(self.common_objs, base_template)
+        self.bulk_ops = None
+        self.lo_interfaces = None  # (version of the LOOPBACK_INTERFACE slot, loopback interfaces in the template format)
         return
 
+    def set_handler_bulk(self, items):
+        """
+        Add a batch of peers. The peer-groups and policies are rendered once per vrf,
+        and pushed before the peers which use them
+        :param items: a list of (key, data) tuples
+        """
+        self.bulk_ops = []
+        self.peer_group_mgr.begin_bulk()
+        try:
+            for key, data in items:
+                self.run_set_handler(key, data)
+        finally:
+            ops, self.bulk_ops = self.bulk_ops, None
+            self.peer_group_mgr.end_bulk()
+            for cmd in ops:
+                self.cfg_mgr.push(cmd)
+
     def set_handler(self, key, data):
         """
          It runs on 'SET' command
@@ -166,12 +253,14 @@ class BGPPeerMgrBase(Manager):
         lo0_ipv4 = self.get_lo_ipv4("Loopback0|")
         if lo0_ipv4 is None:
             log_warn("Loopback0 ipv4 address is not presented yet")
+            self.wait_for("CONFIG_DB", swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME)
             return False
         #
         if self.peer_type == 'internal':
             lo4096_ipv4 = self.get_lo_ipv4("Loopback4096|")
             if lo4096_ipv4 is None:
                 log_warn("Loopback4096 ipv4 address is not presented yet")
+                self.wait_for("CONFIG_DB", swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME)
                 return False
 
         if "local_addr" not in data:
@@ -184,6 +273,7 @@ class BGPPeerMgrBase(Manager):
             if not interface:
                 print_data = nbr, data["local_addr"]
                 log_debug("Peer '%s' with local address '%s' wait for the corresponding interface to be set" % print_data)
+                self.wait_for_local_interface(data["local_addr"])
                 return False
             vnet = self.get_vnet(interface)
             if vnet:
@@ -200,13 +290,13 @@ class BGPPeerMgrBase(Manager):
             'neighbor_addr': nbr,
             'bgp_session': data,
             'loopback0_ipv4': lo0_ipv4,
-            'CONFIG_DB__LOOPBACK_INTERFACE':{ tuple(key.split('|')) : {} for key in self.directory.get_slot("CONFIG_DB", swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME)
-                                                                         if '|' in key }
+            'CONFIG_DB__LOOPBACK_INTERFACE': self.get_loopback_interfaces(),
         }
         if self.check_neig_meta:
             neigmeta = self.directory.get_slot("CONFIG_DB", swsscommon.CFG_DEVICE_NEIGHBOR_METADATA_TABLE_NAME)
             if 'name' in data and data["name"] not in neigmeta:
                 log_info("DEVICE_NEIGHBOR_METADATA is not ready for neighbor '%s' - '%s'" % (nbr, data['name']))
+                self.wait_for("CONFIG_DB", swsscommon.CFG_DEVICE_NEIGHBOR_METADATA_TABLE_NAME, data['name'])
                 return False
             kwargs['CONFIG_DB__DEVICE_NEIGHBOR_METADATA'] = neigmeta
 
@@ -214,7 +304,8 @@ class BGPPeerMgrBase(Manager):
         self.peer_group_mgr.update(tag, **kwargs)
 
         try:
-            cmd = self.templates["add"].render(**kwargs)
+            with g_stats.timer("render|%s|peer" % self.table_name):
+                cmd = self.templates["add"].render(**kwargs)
         except jinja2.TemplateError as e:
             msg = "Peer '(%s|%s)'. Error in rendering the template for 'SET' command '%s'" % print_data
             log_err("%s: %s" % (msg, str(e)))
@@ -305,7 +396,10 @@ class BGPPeerMgrBase(Manager):
             cmd = ('router bgp %s\n' % bgp_asn) + cmd
         else:
             cmd = ('router bgp %s vrf %s\n' % (bgp_asn, vrf)) + cmd
-        self.cfg_mgr.push(cmd)
+        if self.bulk_ops is not None:
+            self.bulk_ops.append(cmd)
+        else:
+            self.cfg_mgr.push(cmd)
         return True
 
     def get_lo_ipv4(self, loopback_str):
@@ -324,6 +418,18 @@ class BGPPeerMgrBase(Manager):
 
         return loopback0_ipv4
 
+    def get_loopback_interfaces(self):
+        """
+        Get LOOPBACK_INTERFACE ip prefixes in the format the templates expect. The object is shared
+        by all peers until the LOOPBACK_INTERFACE slot is changed, so the templates must not modify it
+        :return: dictionary: (loopback name, ip prefix) -> {}
+        """
+        version = self.directory.get_slot_version("CONFIG_DB", swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME)
+        if self.lo_interfaces is None or self.lo_interfaces[0] != version:
+            lo_slot = self.directory.get_slot("CONFIG_DB", swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME)
+            self.lo_interfaces = version, { tuple(key.split('|')) : {} for key in lo_slot if '|' in key }
+        return self.lo_interfaces[1]
+
     def get_local_interface(self, local_addr):
         """
         Get interface according to the local address from the directory
@@ -344,6 +450,17 @@ class BGPPeerMgrBase(Manager):
         else:
             return None
 
+    def wait_for_local_interface(self, local_addr):
+        """
+        Wait for the Directory key which get_local_interface() misses for the local address
+        :param: local_addr: Local address of the interface
+        """
+        local_addresses = self.directory.get_slot("LOCAL", "local_addresses")
+        if local_addr not in local_addresses:
+            self.wait_for("LOCAL", "local_addresses", local_addr)
+        elif "interface" in local_addresses[local_addr]:
+            self.wait_for("LOCAL", "interfaces", local_addresses[local_addr]["interface"])
+
     @staticmethod
     def get_vnet(interface):
         """
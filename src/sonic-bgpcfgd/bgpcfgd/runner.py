@@ -1,7 +1,10 @@
-from collections import defaultdict
+import time
+
+from collections import OrderedDict, defaultdict
 from swsscommon import swsscommon
 
 from .log import log_debug, log_crit
+from .stats import g_stats
 
 
 g_run = True
@@ -19,6 +22,8 @@ class Runner(object):
         when corresponding db/table is updated
     """
     SELECT_TIMEOUT = 1000
+    STATS_EXPORT_INTERVAL = 10.0  # seconds
+    STATS_TABLE_NAME = "BGPCFGD_STATS"
 
     def __init__(self, cfg_manager):
         """ Constructor """
@@ -26,7 +31,11 @@ class Runner(object):
         self.db_connectors = {}
         self.selector = swsscommon.Select()
         self.callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> handlers[]
-        self.subscribers = set()
+        self.bulk_callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> bulk handlers[]
+        self.subscribers = []  # in the order the managers were added
+        self.managers = []
+        self.stats_table = None
+        self.stats_exported_at = time.monotonic()
 
     def add_manager(self, manager):
         """
@@ -44,15 +53,61 @@ class Runner(object):
         if table_name not in self.callbacks[db]:
             conn = self.db_connectors[db]
             subscriber = swsscommon.SubscriberStateTable(conn, table_name)
-            self.subscribers.add(subscriber)
+            self.subscribers.append(subscriber)
             self.selector.addSelectable(subscriber)
+        self.managers.append(manager)
         self.callbacks[db][table_name].append(manager.handler)
+        self.bulk_callbacks[db][table_name].append(manager.handler_bulk)
+
+    def bootstrap(self):
+        """
+        Process the entries which are already in the subscribed tables.
+        A subscriber reads the existing entries of its table when it's created.
+        They are passed to the managers in one batch per table, in the order the managers were added,
+        so the dependencies are in the Directory before the managers which need them get their entries
+        """
+        for subscriber in self.subscribers:
+            db = subscriber.getDbConnector().getDbId()
+            table_name = subscriber.getTableName()
+            batch = OrderedDict()
+            while True:
+                key, op, fvs = subscriber.pop()
+                if not key:
+                    break
+                log_debug("Received message : '%s'" % str((key, op, fvs)))
+                g_stats.count("events|%s|%s" % (table_name, op))
+                if op == swsscommon.SET_COMMAND:
+                    batch.pop(key, None)
+                    batch[key] = dict(fvs)
+                    continue
+                self.dispatch_bulk(db, table_name, batch)
+                batch = OrderedDict()
+                for callback in self.callbacks[db][table_name]:
+                    callback(key, op, dict(fvs))
+            self.dispatch_bulk(db, table_name, batch)
+        self.commit(force=True)
+
+    def dispatch_bulk(self, db, table_name, batch):
+        """
+        Pass a batch of 'SET' entries to the bulk handlers of the table
+        :param db: db id
+        :param table_name: table name
+        :param batch: ordered dictionary: key -> data
+        """
+        if not batch:
+            return
+        log_debug("Bootstrap: %d entries of the table '%s'" % (len(batch), table_name))
+        for callback in self.bulk_callbacks[db][table_name]:
+            callback([(key, dict(data)) for key, data in batch.items()])
 
     def run(self):
         """ Main loop """
+        self.bootstrap()
         while g_run:
-            state, _ = self.selector.select(Runner.SELECT_TIMEOUT)
+            state, _ = self.selector.select(self.get_select_timeout())
             if state == self.selector.TIMEOUT:
+                self.commit()
+                self.export_stats()
                 continue
             elif state == self.selector.ERROR:
                 raise Exception("Received error from select")
@@ -63,8 +118,45 @@ class Runner(object):
                     if not key:
                         break
                     log_debug("Received message : '%s'" % str((key, op, fvs)))
+                    g_stats.count("events|%s|%s" % (subscriber.getTableName(), op))
                     for callback in self.callbacks[subscriber.getDbConnector().getDbId()][subscriber.getTableName()]:
                         callback(key, op, dict(fvs))
-            rc = self.cfg_manager.commit()
-            if not rc:
-                log_crit("Runner::commit was unsuccessful")
+            self.commit()
+            self.export_stats()
+        # Don't lose the changes collected within the commit interval
+        self.commit(force=True)
+
+    def get_select_timeout(self):
+        """ Wait for events no longer than until the pending configuration changes are due """
+        commit_timeout = self.cfg_manager.get_commit_timeout()
+        if commit_timeout is None:
+            return Runner.SELECT_TIMEOUT
+        return min(Runner.SELECT_TIMEOUT, int(commit_timeout * 1000) + 1)
+
+    def export_stats(self):
+        """ Write the statistics to STATE_DB, not more often than once per STATS_EXPORT_INTERVAL """
+        now = time.monotonic()
+        if now - self.stats_exported_at < Runner.STATS_EXPORT_INTERVAL:
+            return
+        self.stats_exported_at = now
+        if self.stats_table is None:
+            self.stats_table = swsscommon.Table(swsscommon.DBConnector("STATE_DB", 0), Runner.STATS_TABLE_NAME)
+        g_stats.export(self.stats_table)
+        for manager in self.managers:
+            self.write_stats_entry("queue|%s" % manager.get_table_name(), manager.get_counters())
+        self.write_stats_entry("commit", self.cfg_manager.get_metrics())
+
+    def write_stats_entry(self, key, values):
+        """
+        Write a dictionary of values into the statistics table
+        :param key: key of the entry
+        :param values: dictionary of values
+        """
+        fvs = swsscommon.FieldValuePairs([(str(name), str(value)) for name, value in sorted(values.items())])
+        self.stats_table.set(key, fvs)
+
+    def commit(self, force=False):
+        """ Commit the configuration changes, if they are due or force is True """
+        rc = self.cfg_manager.commit(force)
+        if not rc:
+            log_crit("Runner::commit was unsuccessful")
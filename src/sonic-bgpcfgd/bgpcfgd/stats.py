@@ -0,0 +1,166 @@
+import cProfile
+import time
+
+from collections import OrderedDict
+
+from swsscommon import swsscommon
+
+from .log import log_notice
+
+
+class Histogram(object):
+    """ Histogram of durations with fixed buckets """
+    BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)  # upper bounds of the buckets in milliseconds
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0    # seconds
+        self.max = 0.0      # seconds
+        self.buckets = [0] * (len(Histogram.BUCKETS_MS) + 1)  # the last bucket is for durations over 5 seconds
+
+    def observe(self, duration):
+        """
+        Add a duration to the histogram
+        :param duration: duration in seconds
+        """
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        duration_ms = duration * 1000.0
+        for index, bound in enumerate(Histogram.BUCKETS_MS):
+            if duration_ms <= bound:
+                break
+        else:
+            index = len(Histogram.BUCKETS_MS)
+        self.buckets[index] += 1
+
+    def to_fields(self):
+        """
+        Convert the histogram to fields of a db entry
+        :return: an ordered dictionary: field name -> string value
+        """
+        fields = OrderedDict()
+        fields['count'] = str(self.count)
+        fields['total_ms'] = "%.3f" % (self.total * 1000.0)
+        fields['avg_ms'] = "%.3f" % (self.total * 1000.0 / self.count if self.count else 0.0)
+        fields['max_ms'] = "%.3f" % (self.max * 1000.0)
+        for bound, value in zip(Histogram.BUCKETS_MS, self.buckets):
+            fields['le_%dms' % bound] = str(value)
+        fields['gt_%dms' % Histogram.BUCKETS_MS[-1]] = str(self.buckets[-1])
+        return fields
+
+
+class Timer(object):
+    """ Context manager which adds the duration of its block to a histogram """
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, *_):
+        self.stats.observe(self.name, time.monotonic() - self.start)
+
+
+class Stats(object):
+    """ Durations and event counters of bgpcfgd. Names are '|' separated, like 'handler|BGP_NEIGHBOR|SET' """
+    def __init__(self):
+        self.histograms = OrderedDict()  # name -> Histogram
+        self.counters = OrderedDict()    # name -> number of events
+        self.exported_counters = {}      # name -> number of events at the previous export
+        self.exported_at = time.monotonic()
+
+    def observe(self, name, duration):
+        """
+        Add a duration to the histogram with the name
+        :param name: name of the histogram
+        :param duration: duration in seconds
+        """
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        self.histograms[name].observe(duration)
+
+    def timer(self, name):
+        """
+        Measure duration of a block of code: with g_stats.timer('render|BGP_NEIGHBOR'): ...
+        :param name: name of the histogram
+        :return: context manager
+        """
+        return Timer(self, name)
+
+    def count(self, name, value=1):
+        """
+        Count events
+        :param name: name of the counter
+        :param value: number of events
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def get_entries(self):
+        """
+        Get the statistics as db entries. Counters have the event rate since the previous call
+        :return: an ordered dictionary: entry key -> fields
+        """
+        now = time.monotonic()
+        interval = now - self.exported_at
+        entries = OrderedDict()
+        for name, value in self.counters.items():
+            rate = (value - self.exported_counters.get(name, 0)) / interval if interval > 0 else 0.0
+            entries[name] = OrderedDict([('count', str(value)), ('rate', "%.3f" % rate)])
+        for name, histogram in self.histograms.items():
+            entries[name] = histogram.to_fields()
+        self.exported_counters = dict(self.counters)
+        self.exported_at = now
+        return entries
+
+    def export(self, table):
+        """
+        Write the statistics to a db table
+        :param table: swsscommon.Table object
+        """
+        for key, fields in self.get_entries().items():
+            table.set(key, swsscommon.FieldValuePairs(list(fields.items())))
+
+    def reset(self):
+        """ Remove all statistics """
+        self.histograms.clear()
+        self.counters.clear()
+        self.exported_counters = {}
+        self.exported_at = time.monotonic()
+
+
+class Profiler(object):
+    """ cProfile profiler, which could be switched on and off at runtime """
+    PROFILE_PATH = "/var/log/bgpcfgd.prof"
+
+    def __init__(self, path=PROFILE_PATH):
+        self.path = path
+        self.profile = None
+
+    def toggle(self):
+        """
+        Start profiling if it's stopped. Otherwise stop it and save the profile to self.path
+        :return: True if profiling was started, False if it was stopped
+        """
+        if self.profile is None:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+            log_notice("Profiling is started")
+            return True
+        self.profile.disable()
+        self.profile.dump_stats(self.path)
+        self.profile = None
+        log_notice("Profiling is stopped. The profile is saved to '%s'" % self.path)
+        return False
+
+
+g_stats = Stats()
+g_profiler = Profiler()
+
+
+def profile_signal_handler(_, __):  # profile_signal_handler(signum, frame)
+    """ signal handler which switches profiling on and off """
+    g_profiler.toggle()
@@ -1,8 +1,8 @@
 from collections import OrderedDict
 from functools import partial
 
+import ip_filters
 import jinja2
-import netaddr
 
 from .log import log_err
 
@@ -12,8 +12,8 @@ class TemplateFabric(object):
         j2_template_paths = [template_path]
         j2_loader = jinja2.FileSystemLoader(j2_template_paths)
         j2_env = jinja2.Environment(loader=j2_loader, trim_blocks=False)
-        j2_env.filters['ipv4'] = self.is_ipv4
-        j2_env.filters['ipv6'] = self.is_ipv6
+        j2_env.filters['ipv4'] = ip_filters.is_ipv4
+        j2_env.filters['ipv6'] = ip_filters.is_ipv6
         j2_env.filters['pfx_filter'] = self.pfx_filter
         for attr in ['ip', 'network', 'prefixlen', 'netmask']:
             j2_env.filters[attr] = partial(self.prefix_attr, attr)
@@ -38,47 +38,24 @@ class TemplateFabric(object):
     @staticmethod
     def is_ipv4(value):
         """ Return True if the value is an ipv4 address """
-        if not value:
-            return False
-        if isinstance(value, netaddr.IPNetwork):
-            addr = value
-        else:
-            try:
-                addr = netaddr.IPNetwork(str(value))
-            except (netaddr.NotRegisteredError, netaddr.AddrFormatError, netaddr.AddrConversionError):
-                return False
-        return addr.version == 4
+        return ip_filters.is_ipv4(value)
 
     @staticmethod
     def is_ipv6(value):
         """ Return True if the value is an ipv6 address """
-        if not value:
-            return False
-        if isinstance(value, netaddr.IPNetwork):
-            addr = value
-        else:
-            try:
-                addr = netaddr.IPNetwork(str(value))
-            except (netaddr.NotRegisteredError, netaddr.AddrFormatError, netaddr.AddrConversionError):
-                return False
-        return addr.version == 6
+        return ip_filters.is_ipv6(value)
 
     @staticmethod
     def prefix_attr(attr, value):
         """
-        Extract attribute from IPNetwork object
+        Extract attribute from IP prefix
         :param attr: attribute to extract
-        :param value: the string representation of ip prefix which will be converted to IPNetwork.
+        :param value: the string representation of ip prefix
         :return: the value of the extracted attribute
         """
         if not value:
             return None
-        else:
-            try:
-                prefix = netaddr.IPNetwork(str(value).strip())
-            except (netaddr.NotRegisteredError, netaddr.AddrFormatError, netaddr.AddrConversionError):
-                return None
-        return str(getattr(prefix, attr))
+        return ip_filters.prefix_attr(attr, str(value).strip())
 
     @staticmethod
     def pfx_filter(value):
@@ -18,7 +18,8 @@ setuptools.setup(
         'jinja2>=2.10',
         'netaddr==0.8.0',
         'pyyaml==5.4.1',
-        'ipaddress==1.0.23'
+        'ipaddress==1.0.23',
+        'sonic-config-engine'
     ],
     setup_requires = [
         'pytest-runner',
@@ -26,7 +27,6 @@ setuptools.setup(
     ],
     tests_require = [
         'pytest',
-        'pytest-cov',
-        'sonic-config-engine'
+        'pytest-cov'
     ]
 )
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""bgpcfgd_benchmark
+
+Replay a large synthetic CONFIG_DB through bgpcfgd end to end.
+
+bgpcfgd.main.do_work() runs with all its managers, the Directory, the
+ConfigMgr and the Runner. Only the edges are replaced: SubscriberStateTable
+and Select deliver the generated entries instead of redis, and vtysh is a stub
+which keeps the written configuration as the running config and counts calls
+and bytes. The templates and constants come from this source tree.
+
+The generated config has --neighbors BGP neighbors on --neighbors / 2 ports,
+--peer-ranges dynamic peer-groups, --allow-lists allow-list deployments and
+--static-routes static routes. In the bootstrap mode the entries are in the
+tables when bgpcfgd starts. In the stream mode they arrive after the start,
+--batch entries per select, table after table in the sorted table order, so
+the BGP neighbors arrive before the interfaces they depend on.
+
+Example:
+    python3 tests/bgpcfgd_benchmark.py --neighbors 1024 --mode stream
+"""
+
+import argparse
+import os
+import sys
+import time
+import types
+
+from collections import OrderedDict, deque
+from functools import partial
+from unittest.mock import patch
+
+import yaml
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+SRC_DIR = os.path.join(TESTS_DIR, '..', '..', '..')
+TEMPLATE_PATH = os.path.join(SRC_DIR, 'dockers', 'docker-fpm-frr', 'frr')
+CONSTANTS_PATH = os.path.join(SRC_DIR, 'files', 'image_config', 'constants', 'constants.yml')
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+
+TABLE_NAMES = {
+    'CFG_DEVICE_METADATA_TABLE_NAME': 'DEVICE_METADATA',
+    'CFG_DEVICE_NEIGHBOR_METADATA_TABLE_NAME': 'DEVICE_NEIGHBOR_METADATA',
+    'CFG_INTF_TABLE_NAME': 'INTERFACE',
+    'CFG_LOOPBACK_INTERFACE_TABLE_NAME': 'LOOPBACK_INTERFACE',
+    'CFG_VLAN_INTF_TABLE_NAME': 'VLAN_INTERFACE',
+    'CFG_LAG_INTF_TABLE_NAME': 'PORTCHANNEL_INTERFACE',
+    'CFG_VOQ_INBAND_INTERFACE_TABLE_NAME': 'VOQ_INBAND_INTERFACE',
+    'CFG_VLAN_SUB_INTF_TABLE_NAME': 'VLAN_SUB_INTERFACE',
+    'CFG_BGP_NEIGHBOR_TABLE_NAME': 'BGP_NEIGHBOR',
+    'CFG_BGP_INTERNAL_NEIGHBOR_TABLE_NAME': 'BGP_INTERNAL_NEIGHBOR',
+    'STATE_INTERFACE_TABLE_NAME': 'INTERFACE_TABLE',
+    'STATE_ADVERTISE_NETWORK_TABLE_NAME': 'ADVERTISE_NETWORK_TABLE',
+    'SET_COMMAND': 'SET',
+    'DEL_COMMAND': 'DEL',
+}
+DB_IDS = {'CONFIG_DB': 4, 'STATE_DB': 6}
+
+try:
+    from swsscommon import swsscommon
+except ImportError:
+    # Development hosts don't have swsscommon. The managers only need its constants
+    swsscommon = types.ModuleType('swsscommon.swsscommon')
+    swsscommon.__dict__.update(TABLE_NAMES)
+    sys.modules['swsscommon'] = types.ModuleType('swsscommon')
+    sys.modules['swsscommon'].swsscommon = swsscommon
+    sys.modules['swsscommon.swsscommon'] = swsscommon
+
+import bgpcfgd.frr
+import bgpcfgd.main
+import bgpcfgd.managers_bgp
+import bgpcfgd.runner
+import bgpcfgd.stats
+from bgpcfgd.config import ConfigMgr
+from bgpcfgd.template import TemplateFabric
+
+
+class FakeDBConnector(object):
+    def __init__(self, db_name, _):
+        self.db_id = DB_IDS[db_name]
+
+    def getDbId(self):
+        return self.db_id
+
+
+class FakeSonicDBConfig(object):
+    @staticmethod
+    def getDbId(db_name):
+        return DB_IDS[db_name]
+
+
+class FakeTable(object):
+    def __init__(self, _, table_name):
+        self.table_name = table_name
+        self.entries = {}
+
+    def set(self, key, fvs):
+        self.entries[key] = fvs
+
+
+class FakeSubscriberStateTable(object):
+    """ Pops the entries put into the table by the workload """
+    def __init__(self, conn, table_name):
+        self.conn = conn
+        self.table_name = table_name
+        self.queue = deque(FakeSwsscommon.workload.take_existing(conn.getDbId(), table_name))
+        FakeSwsscommon.workload.subscribers[(conn.getDbId(), table_name)] = self
+
+    def pop(self):
+        if self.queue:
+            return self.queue.popleft()
+        return '', '', ()
+
+    def getDbConnector(self):
+        return self.conn
+
+    def getTableName(self):
+        return self.table_name
+
+
+class FakeSelect(object):
+    """ Moves the next batch of streamed entries into the subscribers. Stops the runner when all are consumed """
+    OBJECT = 0
+    ERROR = 2
+    TIMEOUT = 1
+
+    def addSelectable(self, _):
+        pass
+
+    def select(self, _):
+        workload = FakeSwsscommon.workload
+        if workload.deliver_batch():
+            return FakeSelect.OBJECT, None
+        bgpcfgd.runner.g_run = False
+        return FakeSelect.TIMEOUT, None
+
+
+class FakeSwsscommon(object):
+    """ swsscommon as seen by the Runner: constants of the real module and fake redis objects """
+    workload = None
+    DBConnector = FakeDBConnector
+    SonicDBConfig = FakeSonicDBConfig
+    SubscriberStateTable = FakeSubscriberStateTable
+    Select = FakeSelect
+    Table = FakeTable
+    FieldValuePairs = list
+
+
+for _name in TABLE_NAMES:
+    setattr(FakeSwsscommon, _name, getattr(swsscommon, _name))
+
+
+class Workload(object):
+    """ Generated CONFIG_DB entries, either existing at start or streamed after it """
+    def __init__(self, tables, stream, batch):
+        self.tables = tables  # table name -> OrderedDict: key -> fields
+        self.stream = stream
+        self.batch = batch
+        self.subscribers = {}
+        self.pending = deque()
+        self.events = sum(len(entries) for entries in tables.values())
+        db_id = DB_IDS['CONFIG_DB']
+        if stream:
+            for table_name in sorted(tables):
+                for key, fields in tables[table_name].items():
+                    self.pending.append((db_id, table_name, key, fields))
+
+    def take_existing(self, db_id, table_name):
+        if self.stream or db_id != DB_IDS['CONFIG_DB']:
+            return []
+        return [(key, swsscommon.SET_COMMAND, tuple(fields.items()))
+                for key, fields in self.tables.get(table_name, {}).items()]
+
+    def deliver_batch(self):
+        if not self.pending:
+            return False
+        for _ in range(min(self.batch, len(self.pending))):
+            db_id, table_name, key, fields = self.pending.popleft()
+            self.subscribers[(db_id, table_name)].queue.append((key, swsscommon.SET_COMMAND, tuple(fields.items())))
+        return True
+
+
+class FakeVtysh(object):
+    """ vtysh which keeps the written configuration as the running config """
+    def __init__(self):
+        self.running_config = []
+        self.calls = OrderedDict()
+        self.bytes_written = 0
+        self.bytes_read = 0
+
+    def count(self, kind):
+        self.calls[kind] = self.calls.get(kind, 0) + 1
+
+    def run_command(self, command, shell=False, hide_errors=False):
+        if command[:2] == ["vtysh", "-f"]:
+            self.count("write")
+            with open(command[2]) as fp:
+                text = fp.read()
+            os.remove(command[2])
+            self.bytes_written += len(text)
+            self.running_config.extend(line for line in text.split("\n") if line.strip())
+            return 0, "", ""
+        commands = command[2::2]
+        if commands == ["show daemons"]:
+            return 0, " zebra bgpd staticd", ""
+        if commands == ["show running-config"]:
+            self.count("show running-config")
+            out = "\n".join(self.running_config) + "\n"
+            self.bytes_read += len(out)
+            return 0, out, ""
+        if commands == ["show bgp vrfs json"]:
+            return 0, '{"vrfs": {"default": {}}}', ""
+        if len(commands) == 1 and commands[0].startswith("show bgp vrf "):
+            return 0, "{}", ""
+        self.count("clear bgp peer-group")
+        return 0, "", ""
+
+
+def generate_tables(neighbors, peer_ranges, allow_lists, static_routes):
+    device_metadata = OrderedDict()
+    loopback_interface = OrderedDict()
+    interface = OrderedDict()
+    bgp_neighbor = OrderedDict()
+    tables = OrderedDict([
+        (swsscommon.CFG_DEVICE_METADATA_TABLE_NAME, device_metadata),
+        (swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME, loopback_interface),
+        (swsscommon.CFG_INTF_TABLE_NAME, interface),
+        (swsscommon.CFG_BGP_NEIGHBOR_TABLE_NAME, bgp_neighbor),
+        ('BGP_PEER_RANGE', OrderedDict()),
+        ('BGP_ALLOWED_PREFIXES', OrderedDict()),
+        ('STATIC_ROUTE', OrderedDict()),
+    ])
+    device_metadata['localhost'] = {
+        'hostname': 'bench-spine', 'bgp_asn': '65100', 'type': 'SpineRouter',
+        'docker_routing_config_mode': 'separated', 'hwsku': 'Synthetic'}
+    loopback_interface['Loopback0'] = {'NULL': 'NULL'}
+    loopback_interface['Loopback0|10.1.0.32/32'] = {'NULL': 'NULL'}
+    loopback_interface['Loopback0|fc00:1::32/128'] = {'NULL': 'NULL'}
+    for i in range((neighbors + 1) // 2):
+        port = 'Ethernet%d' % (4 * i)
+        v4_local = '10.%d.%d.%d' % (i // 8192, (i // 64) % 128, 2 * (i % 64) + 128)
+        v6_local = 'fc00::%x' % (4 * i + 1)
+        interface[port] = {'NULL': 'NULL'}
+        interface['%s|%s/31' % (port, v4_local)] = {'NULL': 'NULL'}
+        interface['%s|%s/126' % (port, v6_local)] = {'NULL': 'NULL'}
+        peers = [(v4_local[:v4_local.rindex('.') + 1] + str(int(v4_local.split('.')[-1]) + 1), v4_local),
+                 ('fc00::%x' % (4 * i + 2), v6_local)]
+        for peer, local_addr in peers[:neighbors - 2 * i]:
+            bgp_neighbor[peer] = {
+                'asn': str(64600 + i), 'name': 'ARISTA%02dT1' % i, 'local_addr': local_addr,
+                'holdtime': '180', 'keepalive': '60', 'admin_status': 'up', 'nhopself': '0', 'rrclient': '0'}
+    for i in range(peer_ranges):
+        tables['BGP_PEER_RANGE']['BGPSLBPassive%d' % i] = {
+            'name': 'BGPSLBPassive%d' % i, 'ip_range': '10.255.%d.0/25' % (i % 256),
+            'peer_asn': '65432', 'src_address': '10.1.0.32'}
+    for i in range(allow_lists):
+        tables['BGP_ALLOWED_PREFIXES']['DEPLOYMENT_ID|%d|1010:%d' % (i % 8, i)] = {
+            'prefixes_v4': '10.200.%d.0/24,10.201.%d.0/24' % (i % 256, i % 256),
+            'prefixes_v6': 'fc02:%x::/64' % i}
+    nexthop = next(iter(bgp_neighbor), '10.0.0.129')
+    for i in range(static_routes):
+        tables['STATIC_ROUTE']['10.%d.%d.0/24' % (128 + i // 256, i % 256)] = {'nexthop': nexthop}
+    return tables
+
+
+def load_constants():
+    with open(CONSTANTS_PATH) as fp:
+        return yaml.safe_load(fp)['constants']
+
+
+def run(args):
+    tables = generate_tables(args.neighbors, args.peer_ranges, args.allow_lists, args.static_routes)
+    workload = Workload(tables, args.mode == 'stream', args.batch)
+    vtysh = FakeVtysh()
+    constants = load_constants()
+    if args.commit_interval is not None:
+        constants['bgp']['commit']['interval'] = args.commit_interval
+    cfg_mgrs = []
+
+    def config_mgr(frr, commit_interval):
+        cfg_mgrs.append(ConfigMgr(frr, commit_interval))
+        return cfg_mgrs[-1]
+
+    FakeSwsscommon.workload = workload
+    bgpcfgd.runner.g_run = True
+    bgpcfgd.stats.g_stats.reset()
+    with patch('bgpcfgd.runner.swsscommon', FakeSwsscommon), \
+         patch('bgpcfgd.stats.swsscommon', FakeSwsscommon), \
+         patch('bgpcfgd.frr.run_command', vtysh.run_command), \
+         patch('bgpcfgd.managers_bgp.run_command', vtysh.run_command), \
+         patch('bgpcfgd.main.read_constants', lambda: constants), \
+         patch('bgpcfgd.main.TemplateFabric', partial(TemplateFabric, TEMPLATE_PATH)), \
+         patch('bgpcfgd.main.ConfigMgr', config_mgr):
+        start = time.time()
+        bgpcfgd.main.do_work()
+        elapsed = time.time() - start
+    return workload, vtysh, cfg_mgrs[0].get_metrics(), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a synthetic CONFIG_DB through bgpcfgd with fake redis and FRR.")
+    parser.add_argument("--neighbors", help="number of BGP neighbors", type=int, default=512)
+    parser.add_argument("--peer-ranges", help="number of dynamic peer-groups", type=int, default=16)
+    parser.add_argument("--allow-lists", help="number of allow-list entries", type=int, default=32)
+    parser.add_argument("--static-routes", help="number of static routes", type=int, default=256)
+    parser.add_argument("--mode", help="entries exist at start or arrive after it", choices=["bootstrap", "stream"], default="bootstrap")
+    parser.add_argument("--batch", help="entries per select in the stream mode", type=int, default=128)
+    parser.add_argument("--commit-interval", help="override bgp.commit.interval of constants.yml", type=float)
+    parser.add_argument("--top", help="number of the slowest operations to print", type=int, default=10)
+    args = parser.parse_args()
+
+    workload, vtysh, metrics, elapsed = run(args)
+
+    print("workload: {} neighbors, {} peer ranges, {} allow lists, {} static routes, {} events, {} mode".format(
+        args.neighbors, args.peer_ranges, args.allow_lists, args.static_routes, workload.events, args.mode))
+    print("time: {:.3f}s, {:.1f} events/s".format(elapsed, workload.events / elapsed))
+    print("commits: {}, failed: {}, lines: {}, peer-group restarts: {}".format(
+        metrics['commits'], metrics['failed_commits'], metrics['lines'], metrics['peer_group_restarts']))
+    print("vtysh: {}, {} bytes written, {} bytes of running config read".format(
+        ", ".join("%d %s" % (count, kind) for kind, count in vtysh.calls.items()),
+        vtysh.bytes_written, vtysh.bytes_read))
+    histograms = bgpcfgd.stats.g_stats.histograms
+    print("slowest operations by total time:")
+    for name, histogram in sorted(histograms.items(), key=lambda item: -item[1].total)[:args.top]:
+        print("  {:<45} {:>7} calls {:>10.3f}s total {:>9.3f}ms max".format(
+            name, histogram.count, histogram.total, histogram.max * 1000.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+from argparse import Namespace
+
+from . import bgpcfgd_benchmark
+
+
+def run_benchmark(mode):
+    args = Namespace(neighbors=8, peer_ranges=2, allow_lists=2, static_routes=4, mode=mode, batch=4, commit_interval=0.0)
+    workload, vtysh, metrics, _ = bgpcfgd_benchmark.run(args)
+    assert workload.events == 1 + 3 + 12 + 8 + 2 + 2 + 4
+    assert metrics['failed_commits'] == 0
+    assert vtysh.bytes_written > 0
+    running_config = "\n".join(vtysh.running_config)
+    for neighbor in workload.tables[bgpcfgd_benchmark.swsscommon.CFG_BGP_NEIGHBOR_TABLE_NAME]:
+        assert "neighbor %s remote-as" % neighbor in running_config
+    assert "bgp listen range 10.255.1.0/25 peer-group BGPSLBPassive1" in running_config
+    assert "ip route 10.128.3.0/24" in running_config
+
+def test_benchmark_bootstrap():
+    run_benchmark("bootstrap")
+
+def test_benchmark_stream():
+    run_benchmark("stream")
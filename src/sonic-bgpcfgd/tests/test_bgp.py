@@ -110,3 +110,52 @@ def test_del_handler_nonexist_peer(mocked_log_warn):
     m = constructor()
     m.del_handler("40.40.40.1")
     mocked_log_warn.assert_called_with("Peer '(default|40.40.40.1)' has not been found")
+
+def test_set_handler_bulk():
+    m = constructor()
+    m.set_handler_bulk([
+        ("30.30.30.1", {"local_addr": "30.30.30.30", "admin_status": "up"}),
+        ("30.30.30.2", {"local_addr": "30.30.30.30", "admin_status": "up"}),
+        ("40.40.40.1", {"local_addr": "40.40.40.40", "admin_status": "up"}),
+    ])
+    pushed = [args[0] for args, _ in m.cfg_mgr.push.call_args_list]
+    # the policy and the peer-group are rendered once and pushed before the peers
+    assert len(pushed) == 4
+    assert "neighbor 30.30.30.1 " not in pushed[0] + pushed[1]
+    assert "neighbor 30.30.30.1 " in pushed[2]
+    assert "neighbor 30.30.30.2 " in pushed[3]
+    assert m.get_counters()['blocked'] == 1
+    m.directory.put("LOCAL", "interfaces", "Ethernet12", {"NULL": "NULL"})
+    m.directory.put("LOCAL", "local_addresses", "40.40.40.40", {"interface": "Ethernet12"})
+    assert m.get_counters()['blocked'] == 0
+    assert ("default", "40.40.40.1") in m.peers
+
+def test_peer_group_rendered_once():
+    m = constructor()
+    pg_template = m.peer_group_mgr.peergroup_template
+    m.peer_group_mgr.peergroup_template = MagicMock(wraps=pg_template)
+    for i in range(256):
+        m.set_handler("30.30.%d.%d" % (i // 200, i % 200 + 1), {"local_addr": "30.30.30.30", "admin_status": "up"})
+    assert m.peer_group_mgr.peergroup_template.render.call_count == 1
+    pushed = [args[0] for args, _ in m.cfg_mgr.push.call_args_list]
+    assert len(pushed) == 2 + 256
+    # a change of the inputs renders and pushes the peer-group again, as the output is different
+    m.directory.put("CONFIG_DB", swsscommon.CFG_DEVICE_METADATA_TABLE_NAME, "localhost", {"bgp_asn": "65100", "type": "ToRRouter"})
+    m.set_handler("30.30.30.250", {"local_addr": "30.30.30.30", "admin_status": "up"})
+    assert m.peer_group_mgr.peergroup_template.render.call_count == 2
+    pushed = [args[0] for args, _ in m.cfg_mgr.push.call_args_list[2 + 256:]]
+    assert len(pushed) == 2
+    assert "allowas-in 1" in pushed[0]
+
+def test_peer_group_pushed_again_after_failed_commit():
+    m = constructor()
+    m.cfg_mgr.get_metrics.return_value = {'failed_commits': 0}
+    m.set_handler("30.30.30.1", {"local_addr": "30.30.30.30", "admin_status": "up"})
+    m.set_handler("30.30.30.2", {"local_addr": "30.30.30.30", "admin_status": "up"})
+    assert m.cfg_mgr.push.call_count == 2 + 2
+    # the commit of the peer-group failed, so it's pushed again with the next peer
+    m.cfg_mgr.get_metrics.return_value = {'failed_commits': 1}
+    m.set_handler("30.30.30.3", {"local_addr": "30.30.30.30", "admin_status": "up"})
+    assert m.cfg_mgr.push.call_count == 4 + 2 + 1
+    m.set_handler("30.30.30.4", {"local_addr": "30.30.30.30", "admin_status": "up"})
+    assert m.cfg_mgr.push.call_count == 7 + 1
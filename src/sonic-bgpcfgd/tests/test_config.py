@@ -1,6 +1,7 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+import pytest
 
-from bgpcfgd.config import ConfigMgr
+from bgpcfgd.config import ConfigMgr, ConfigIndex
 
 
 def test_constructor():
@@ -205,3 +206,105 @@ def test_from_canonical():
     c = ConfigMgr(frr)
     raw = c.from_canonical(canonical)
     assert raw == expected
+
+@patch('bgpcfgd.config.time.monotonic')
+def test_commit_interval(mocked_time):
+    frr = MagicMock()
+    frr.write = MagicMock(return_value = True)
+    frr.restart_peer_groups = MagicMock(return_value = True)
+    c = ConfigMgr(frr, commit_interval=0.5)
+    assert c.get_commit_timeout() is None
+    mocked_time.return_value = 100.0
+    c.push("change1")
+    c.restart_peer_groups(["pg2", "pg1"])
+    mocked_time.return_value = 100.2
+    c.push_list(["change2"])
+    c.restart_peer_groups(["pg1"])
+    assert c.get_commit_timeout() == pytest.approx(0.3)
+    assert c.commit()
+    assert not frr.write.called
+    mocked_time.return_value = 100.5
+    assert c.get_commit_timeout() == 0.0
+    assert c.commit()
+    frr.write.assert_called_once_with('change1\nchange2\n')
+    frr.restart_peer_groups.assert_called_once_with(["pg1", "pg2"])
+    assert c.get_commit_timeout() is None
+    metrics = c.get_metrics()
+    assert metrics['commits'] == 1
+    assert metrics['lines'] == 2
+    assert metrics['peer_group_restarts'] == 2
+    assert metrics['last_delay'] == pytest.approx(0.5)
+
+def test_update_commits_pending_changes():
+    frr = MagicMock()
+    frr.write = MagicMock(return_value = True)
+    frr.restart_peer_groups = MagicMock(return_value = True)
+    frr.get_config = MagicMock(return_value = " text1\n")
+    c = ConfigMgr(frr, commit_interval=60)
+    c.push("change1")
+    assert c.commit()
+    assert not frr.write.called
+    c.update()
+    frr.write.assert_called_once_with('change1\n')
+    assert c.get_text() == [' text1', '', '     ']
+
+def test_update_once_per_commit_cycle():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value = "route-map RM permit 10\n match community CL\n")
+    c = ConfigMgr(frr)
+    c.update()
+    index = c.get_index()
+    c.update()
+    assert frr.get_config.call_count == 1
+    assert c.get_index() is index
+    assert c.commit()
+    c.update()
+    assert frr.get_config.call_count == 2
+    assert c.get_index() is not index
+
+def test_update_resets_index():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value = "route-map RM permit 10\n")
+    c = ConfigMgr(frr)
+    c.update()
+    assert list(c.get_index().get_route_map('RM')) == [10]
+    frr.get_config = MagicMock(return_value = "route-map RM permit 20\n")
+    c.current_config_raw = None
+    c.update()
+    assert list(c.get_index().get_route_map('RM')) == [20]
+
+def test_config_index():
+    index = ConfigIndex([
+        'ip prefix-list PL_V4 seq 10 deny 0.0.0.0/0 le 17',
+        'ip prefix-list PL_V4 seq 20 permit 20.20.30.0/24 le 32',
+        'ipv6 prefix-list PL_V4 seq 10 deny ::/0 le 59',
+        'bgp community-list standard CL permit 123:123',
+        'bgp community-list standard CL permit 123:124',
+        'route-map RM permit 10',
+        ' match ip address prefix-list PL_V4',
+        ' match community CL',
+        'route-map RM deny 65535',
+        'route-map FROM_PEER permit 100',
+        ' call RM',
+        'router bgp 64601',
+        ' neighbor PEER_V4 peer-group',
+        ' neighbor PEER_V6 peer-group',
+        ' address-family ipv4',
+        '  neighbor PEER_V4 route-map FROM_PEER in',
+        '  neighbor PEER_V4 route-map FROM_PEER_2 in',
+        '  neighbor PEER_V4 route-map TO_PEER out',
+    ])
+    assert index.get_prefix_list('ip', 'PL_V4') == ['deny 0.0.0.0/0 le 17', 'permit 20.20.30.0/24 le 32']
+    assert index.get_prefix_list('ipv6', 'PL_V4') == ['deny ::/0 le 59']
+    assert index.get_prefix_list('ipv6', 'PL_V6') is None
+    assert index.get_community_list('CL') == '123:123'
+    assert index.get_community_list('CL2') is None
+    assert list(index.get_route_map('RM').items()) == [
+        (10, ('permit', ['match ip address prefix-list PL_V4', 'match community CL'])),
+        (65535, ('deny', [])),
+    ]
+    assert index.get_route_map('FROM_PEER') == {100: ('permit', ['call RM'])}
+    assert index.get_route_map('UNKNOWN') == {}
+    assert index.peer_groups == ['PEER_V4', 'PEER_V6']
+    assert index.get_route_map_in('PEER_V4') == 'FROM_PEER'
+    assert index.get_route_map_in('PEER_V6') is None
@@ -55,3 +55,71 @@ def test_directory(mocked_log_err):
     # Test remove_slot() with nonexist table
     directory.remove_slot("db_name", "table_nonexist")
     mocked_log_err.assert_called_with("Directory: Can't remove slot 'db_name__table_nonexist'. The slot doesn't exist")
+
+def test_directory_notify_on_available():
+    directory = Directory()
+    handler = MagicMock()
+    directory.subscribe([("db_name", "table", "key1/key1_1")], handler)
+    directory.put("db_name", "table", "key1", {})
+    assert not handler.called
+    directory.put("db_name", "table", "key1", {"key1_1": "value1_1"})
+    assert handler.call_count == 1
+    # the path is available already: other keys and updates of the path don't notify the handler
+    directory.put("db_name", "table", "key2", "value2")
+    directory.put("db_name", "table", "key1", {"key1_1": "value1_2"})
+    assert handler.call_count == 1
+    # the path is notified again when it becomes available after removal
+    directory.remove("db_name", "table", "key1")
+    directory.put("db_name", "table", "key1", {"key1_1": "value1_1"})
+    assert handler.call_count == 2
+    assert directory.get_counters()['notifications'] == 2
+
+def test_directory_notify_when_put_removes_path():
+    directory = Directory()
+    handler = MagicMock()
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn")], handler)
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "1"})
+    assert handler.call_count == 1
+    # the new value doesn't have the path, so the path is notified again when it's put back
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"hostname": "x"})
+    assert handler.call_count == 1
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "2"})
+    assert handler.call_count == 2
+
+def test_directory_notify_slot():
+    directory = Directory()
+    handler = MagicMock()
+    directory.subscribe([("db_name", "table", "")], handler)
+    directory.put("db_name", "table", "key1", "value1")
+    directory.put("db_name", "table", "key2", "value2")
+    assert handler.call_count == 1
+    directory.remove_slot("db_name", "table")
+    directory.put("db_name", "table", "key2", "value2")
+    assert handler.call_count == 2
+
+def test_directory_wait_key():
+    directory = Directory()
+    key_handler = MagicMock()
+    any_key_handler = MagicMock()
+    directory.wait_key("db_name", "table", "key1", key_handler)
+    directory.wait_key("db_name", "table", None, any_key_handler)
+    assert directory.get_counters()['key_waiters'] == 2
+    directory.put("db_name", "table", "key2", "value2")
+    assert not key_handler.called
+    assert any_key_handler.call_count == 1
+    directory.put("db_name", "table", "key1", "value1")
+    directory.put("db_name", "table", "key1", "value1")
+    assert key_handler.call_count == 1
+    assert any_key_handler.call_count == 1
+    assert directory.get_counters()['key_waiters'] == 0
+
+def test_directory_slot_version():
+    test_values = Directory()
+    assert test_values.get_slot_version("CONFIG_DB", "LOOPBACK_INTERFACE") == 0
+    test_values.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0|10.1.0.32/32", {})
+    version = test_values.get_slot_version("CONFIG_DB", "LOOPBACK_INTERFACE")
+    assert version != 0
+    test_values.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    assert test_values.get_slot_version("CONFIG_DB", "LOOPBACK_INTERFACE") == version
+    test_values.remove("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0|10.1.0.32/32")
+    assert test_values.get_slot_version("CONFIG_DB", "LOOPBACK_INTERFACE") != version
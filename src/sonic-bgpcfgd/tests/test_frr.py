@@ -50,18 +50,24 @@ def test_write_fail():
     assert not res, "Expect False return value"
 
 def test_restart_peer_groups():
-    bgpcfgd.frr.run_command = lambda cmd: (0, "some output", "")
+    commands = []
+    def run_command(cmd, **kwargs):
+        commands.append(cmd)
+        return 0, "some output", ""
+    bgpcfgd.frr.run_command = run_command
     f = bgpcfgd.frr.FRR(["abc", "cde"])
-    res = f.restart_peer_groups(["pg_1", "pg_2"])
+    res = f.restart_peer_groups(["pg_2", "pg_1", "pg_2"])
     assert res, "Expect True return value"
+    assert commands == [['vtysh', '-c', 'clear bgp peer-group pg_1 soft in', '-c', 'clear bgp peer-group pg_2 soft in']]
 
 @patch('bgpcfgd.frr.log_crit')
 def test_restart_peer_groups_fail(mocked_log_crit):
     return_value_map = {
+        "['vtysh', '-c', 'clear bgp peer-group pg_1 soft in', '-c', 'clear bgp peer-group pg_2 soft in']": (1, "", ""),
         "['vtysh', '-c', 'clear bgp peer-group pg_1 soft in']": (0, "", ""),
         "['vtysh', '-c', 'clear bgp peer-group pg_2 soft in']": (1, "some output", "some error")
     }
-    bgpcfgd.frr.run_command = lambda cmd: return_value_map[str(cmd)]
+    bgpcfgd.frr.run_command = lambda cmd, **kwargs: return_value_map[str(cmd)]
     f = bgpcfgd.frr.FRR(["abc", "cde"])
     res = f.restart_peer_groups(["pg_1", "pg_2"])
     assert not res, "Expect False return value"
@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock
+
+from swsscommon import swsscommon
+
+from bgpcfgd.directory import Directory
+from bgpcfgd.manager import Manager
+
+
+class WaitingMgr(Manager):
+    """ Processes a message when the key named in the message data is in the LOCAL|addresses table """
+    def __init__(self, common_objs):
+        super(WaitingMgr, self).__init__(common_objs, [("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn")], "CONFIG_DB", "TEST")
+        self.processed = []
+        self.calls = 0
+
+    def set_handler(self, key, data):
+        self.calls += 1
+        if "address" not in data:
+            return False
+        if data["address"] not in self.directory.get_slot("LOCAL", "addresses"):
+            self.wait_for("LOCAL", "addresses", data["address"])
+            return False
+        self.processed.append(key)
+        return True
+
+
+def constructor():
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr':   MagicMock(),
+        'constants': {},
+    }
+    return WaitingMgr(common_objs)
+
+def test_queue_until_deps_available():
+    m = constructor()
+    m.directory.put("LOCAL", "addresses", "10.0.0.1", {})
+    m.handler("peer1", swsscommon.SET_COMMAND, {"address": "10.0.0.1"})
+    assert m.get_counters()['set_queue'] == 1
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"hostname": "switch"})
+    assert m.calls == 0
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    assert m.processed == ["peer1"]
+    assert m.get_counters() == {'wakeups': 1, 'retries': 1, 'set_queue': 0, 'blocked': 0}
+
+def test_retry_only_dependent_messages():
+    m = constructor()
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    for i in range(10):
+        m.handler("peer%d" % i, swsscommon.SET_COMMAND, {"address": "10.0.0.%d" % i})
+    assert m.calls == 10
+    assert m.get_counters()['blocked'] == 10
+    m.directory.put("LOCAL", "addresses", "10.0.0.100", {})
+    m.directory.put("LOCAL", "addresses", "10.0.0.3", {})
+    m.directory.put("LOCAL", "addresses", "10.0.0.3", {})
+    assert m.processed == ["peer3"]
+    assert m.calls == 11
+    assert m.get_counters() == {'wakeups': 2, 'retries': 1, 'set_queue': 0, 'blocked': 9}
+
+def test_retry_without_reported_key():
+    m = constructor()
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    m.handler("peer1", swsscommon.SET_COMMAND, {})
+    assert m.get_counters()['blocked'] == 1
+    m.directory.put("LOCAL", "addresses", "10.0.0.1", {})
+    assert m.calls == 1
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "switch", {})
+    assert m.calls == 2
+    assert m.get_counters()['blocked'] == 1
+
+def test_queue_when_put_removes_dependency():
+    m = constructor()
+    m.directory.put("LOCAL", "addresses", "10.0.0.1", {})
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"hostname": "switch"})
+    m.handler("peer1", swsscommon.SET_COMMAND, {"address": "10.0.0.1"})
+    assert m.get_counters()['set_queue'] == 1
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65200"})
+    assert m.processed == ["peer1"]
+    assert m.get_counters()['set_queue'] == 0
+
+class TwoKeysMgr(WaitingMgr):
+    """ Waits until the LOCAL|addresses key named in the message data is ready and the LOCAL|names key exists """
+    def set_handler(self, key, data):
+        self.calls += 1
+        if not self.directory.get_slot("LOCAL", "addresses").get(data["address"]) or \
+           data["name"] not in self.directory.get_slot("LOCAL", "names"):
+            self.wait_for("LOCAL", "addresses", data["address"])
+            self.wait_for("LOCAL", "names", data["name"])
+            return False
+        self.processed.append(key)
+        return True
+
+def test_reblocked_message_forgets_stale_waits():
+    m = constructor()
+    m = TwoKeysMgr({'directory': m.directory, 'cfg_mgr': m.cfg_mgr, 'constants': m.constants})
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    m.handler("peer1", swsscommon.SET_COMMAND, {"address": "10.0.0.1", "name": "name1"})
+    for i in range(5):
+        m.directory.put("LOCAL", "addresses", "10.0.0.1", {})  # not ready yet
+    assert m.calls == 6
+    assert m.get_counters()['blocked'] == 1
+    assert [len(ids) for ids in m.blocked_by.values()] == [1, 1]
+    m.directory.put("LOCAL", "addresses", "10.0.0.1", {"ready": "1"})
+    m.directory.put("LOCAL", "names", "name1", {})
+    assert m.processed == ["peer1"]
+    assert not m.blocked_by
+    assert m.get_counters()['blocked'] == 0
@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock, patch
+
+from bgpcfgd.runner import Runner
+
+
+@patch('bgpcfgd.runner.swsscommon')
+def test_bootstrap(mocked_swsscommon):
+    mocked_swsscommon.SET_COMMAND = 'SET'
+    mocked_swsscommon.DEL_COMMAND = 'DEL'
+    events = [
+        ('key_a', 'SET', (('field', '1'),)),
+        ('key_b', 'SET', (('field', '2'),)),
+        ('key_a', 'SET', (('field', '3'),)),
+        ('key_c', 'DEL', ()),
+        ('key_d', 'SET', (('field', '4'),)),
+        ('', '', ()),
+    ]
+    subscriber = MagicMock()
+    subscriber.pop.side_effect = events
+    subscriber.getTableName.return_value = 'TABLE'
+    subscriber.getDbConnector.return_value.getDbId.return_value = 4
+    mocked_swsscommon.SonicDBConfig.getDbId.return_value = 4
+    mocked_swsscommon.SubscriberStateTable.return_value = subscriber
+
+    cfg_mgr = MagicMock()
+    manager = MagicMock()
+    manager.get_database.return_value = 'CONFIG_DB'
+    manager.get_table_name.return_value = 'TABLE'
+    runner = Runner(cfg_mgr)
+    runner.add_manager(manager)
+    runner.bootstrap()
+
+    assert [args for args, _ in manager.handler_bulk.call_args_list] == [
+        ([('key_b', {'field': '2'}), ('key_a', {'field': '3'})],),
+        ([('key_d', {'field': '4'})],),
+    ]
+    manager.handler.assert_called_once_with('key_c', 'DEL', {})
+    cfg_mgr.commit.assert_called_once_with(True)
+
+@patch('bgpcfgd.runner.g_stats')
+@patch('bgpcfgd.runner.time.monotonic')
+@patch('bgpcfgd.runner.swsscommon')
+def test_export_stats(mocked_swsscommon, mocked_monotonic, mocked_g_stats):
+    mocked_monotonic.return_value = 100.0
+    cfg_mgr = MagicMock()
+    cfg_mgr.get_metrics.return_value = {'commits': 1}
+    manager = MagicMock()
+    manager.get_table_name.return_value = 'TABLE'
+    manager.get_counters.return_value = {'wakeups': 2, 'blocked': 1}
+    runner = Runner(cfg_mgr)
+    runner.add_manager(manager)
+    runner.export_stats()
+    assert not mocked_swsscommon.Table.called
+    mocked_monotonic.return_value = 100.0 + Runner.STATS_EXPORT_INTERVAL
+    runner.export_stats()
+    table = mocked_swsscommon.Table.return_value
+    mocked_g_stats.export.assert_called_once_with(table)
+    table.set.assert_any_call('queue|TABLE', mocked_swsscommon.FieldValuePairs.return_value)
+    table.set.assert_any_call('commit', mocked_swsscommon.FieldValuePairs.return_value)
+    mocked_swsscommon.FieldValuePairs.assert_any_call([('blocked', '1'), ('wakeups', '2')])
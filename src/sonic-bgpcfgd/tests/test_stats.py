@@ -0,0 +1,50 @@
+import os
+import pstats
+from unittest.mock import MagicMock, patch
+
+from bgpcfgd.stats import Histogram, Stats, Profiler
+
+
+def test_histogram():
+    h = Histogram()
+    for duration in [0.0005, 0.003, 0.003, 0.2, 7.0]:
+        h.observe(duration)
+    fields = h.to_fields()
+    assert fields['count'] == '5'
+    assert fields['max_ms'] == '7000.000'
+    assert fields['le_1ms'] == '1'
+    assert fields['le_5ms'] == '2'
+    assert fields['le_500ms'] == '1'
+    assert fields['gt_5000ms'] == '1'
+    assert sum(h.buckets) == 5
+
+@patch('bgpcfgd.stats.swsscommon')
+@patch('bgpcfgd.stats.time.monotonic')
+def test_stats(mocked_monotonic, mocked_swsscommon):
+    mocked_monotonic.return_value = 100.0
+    stats = Stats()
+    stats.count("events|BGP_NEIGHBOR|SET", 20)
+    with stats.timer("handler|BGP_NEIGHBOR|SET"):
+        mocked_monotonic.return_value = 100.002
+    mocked_monotonic.return_value = 110.0
+    entries = stats.get_entries()
+    assert entries["events|BGP_NEIGHBOR|SET"] == {'count': '20', 'rate': '2.000'}
+    assert entries["handler|BGP_NEIGHBOR|SET"]['count'] == '1'
+    assert entries["handler|BGP_NEIGHBOR|SET"]['avg_ms'] == '2.000'
+    stats.count("events|BGP_NEIGHBOR|SET", 5)
+    mocked_monotonic.return_value = 115.0
+    assert stats.get_entries()["events|BGP_NEIGHBOR|SET"] == {'count': '25', 'rate': '1.000'}
+    table = MagicMock()
+    stats.export(table)
+    assert table.set.call_count == 2
+    stats.reset()
+    assert stats.get_entries() == {}
+
+@patch('bgpcfgd.stats.log_notice')
+def test_profiler(mocked_log_notice, tmpdir):
+    path = os.path.join(str(tmpdir), "bgpcfgd.prof")
+    profiler = Profiler(path)
+    assert profiler.toggle()
+    sorted([str(i) for i in range(100)])
+    assert not profiler.toggle()
+    assert pstats.Stats(path).total_calls > 0
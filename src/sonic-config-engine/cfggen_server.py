@@ -0,0 +1,224 @@
+"""cfggen_server
+
+Server and thin client for running sonic-cfggen as a long-lived process.
+
+Every sonic-cfggen invocation pays for importing jinja2, netaddr, yaml,
+swsscommon and friends. In server mode sonic-cfggen performs those imports
+once and then listens on a unix socket. For each request it forks a child
+which already has all the modules loaded, so the per-call cost is reduced to
+a fork and the actual work. On the switch the server is started early in
+boot by sonic-cfggen.service; until its socket exists, and for invocations
+which start a server themselves, the client runs sonic-cfggen in-process.
+
+The client sends the argument vector, the working directory and the
+environment of the caller, together with its stdin/stdout/stderr file
+descriptors (SCM_RIGHTS). The child adopts them, so the output of a remote
+invocation is identical to the output of a local one. The exit code of the
+child is returned to the client.
+
+Only the standard library is used here, to keep the client side cheap.
+"""
+
+from __future__ import print_function
+
+import array
+import io
+import json
+import os
+import socket
+import struct
+import sys
+import traceback
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+DEFAULT_SOCKET_PATH = '/var/run/sonic-cfggen/sonic-cfggen.sock'
+SOCKET_PATH_ENV = 'SONIC_CFGGEN_SOCKET'
+
+_HEADER = struct.Struct('!I')
+_STATUS = struct.Struct('!i')
+_STDIO_FDS = (0, 1, 2)
+_SERVER_OPTION = '--server'
+
+# Set in the forked child which runs a request
+_in_request = False
+
+
+def get_socket_path():
+    """
+    Socket path used by the client. An empty SONIC_CFGGEN_SOCKET disables the client
+    """
+    return os.environ.get(SOCKET_PATH_ENV, DEFAULT_SOCKET_PATH)
+
+
+def in_request():
+    """
+    True if the caller runs on behalf of a client, in a child forked by the server
+    """
+    return _in_request
+
+
+def _is_server_argv(argv):
+    """
+    True if argv starts a server. Abbreviations accepted by argparse are matched too
+    """
+    for arg in argv:
+        option = arg.split('=', 1)[0]
+        if len(option) > 3 and _SERVER_OPTION.startswith(option):
+            return True
+    return False
+
+
+def _recv_exact(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError('connection closed by peer')
+        data += chunk
+    return data
+
+
+def _recv_request(sock):
+    """
+    Receive request header together with the caller stdio file descriptors
+    """
+    fds = array.array('i')
+    msg, ancdata, _, _ = sock.recvmsg(_HEADER.size, socket.CMSG_LEN(len(_STDIO_FDS) * fds.itemsize))
+    for level, type_, cmsg_data in ancdata:
+        if level == socket.SOL_SOCKET and type_ == socket.SCM_RIGHTS:
+            fds.frombytes(cmsg_data[:len(cmsg_data) - (len(cmsg_data) % fds.itemsize)])
+    if len(msg) < _HEADER.size:
+        msg += _recv_exact(sock, _HEADER.size - len(msg))
+    length, = _HEADER.unpack(msg)
+    request = json.loads(_recv_exact(sock, length).decode('utf-8'))
+    return request, list(fds)
+
+
+def _run(main, argv):
+    """
+    Run main(argv) the same way the interpreter would run the script and return its exit code
+    """
+    try:
+        main(argv)
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+class _ForkingUnixStreamServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    pass
+
+
+class CfggenRequestHandler(socketserver.BaseRequestHandler):
+    """
+    Handle a single sonic-cfggen invocation. Runs in a freshly forked child
+    """
+
+    def handle(self):
+        global _in_request
+        _in_request = True
+        try:
+            request, fds = _recv_request(self.request)
+        except Exception:
+            return
+        if len(fds) != len(_STDIO_FDS):
+            for fd in fds:
+                os.close(fd)
+            return
+
+        for src, dst in zip(fds, _STDIO_FDS):
+            os.dup2(src, dst)
+            os.close(src)
+        sys.stdin = io.open(0, 'r', closefd=False)
+        sys.stdout = io.open(1, 'w', closefd=False)
+        sys.stderr = io.open(2, 'w', closefd=False)
+        os.environ.clear()
+        os.environ.update(request['env'])
+        os.chdir(request['cwd'])
+
+        status = _run(self.server.main, request['argv'])
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self.request.sendall(_STATUS.pack(status))
+
+
+def serve(main, socket_path=DEFAULT_SOCKET_PATH):
+    """
+    Serve sonic-cfggen requests on socket_path until interrupted
+
+    :param main: sonic-cfggen entry point, called as main(argv)
+    :param socket_path: unix socket to listen on
+    """
+    socket_dir = os.path.dirname(socket_path)
+    if socket_dir and not os.path.isdir(socket_dir):
+        os.makedirs(socket_dir)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = _ForkingUnixStreamServer(socket_path, CfggenRequestHandler)
+    server.main = main
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def run_remote(argv, socket_path=None):
+    """
+    Run sonic-cfggen with argv on the server
+
+    :param argv: sonic-cfggen arguments, without the program name
+    :param socket_path: server socket, get_socket_path() if not specified
+    :return: exit code of the remote invocation, or None if the server is not
+             available or argv starts a server, and the caller should run
+             sonic-cfggen in-process
+    """
+    if sys.version_info.major < 3 or _is_server_argv(argv):
+        return None
+    if socket_path is None:
+        socket_path = get_socket_path()
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+
+    request = json.dumps({
+        'argv': list(argv),
+        'cwd': os.getcwd(),
+        'env': dict(os.environ),
+    }).encode('utf-8')
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(socket_path)
+            fds = array.array('i', _STDIO_FDS)
+            sock.sendmsg([_HEADER.pack(len(request))], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, fds.tobytes())])
+            sock.sendall(request)
+        except (OSError, IOError):
+            # Nothing was run remotely yet, safe to fall back
+            return None
+
+        try:
+            status, = _STATUS.unpack(_recv_exact(sock, _STATUS.size))
+        except (OSError, IOError, EOFError) as e:
+            print('sonic-cfggen: lost connection to server: %s' % str(e), file=sys.stderr)
+            return 1
+        return status
+    finally:
+        sock.close()
@@ -0,0 +1,182 @@
+"""
+Jinja2 filters for IP addresses and prefixes, shared by sonic-cfggen and bgpcfgd.
+
+Templates apply these filters to the same handful of prefixes over and over,
+once per interface, neighbor and address family. Every distinct prefix string
+is parsed once with the stdlib ipaddress module and the attributes the
+templates use are kept in a bounded LRU, so repeated filter calls are a
+dictionary lookup.
+
+The results are the same as those of the netaddr based filters these replace:
+IPv6 addresses are formatted with inet_ntop like netaddr does, the broadcast
+of a /31, /32, /127 or /128 is None, and a value ipaddress rejects is handed
+to netaddr before it is reported as invalid.
+"""
+
+import socket
+import sys
+
+from collections import OrderedDict, namedtuple
+from functools import partial
+
+import ipaddress
+import netaddr
+
+if sys.version_info.major == 3:
+    text_type = str
+else:
+    text_type = unicode
+
+PREFIX_CACHE_SIZE = 4096
+
+Prefix = namedtuple('Prefix', ['version', 'ip', 'network', 'prefixlen', 'netmask', 'broadcast'])
+
+_prefix_cache = OrderedDict()
+cache_stats = {'hits': 0, 'misses': 0}
+
+
+def _format_address(address):
+    if address.version == 6:
+        return socket.inet_ntop(socket.AF_INET6, address.packed)
+    return str(address)
+
+
+def _parse_ipaddress(value):
+    # netaddr does not accept scoped IPv6 addresses
+    if '%' in value:
+        raise ValueError(value)
+    interface = ipaddress.ip_interface(text_type(value))
+    network = interface.network
+    if network.max_prefixlen - network.prefixlen > 1:
+        broadcast = _format_address(network.broadcast_address)
+    else:
+        broadcast = None
+    return Prefix(interface.version, _format_address(interface.ip), _format_address(network.network_address),
+                  network.prefixlen, _format_address(network.netmask), broadcast)
+
+
+def _parse_netaddr(value):
+    prefix = netaddr.IPNetwork(value)
+    broadcast = prefix.broadcast
+    return Prefix(prefix.version, str(prefix.ip), str(prefix.network), prefix.prefixlen,
+                  str(prefix.netmask), None if broadcast is None else str(broadcast))
+
+
+def parse_prefix(value):
+    """
+    Parse an IP address or prefix
+    :param value: the string representation of an ip address or prefix
+    :return: a Prefix, or None if the value is not a valid address or prefix
+    """
+    value = str(value)
+    prefix = _prefix_cache.get(value)
+    if prefix is not None or value in _prefix_cache:
+        cache_stats['hits'] += 1
+        _prefix_cache.pop(value)
+        _prefix_cache[value] = prefix
+        return prefix
+
+    cache_stats['misses'] += 1
+    try:
+        prefix = _parse_ipaddress(value)
+    except ValueError:
+        try:
+            prefix = _parse_netaddr(value)
+        except Exception:
+            prefix = None
+
+    _prefix_cache[value] = prefix
+    if len(_prefix_cache) > PREFIX_CACHE_SIZE:
+        _prefix_cache.popitem(last=False)
+    return prefix
+
+
+def clear_cache():
+    _prefix_cache.clear()
+    cache_stats['hits'] = 0
+    cache_stats['misses'] = 0
+
+
+def _version(value):
+    if not value:
+        return None
+    if isinstance(value, netaddr.IPNetwork):
+        return value.version
+    prefix = parse_prefix(value)
+    return None if prefix is None else prefix.version
+
+
+def is_ipv4(value):
+    """ Return True if the value is an ipv4 address or prefix """
+    return _version(value) == 4
+
+
+def is_ipv6(value):
+    """ Return True if the value is an ipv6 address or prefix """
+    return _version(value) == 6
+
+
+def prefix_attr(attr, value):
+    """
+    Extract an attribute of an ip prefix
+    :param attr: attribute to extract: ip, network, prefixlen, netmask or broadcast
+    :param value: the string representation of ip prefix
+    :return: the string representation of the extracted attribute, or None if the prefix is invalid
+    """
+    if not value:
+        return None
+    prefix = parse_prefix(value)
+    if prefix is None:
+        return None
+    return str(getattr(prefix, attr))
+
+
+def ip_network(value):
+    """ Extract network for network prefix """
+    prefix = parse_prefix(value)
+    if prefix is None:
+        return "Invalid ip address %s" % value
+    return prefix.network
+
+
+def pfx_filter(value):
+    """INTERFACE Table can have keys in one of the two formats:
+       string or tuple - This filter skips the string keys and only
+       take into account the tuple.
+       For eg - VLAN_INTERFACE|Vlan1000 vs VLAN_INTERFACE|Vlan1000|192.168.0.1/21
+    """
+    table = OrderedDict()
+
+    if not value:
+        return table
+
+    for key, val in value.items():
+        if not isinstance(key, tuple):
+            continue
+        intf, ip_address = key
+        if '/' not in ip_address:
+            version = _version(ip_address)
+            if version == 4:
+                new_ip_address = "%s/32" % ip_address
+            elif version == 6:
+                new_ip_address = "%s/128" % ip_address
+            else:
+                raise ValueError("'%s' is invalid ip address" % ip_address)
+            table[(intf, new_ip_address)] = val
+        else:
+            table[key] = val
+    return table
+
+
+def register_filters(env, attrs=('ip', 'network', 'prefixlen', 'netmask', 'broadcast')):
+    """
+    Register the ip filters in a jinja2 environment
+    :param env: jinja2 environment
+    :param attrs: prefix attributes to register as filters of their own name
+    """
+    env.filters['ipv4'] = is_ipv4
+    env.filters['ipv6'] = is_ipv6
+    env.filters['pfx_filter'] = pfx_filter
+    env.filters['ip_network'] = ip_network
+    for attr in attrs:
+        env.filters[attr] = partial(prefix_attr, attr)
@@ -1,8 +1,11 @@
 from __future__ import print_function
 
+import copy
+import hashlib
 import ipaddress
 import math
 import os
+import pickle
 import sys
 import json
 from collections import defaultdict
@@ -11,12 +14,14 @@ from lxml import etree as ET
 from lxml.etree import QName
 
 
+import portconfig
 from portconfig import get_port_config
 from sonic_py_common.interface import backplane_prefix
 
 # TODO: Remove this once we no longer support Python 2
 if sys.version_info.major == 3:
     UNICODE_TYPE = str
+    intern = sys.intern
 else:
     UNICODE_TYPE = unicode
 
@@ -31,6 +36,25 @@ ns1 = "http://schemas.datacontract.org/2004/07/Microsoft.Search.Autopilot.Evolut
 ns2 = "Microsoft.Search.Autopilot.NetMux"
 ns3 = "http://www.w3.org/2001/XMLSchema-instance"
 
+class TagTable(object):
+    """ Qualified tag names of a namespace, e.g. ns_tag.Hostname == str(QName(ns, "Hostname")).
+    Each tag name is built and interned on first use and is a plain attribute afterwards.
+    """
+    def __init__(self, namespace):
+        self._namespace = namespace
+
+    def __getattr__(self, tag):
+        if tag.startswith('_'):
+            raise AttributeError(tag)
+        value = intern(str(QName(self._namespace, tag)))
+        setattr(self, tag, value)
+        return value
+
+ns_tag = TagTable(ns)
+ns1_tag = TagTable(ns1)
+ns2_tag = TagTable(ns2)
+ns3_tag = TagTable(ns3)
+
 # Device types
 spine_chassis_frontend_role = 'SpineChassisFrontendRouter'
 chassis_backend_role = 'ChassisBackendRouter'
@@ -47,6 +71,16 @@ BACKEND_ASIC_SUB_ROLE = 'BackEnd'
 # Default Virtual Network Index (VNI) 
 vni_default = 8000
 
+# Parsed minigraph snapshots are stored in this directory, which is not carried
+# over on image upgrade. Bump the version whenever the layout of the parse
+# results changes; the sources of the parser are part of the cache key anyway.
+MINIGRAPH_CACHE_DIR = '/var/cache/sonic/minigraph'
+MINIGRAPH_CACHE_VERSION = 2
+# Set to '0' to always re-parse the minigraph
+MINIGRAPH_CACHE_ENV = 'SONIC_MINIGRAPH_CACHE'
+# Set to use another directory for the snapshots
+MINIGRAPH_CACHE_DIR_ENV = 'SONIC_MINIGRAPH_CACHE_DIR'
+
 ###############################################################################
 #
 # Minigraph parsing functions
@@ -87,25 +121,25 @@ def parse_device(device):
     cluster = None
 
     for node in device:
-        if node.tag == str(QName(ns, "Address")):
-            lo_prefix = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "AddressV6")):
-            lo_prefix_v6 = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "ManagementAddress")):
-            mgmt_prefix = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "Hostname")):
+        if node.tag == ns_tag.Address:
+            lo_prefix = node.find(ns2_tag.IPPrefix).text
+        elif node.tag == ns_tag.AddressV6:
+            lo_prefix_v6 = node.find(ns2_tag.IPPrefix).text
+        elif node.tag == ns_tag.ManagementAddress:
+            mgmt_prefix = node.find(ns2_tag.IPPrefix).text
+        elif node.tag == ns_tag.Hostname:
             name = node.text
-        elif node.tag == str(QName(ns, "HwSku")):
+        elif node.tag == ns_tag.HwSku:
             hwsku = node.text
-        elif node.tag == str(QName(ns, "DeploymentId")):
+        elif node.tag == ns_tag.DeploymentId:
             deployment_id = node.text
-        elif node.tag == str(QName(ns, "ElementType")):
+        elif node.tag == ns_tag.ElementType:
             d_type = node.text
-        elif node.tag == str(QName(ns, "ClusterName")):
+        elif node.tag == ns_tag.ClusterName:
             cluster = node.text
 
-    if d_type is None and str(QName(ns3, "type")) in device.attrib:
-        d_type = device.attrib[str(QName(ns3, "type"))]
+    if d_type is None and ns3_tag.type in device.attrib:
+        d_type = device.attrib[ns3_tag.type]
 
     return (lo_prefix, lo_prefix_v6, mgmt_prefix, name, hwsku, d_type, deployment_id, cluster)
 
@@ -188,16 +222,39 @@ def parse_png(png, hname, dpg_ecmp_content = None):
     NEIGH = {}
 
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
-                linktype = link.find(str(QName(ns, "ElementType"))).text
+        if child.tag == ns_tag.DeviceInterfaceLinks:
+            # All the link attributes are collected in a single pass over the links
+            for link in child.findall(ns_tag.DeviceLinkBase):
+                linktype = link.find(ns_tag.ElementType).text
+
+                link_type = link.get(ns3_tag.type)
+                if link_type == 'DeviceSerialLink':
+                    for node in link:
+                        if node.tag == ns_tag.EndPort:
+                            console_port = node.text.split()[-1]
+                        elif node.tag == ns_tag.EndDevice:
+                            console_dev = node.text
+                elif link_type == 'DeviceMgmtLink':
+                    for node in link:
+                        if node.tag == ns_tag.EndPort:
+                            mgmt_port = node.text.split()[-1]
+                        elif node.tag == ns_tag.EndDevice:
+                            mgmt_dev = node.text
+
+                if linktype == "LogicalLink":
+                    intf_name = link.find(ns_tag.EndPort).text
+                    if intf_name in port_alias_map:
+                        intf_name = port_alias_map[intf_name]
+
+                    mux_cable_ports[intf_name] = "true"
+
                 if linktype == "DeviceSerialLink":
-                    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-                    endport = link.find(str(QName(ns, "EndPort"))).text
-                    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                    startport = link.find(str(QName(ns, "StartPort"))).text
-                    baudrate = link.find(str(QName(ns, "Bandwidth"))).text
-                    flowcontrol = 1 if link.find(str(QName(ns, "FlowControl"))) is not None and link.find(str(QName(ns, "FlowControl"))).text == 'true' else 0
+                    enddevice = link.find(ns_tag.EndDevice).text
+                    endport = link.find(ns_tag.EndPort).text
+                    startdevice = link.find(ns_tag.StartDevice).text
+                    startport = link.find(ns_tag.StartPort).text
+                    baudrate = link.find(ns_tag.Bandwidth).text
+                    flowcontrol = 1 if link.find(ns_tag.FlowControl) is not None and link.find(ns_tag.FlowControl).text == 'true' else 0
                     if enddevice.lower() == hname.lower() and endport.isdigit():
                         console_ports[endport] = {
                             'remote_device': startdevice,
@@ -213,18 +270,18 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     continue
 
                 if linktype == "DeviceInterfaceLink":
-                    endport = link.find(str(QName(ns, "EndPort"))).text
-                    startdevice = link.find(str(QName(ns, "StartDevice"))).text
+                    endport = link.find(ns_tag.EndPort).text
+                    startdevice = link.find(ns_tag.StartDevice).text
                     port_device_map[endport] = startdevice
 
                 if linktype != "DeviceInterfaceLink" and linktype != "UnderlayInterfaceLink" and linktype != "DeviceMgmtLink":
                     continue
 
-                enddevice = link.find(str(QName(ns, "EndDevice"))).text
-                endport = link.find(str(QName(ns, "EndPort"))).text
-                startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                startport = link.find(str(QName(ns, "StartPort"))).text
-                bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+                enddevice = link.find(ns_tag.EndDevice).text
+                endport = link.find(ns_tag.EndPort).text
+                startdevice = link.find(ns_tag.StartDevice).text
+                startport = link.find(ns_tag.StartPort).text
+                bandwidth_node = link.find(ns_tag.Bandwidth)
                 bandwidth = bandwidth_node.text if bandwidth_node is not None else None
                 if enddevice.lower() == hname.lower():
                     if endport in port_alias_map:
@@ -241,8 +298,8 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     if bandwidth:
                         port_speeds[startport] = bandwidth
 
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == ns_tag.Devices:
+            for device in child.findall(ns_tag.Device):
                 (lo_prefix, lo_prefix_v6, mgmt_prefix, name, hwsku, d_type, deployment_id, cluster) = parse_device(device)
                 device_data = {'lo_addr': lo_prefix, 'type': d_type, 'mgmt_addr': mgmt_prefix, 'hwsku': hwsku }
                 if cluster:
@@ -253,33 +310,6 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     device_data['lo_addr_v6'] = lo_prefix_v6
                 devices[name] = device_data
 
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for if_link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if str(QName(ns3, "type")) in if_link.attrib:
-                    link_type = if_link.attrib[str(QName(ns3, "type"))]
-                    if link_type == 'DeviceSerialLink':
-                        for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
-                                console_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
-                                console_dev = node.text
-                    elif link_type == 'DeviceMgmtLink':
-                        for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
-                                mgmt_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
-                                mgmt_dev = node.text
-
-
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if link.find(str(QName(ns, "ElementType"))).text == "LogicalLink":
-                    intf_name = link.find(str(QName(ns, "EndPort"))).text
-                    if intf_name in port_alias_map:
-                        intf_name = port_alias_map[intf_name]
-
-                    mux_cable_ports[intf_name] = "true"
-
         if dpg_ecmp_content and (len(dpg_ecmp_content)):
             for version, content in dpg_ecmp_content.items():  # version is ipv4 or ipv6
                 fine_grained_content = formulate_fine_grained_ecmp(version, content, port_device_map, port_alias_map)  # port_alias_map
@@ -295,11 +325,11 @@ def parse_png(png, hname, dpg_ecmp_content = None):
 def parse_asic_external_link(link, asic_name, hostname):
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link.find(ns_tag.EndDevice).text
+    endport = link.find(ns_tag.EndPort).text
+    startdevice = link.find(ns_tag.StartDevice).text
+    startport = link.find(ns_tag.StartPort).text
+    bandwidth_node = link.find(ns_tag.Bandwidth)
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     # if chassis internal is false, the interface name will be
     # interface alias which should be converted to asic port name
@@ -323,11 +353,11 @@ def parse_asic_external_link(link, asic_name, hostname):
 def parse_asic_internal_link(link, asic_name, hostname):
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link.find(ns_tag.EndDevice).text
+    endport = link.find(ns_tag.EndPort).text
+    startdevice = link.find(ns_tag.StartDevice).text
+    startport = link.find(ns_tag.StartPort).text
+    bandwidth_node = link.find(ns_tag.Bandwidth)
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     if ((enddevice.lower() == asic_name.lower()) and
             (startdevice.lower() != hostname.lower())):
@@ -351,13 +381,13 @@ def parse_asic_png(png, asic_name, hostname):
     devices = {}
     port_speeds = {}
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
+        if child.tag == ns_tag.DeviceInterfaceLinks:
+            for link in child.findall(ns_tag.DeviceLinkBase):
                 # Chassis internal node is used in multi-asic device or chassis minigraph
                 # where the minigraph will contain the internal asic connectivity and
                 # external neighbor information. The ChassisInternal node will be used to
                 # determine if the link is internal to the device or chassis.
-                chassis_internal_node = link.find(str(QName(ns, "ChassisInternal")))
+                chassis_internal_node = link.find(ns_tag.ChassisInternal)
                 chassis_internal = chassis_internal_node.text if chassis_internal_node is not None else "false"
 
                 # If the link is an external link include the external neighbor
@@ -371,8 +401,8 @@ def parse_asic_png(png, asic_name, hostname):
                     neighbors.update(int_neighbors)
                     port_speeds.update(int_port_speeds)
 
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == ns_tag.Devices:
+            for device in child.findall(ns_tag.Device):
                 (lo_prefix, lo_prefix_v6, mgmt_prefix, name, hwsku, d_type, deployment_id, cluster) = parse_device(device)
                 device_data = {'lo_addr': lo_prefix, 'type': d_type, 'mgmt_addr': mgmt_prefix, 'hwsku': hwsku }
                 if cluster:
@@ -387,11 +417,11 @@ def parse_asic_png(png, asic_name, hostname):
     return (neighbors, devices, port_speeds)
 
 def parse_loopback_intf(child):
-    lointfs = child.find(str(QName(ns, "LoopbackIPInterfaces")))
+    lointfs = child.find(ns_tag.LoopbackIPInterfaces)
     lo_intfs = {}
-    for lointf in lointfs.findall(str(QName(ns1, "LoopbackIPInterface"))):
-        intfname = lointf.find(str(QName(ns, "AttachTo"))).text
-        ipprefix = lointf.find(str(QName(ns1, "PrefixStr"))).text
+    for lointf in lointfs.findall(ns1_tag.LoopbackIPInterface):
+        intfname = lointf.find(ns_tag.AttachTo).text
+        ipprefix = lointf.find(ns1_tag.PrefixStr).text
         lo_intfs[(intfname, ipprefix)] = {}
     return lo_intfs
 
@@ -406,91 +436,91 @@ def parse_dpg(dpg, hname):
             There is just one aclintf node in the minigraph
             Get the aclintfs node first.
         """
-        if aclintfs is None and child.find(str(QName(ns, "AclInterfaces"))) is not None:
-            aclintfs = child.find(str(QName(ns, "AclInterfaces")))
+        if aclintfs is None and child.find(ns_tag.AclInterfaces) is not None:
+            aclintfs = child.find(ns_tag.AclInterfaces)
         """
             In Multi-NPU platforms the mgmt intfs are defined only for the host not for individual asic
             There is just one mgmtintf node in the minigraph
             Get the mgmtintfs node first. We need mgmt intf to get mgmt ip in per asic dockers.
         """
-        if mgmtintfs is None and child.find(str(QName(ns, "ManagementIPInterfaces"))) is not None:
-            mgmtintfs = child.find(str(QName(ns, "ManagementIPInterfaces")))
-        hostname = child.find(str(QName(ns, "Hostname")))
+        if mgmtintfs is None and child.find(ns_tag.ManagementIPInterfaces) is not None:
+            mgmtintfs = child.find(ns_tag.ManagementIPInterfaces)
+        hostname = child.find(ns_tag.Hostname)
         if hostname.text.lower() != hname.lower():
             continue
 
         vni = vni_default
-        vni_element = child.find(str(QName(ns, "VNI")))
+        vni_element = child.find(ns_tag.VNI)
         if vni_element != None:
             if vni_element.text.isdigit():
                 vni = int(vni_element.text)
             else:
                 print("VNI must be an integer (use default VNI %d instead)" % vni_default, file=sys.stderr) 
 
-        ipintfs = child.find(str(QName(ns, "IPInterfaces")))
+        ipintfs = child.find(ns_tag.IPInterfaces)
         intfs = {}
         ip_intfs_map = {}
-        for ipintf in ipintfs.findall(str(QName(ns, "IPInterface"))):
-            intfalias = ipintf.find(str(QName(ns, "AttachTo"))).text
+        for ipintf in ipintfs.findall(ns_tag.IPInterface):
+            intfalias = ipintf.find(ns_tag.AttachTo).text
             intfname = port_alias_map.get(intfalias, intfalias)
-            ipprefix = ipintf.find(str(QName(ns, "Prefix"))).text
+            ipprefix = ipintf.find(ns_tag.Prefix).text
             intfs[(intfname, ipprefix)] = {}
             ip_intfs_map[ipprefix] = intfalias
         lo_intfs =  parse_loopback_intf(child)
 
-        subintfs = child.find(str(QName(ns, "SubInterfaces")))
+        subintfs = child.find(ns_tag.SubInterfaces)
         if subintfs is not None:
-            for subintf in subintfs.findall(str(QName(ns, "SubInterface"))):
-                intfalias = subintf.find(str(QName(ns, "AttachTo"))).text
+            for subintf in subintfs.findall(ns_tag.SubInterface):
+                intfalias = subintf.find(ns_tag.AttachTo).text
                 intfname = port_alias_map.get(intfalias, intfalias)
-                ipprefix = subintf.find(str(QName(ns, "Prefix"))).text
-                subintfvlan = subintf.find(str(QName(ns, "Vlan"))).text
+                ipprefix = subintf.find(ns_tag.Prefix).text
+                subintfvlan = subintf.find(ns_tag.Vlan).text
                 subintfname = intfname + VLAN_SUB_INTERFACE_SEPARATOR + subintfvlan
                 intfs[(subintfname, ipprefix)] = {}
 
-        mvrfConfigs = child.find(str(QName(ns, "MgmtVrfConfigs")))
+        mvrfConfigs = child.find(ns_tag.MgmtVrfConfigs)
         mvrf = {}
         if mvrfConfigs != None:
-            mv = mvrfConfigs.find(str(QName(ns1, "MgmtVrfGlobal")))
+            mv = mvrfConfigs.find(ns1_tag.MgmtVrfGlobal)
             if mv != None:
-                mvrf_en_flag = mv.find(str(QName(ns, "mgmtVrfEnabled"))).text
+                mvrf_en_flag = mv.find(ns_tag.mgmtVrfEnabled).text
                 mvrf["vrf_global"] = {"mgmtVrfEnabled": mvrf_en_flag}
 
         mgmt_intf = {}
-        for mgmtintf in mgmtintfs.findall(str(QName(ns1, "ManagementIPInterface"))):
-            intfname = mgmtintf.find(str(QName(ns, "AttachTo"))).text
-            ipprefix = mgmtintf.find(str(QName(ns1, "PrefixStr"))).text
+        for mgmtintf in mgmtintfs.findall(ns1_tag.ManagementIPInterface):
+            intfname = mgmtintf.find(ns_tag.AttachTo).text
+            ipprefix = mgmtintf.find(ns1_tag.PrefixStr).text
             mgmtipn = ipaddress.ip_network(UNICODE_TYPE(ipprefix), False)
             gwaddr = ipaddress.ip_address(next(mgmtipn.hosts()))
             mgmt_intf[(intfname, ipprefix)] = {'gwaddr': gwaddr}
 
-        voqinbandintfs = child.find(str(QName(ns, "VoqInbandInterfaces")))
+        voqinbandintfs = child.find(ns_tag.VoqInbandInterfaces)
         voq_inband_intfs = {}
         if voqinbandintfs:
-            for voqintf in voqinbandintfs.findall(str(QName(ns1, "VoqInbandInterface"))):
-                intfname = voqintf.find(str(QName(ns, "Name"))).text
-                intftype = voqintf.find(str(QName(ns, "Type"))).text
-                ipprefix = voqintf.find(str(QName(ns1, "PrefixStr"))).text
+            for voqintf in voqinbandintfs.findall(ns1_tag.VoqInbandInterface):
+                intfname = voqintf.find(ns_tag.Name).text
+                intftype = voqintf.find(ns_tag.Type).text
+                ipprefix = voqintf.find(ns1_tag.PrefixStr).text
                 if intfname not in voq_inband_intfs:
                    voq_inband_intfs[intfname] = {'inband_type': intftype}
                 voq_inband_intfs["%s|%s" % (intfname, ipprefix)] = {}
 
-        pcintfs = child.find(str(QName(ns, "PortChannelInterfaces")))
+        pcintfs = child.find(ns_tag.PortChannelInterfaces)
         pc_intfs = []
         pcs = {}
         pc_members = {}
         intfs_inpc = [] # List to hold all the LAG member interfaces 
-        for pcintf in pcintfs.findall(str(QName(ns, "PortChannel"))):
-            pcintfname = pcintf.find(str(QName(ns, "Name"))).text
-            pcintfmbr = pcintf.find(str(QName(ns, "AttachTo"))).text
+        for pcintf in pcintfs.findall(ns_tag.PortChannel):
+            pcintfname = pcintf.find(ns_tag.Name).text
+            pcintfmbr = pcintf.find(ns_tag.AttachTo).text
             pcmbr_list = pcintfmbr.split(';')
             pc_intfs.append(pcintfname)
             for i, member in enumerate(pcmbr_list):
                 pcmbr_list[i] = port_alias_map.get(member, member)
                 intfs_inpc.append(pcmbr_list[i])
                 pc_members[(pcintfname, pcmbr_list[i])] = {}
-            if pcintf.find(str(QName(ns, "Fallback"))) != None:
-                pcs[pcintfname] = {'members': pcmbr_list, 'fallback': pcintf.find(str(QName(ns, "Fallback"))).text, 'min_links': str(int(math.ceil(len() * 0.75)))}
+            if pcintf.find(ns_tag.Fallback) != None:
+                pcs[pcintfname] = {'members': pcmbr_list, 'fallback': pcintf.find(ns_tag.Fallback).text, 'min_links': str(int(math.ceil(len() * 0.75)))}
             else:
                 pcs[pcintfname] = {'members': pcmbr_list, 'min_links': str(int(math.ceil(len(pcmbr_list) * 0.75)))}
         port_nhipv4_map = {}
@@ -499,22 +529,22 @@ def parse_dpg(dpg, hname):
         nhportlist = []
         dpg_ecmp_content = {}
         static_routes = {}
-        ipnhs = child.find(str(QName(ns, "IPNextHops")))
+        ipnhs = child.find(ns_tag.IPNextHops)
         if ipnhs is not None:
-            for ipnh in ipnhs.findall(str(QName(ns, "IPNextHop"))):
-                if ipnh.find(str(QName(ns, "Type"))).text == 'FineGrainedECMPGroupMember':
-                    ipnhfmbr = ipnh.find(str(QName(ns, "AttachTo"))).text
-                    ipnhaddr = ipnh.find(str(QName(ns, "Address"))).text
+            for ipnh in ipnhs.findall(ns_tag.IPNextHop):
+                if ipnh.find(ns_tag.Type).text == 'FineGrainedECMPGroupMember':
+                    ipnhfmbr = ipnh.find(ns_tag.AttachTo).text
+                    ipnhaddr = ipnh.find(ns_tag.Address).text
                     nhportlist.append(ipnhfmbr)
                     if "." in ipnhaddr:
                         port_nhipv4_map[ipnhfmbr] = ipnhaddr
                     elif ":" in ipnhaddr:
                         port_nhipv6_map[ipnhfmbr] = ipnhaddr
-                elif ipnh.find(str(QName(ns, "Type"))).text == 'StaticRoute':
-                    prefix = ipnh.find(str(QName(ns, "AssociatedTo"))).text
-                    ifname = ipnh.find(str(QName(ns, "AttachTo"))).text
-                    nexthop = ipnh.find(str(QName(ns, "Address"))).text
-                    advertise = ipnh.find(str(QName(ns, "Advertise"))).text
+                elif ipnh.find(ns_tag.Type).text == 'StaticRoute':
+                    prefix = ipnh.find(ns_tag.AssociatedTo).text
+                    ifname = ipnh.find(ns_tag.AttachTo).text
+                    nexthop = ipnh.find(ns_tag.Address).text
+                    advertise = ipnh.find(ns_tag.Advertise).text
                     static_routes[prefix] = {'nexthop': nexthop, 'ifname': ifname, 'advertise': advertise}
 
             if port_nhipv4_map and port_nhipv6_map:
@@ -531,30 +561,30 @@ def parse_dpg(dpg, hname):
                 dpg_ecmp_content['ipv4'] = ipv4_content
                 dpg_ecmp_content['ipv6'] = ipv6_content
 
-        vlanintfs = child.find(str(QName(ns, "VlanInterfaces")))
+        vlanintfs = child.find(ns_tag.VlanInterfaces)
         vlans = {}
         vlan_members = {}
         vlan_member_list = {}
         dhcp_relay_table = {}
         # Dict: vlan member (port/PortChannel) -> set of VlanID, in which the member if an untagged vlan member
         untagged_vlan_mbr = defaultdict(set)
-        for vintf in vlanintfs.findall(str(QName(ns, "VlanInterface"))):
-            vlanid = vintf.find(str(QName(ns, "VlanID"))).text
-            vlantype = vintf.find(str(QName(ns, "Type")))
+        for vintf in vlanintfs.findall(ns_tag.VlanInterface):
+            vlanid = vintf.find(ns_tag.VlanID).text
+            vlantype = vintf.find(ns_tag.Type)
             if vlantype is None:
                 vlantype_name = ""
             else:
                 vlantype_name = vlantype.text
-            vintfmbr = vintf.find(str(QName(ns, "AttachTo"))).text
+            vintfmbr = vintf.find(ns_tag.AttachTo).text
             vmbr_list = vintfmbr.split(';')
             if vlantype_name != "Tagged":
                 for member in vmbr_list:
                     untagged_vlan_mbr[member].add(vlanid)
-        for vintf in vlanintfs.findall(str(QName(ns, "VlanInterface"))):
-            vintfname = vintf.find(str(QName(ns, "Name"))).text
-            vlanid = vintf.find(str(QName(ns, "VlanID"))).text
-            vintfmbr = vintf.find(str(QName(ns, "AttachTo"))).text
-            vlantype = vintf.find(str(QName(ns, "Type")))
+        for vintf in vlanintfs.findall(ns_tag.VlanInterface):
+            vintfname = vintf.find(ns_tag.Name).text
+            vlanid = vintf.find(ns_tag.VlanID).text
+            vintfmbr = vintf.find(ns_tag.AttachTo).text
+            vlantype = vintf.find(ns_tag.Type)
             if vlantype is None:
                 vlantype_name = ""
             else:
@@ -575,13 +605,13 @@ def parse_dpg(dpg, hname):
 
             # If this VLAN requires a DHCP relay agent, it will contain a <DhcpRelays> element
             # containing a list of DHCP server IPs
-            vintf_node = vintf.find(str(QName(ns, "DhcpRelays")))
+            vintf_node = vintf.find(ns_tag.DhcpRelays)
             if vintf_node is not None and vintf_node.text is not None:
                 vintfdhcpservers = vintf_node.text
                 vdhcpserver_list = vintfdhcpservers.split(';')
                 vlan_attributes['dhcp_servers'] = vdhcpserver_list
 
-            vintf_node = vintf.find(str(QName(ns, "Dhcpv6Relays")))
+            vintf_node = vintf.find(ns_tag.Dhcpv6Relays)
             if vintf_node is not None and vintf_node.text is not None:
                 vintfdhcpservers = vintf_node.text
                 vdhcpserver_list = vintfdhcpservers.split(';')
@@ -590,7 +620,7 @@ def parse_dpg(dpg, hname):
             sonic_vlan_member_name = "Vlan%s" % (vlanid)
             dhcp_relay_table[sonic_vlan_member_name] = dhcp_attributes
 
-            vlanmac = vintf.find(str(QName(ns, "MacAddress")))
+            vlanmac = vintf.find(ns_tag.MacAddress)
             if vlanmac is not None and vlanmac.text is not None:
                 vlan_attributes['mac'] = vlanmac.text
 
@@ -601,16 +631,16 @@ def parse_dpg(dpg, hname):
             vlan_member_list[sonic_vlan_name] = vmbr_list
 
         acls = {}
-        for aclintf in aclintfs.findall(str(QName(ns, "AclInterface"))):
-            if aclintf.find(str(QName(ns, "InAcl"))) is not None:
-                aclname = aclintf.find(str(QName(ns, "InAcl"))).text.upper().replace(" ", "_").replace("-", "_")
+        for aclintf in aclintfs.findall(ns_tag.AclInterface):
+            if aclintf.find(ns_tag.InAcl) is not None:
+                aclname = aclintf.find(ns_tag.InAcl).text.upper().replace(" ", "_").replace("-", "_")
                 stage = "ingress"
-            elif aclintf.find(str(QName(ns, "OutAcl"))) is not None:
-                aclname = aclintf.find(str(QName(ns, "OutAcl"))).text.upper().replace(" ", "_").replace("-", "_")
+            elif aclintf.find(ns_tag.OutAcl) is not None:
+                aclname = aclintf.find(ns_tag.OutAcl).text.upper().replace(" ", "_").replace("-", "_")
                 stage = "egress"
             else:
                 sys.exit("Error: 'AclInterface' must contain either an 'InAcl' or 'OutAcl' subelement.")
-            aclattach = aclintf.find(str(QName(ns, "AttachTo"))).text.split(';')
+            aclattach = aclintf.find(ns_tag.AttachTo).text.split(';')
             acl_intfs = []
             is_mirror = False
             is_mirror_v6 = False
@@ -681,7 +711,7 @@ def parse_dpg(dpg, hname):
             else:
                 # This ACL has no interfaces to attach to -- consider this a control plane ACL
                 try:
-                    aclservice = aclintf.find(str(QName(ns, "Type"))).text
+                    aclservice = aclintf.find(ns_tag.Type).text
 
                     # If we already have an ACL with this name and this ACL is bound to a different service,
                     # append the service to our list of services
@@ -701,13 +731,13 @@ def parse_dpg(dpg, hname):
                     print("Warning: Ignoring Control Plane ACL %s without type" % aclname, file=sys.stderr)
 
 
-        mg_tunnels = child.find(str(QName(ns, "TunnelInterfaces")))
+        mg_tunnels = child.find(ns_tag.TunnelInterfaces)
         if mg_tunnels is not None:
             table_key_to_mg_key_map = {"encap_ecn_mode": "EcnEncapsulationMode", 
                                        "ecn_mode": "EcnDecapsulationMode", 
                                        "dscp_mode": "DifferentiatedServicesCodePointMode", 
                                        "ttl_mode": "TtlMode"}
-            for mg_tunnel in mg_tunnels.findall(str(QName(ns, "TunnelInterface"))):
+            for mg_tunnel in mg_tunnels.findall(ns_tag.TunnelInterface):
                 tunnel_type = mg_tunnel.attrib["Type"]
                 tunnel_name = mg_tunnel.attrib["Name"]
                 tunnelintfs[tunnel_type][tunnel_name] = {
@@ -726,7 +756,7 @@ def parse_dpg(dpg, hname):
 
 def parse_host_loopback(dpg, hname):
     for child in dpg:
-        hostname = child.find(str(QName(ns, "Hostname")))
+        hostname = child.find(ns_tag.Hostname)
         if hostname.text.lower() != hname.lower():
             continue
         lo_intfs = parse_loopback_intf(child)
@@ -740,25 +770,25 @@ def parse_cpg(cpg, hname, local_devices=[]):
     bgp_peers_with_range = {}
     for child in cpg:
         tag = child.tag
-        if tag == str(QName(ns, "PeeringSessions")):
-            for session in child.findall(str(QName(ns, "BGPSession"))):
-                start_router = session.find(str(QName(ns, "StartRouter"))).text
-                start_peer = session.find(str(QName(ns, "StartPeer"))).text
-                end_router = session.find(str(QName(ns, "EndRouter"))).text
-                end_peer = session.find(str(QName(ns, "EndPeer"))).text
-                rrclient = 1 if session.find(str(QName(ns, "RRClient"))) is not None else 0
-                if session.find(str(QName(ns, "HoldTime"))) is not None:
-                    holdtime = session.find(str(QName(ns, "HoldTime"))).text
+        if tag == ns_tag.PeeringSessions:
+            for session in child.findall(ns_tag.BGPSession):
+                start_router = session.find(ns_tag.StartRouter).text
+                start_peer = session.find(ns_tag.StartPeer).text
+                end_router = session.find(ns_tag.EndRouter).text
+                end_peer = session.find(ns_tag.EndPeer).text
+                rrclient = 1 if session.find(ns_tag.RRClient) is not None else 0
+                if session.find(ns_tag.HoldTime) is not None:
+                    holdtime = session.find(ns_tag.HoldTime).text
                 else:
                     holdtime = 180
-                if session.find(str(QName(ns, "KeepAliveTime"))) is not None:
-                    keepalive = session.find(str(QName(ns, "KeepAliveTime"))).text
+                if session.find(ns_tag.KeepAliveTime) is not None:
+                    keepalive = session.find(ns_tag.KeepAliveTime).text
                 else:
                     keepalive = 60
-                nhopself = 1 if session.find(str(QName(ns, "NextHopSelf"))) is not None else 0
+                nhopself = 1 if session.find(ns_tag.NextHopSelf) is not None else 0
 
                 # choose the right table and admin_status for the peer
-                chassis_internal_ibgp = session.find(str(QName(ns, "ChassisInternal")))
+                chassis_internal_ibgp = session.find(ns_tag.ChassisInternal)
                 if chassis_internal_ibgp is not None and chassis_internal_ibgp.text == "voq":
                     table = bgp_voq_chassis_sessions
                     admin_status = 'up'
@@ -794,40 +824,35 @@ def parse_cpg(cpg, hname, local_devices=[]):
                     }
                     if admin_status:
                         table[end_peer.lower()]['admin_status'] = admin_status
-        elif child.tag == str(QName(ns, "Routers")):
-            for router in child.findall(str(QName(ns1, "BGPRouterDeclaration"))):
-                asn = router.find(str(QName(ns1, "ASN"))).text
-                hostname = router.find(str(QName(ns1, "Hostname"))).text
+        elif child.tag == ns_tag.Routers:
+            # Index the sessions by peer name, so each router declaration is an O(1) lookup
+            sessions_by_name = defaultdict(list)
+            for table in (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions):
+                for bgp_session in table.values():
+                    sessions_by_name[bgp_session['name'].lower()].append(bgp_session)
+            for router in child.findall(ns1_tag.BGPRouterDeclaration):
+                asn = router.find(ns1_tag.ASN).text
+                hostname = router.find(ns1_tag.Hostname).text
                 if hostname.lower() == hname.lower():
                     myasn = asn
-                    peers = router.find(str(QName(ns1, "Peers")))
-                    for bgpPeer in peers.findall(str(QName(ns, "BGPPeer"))):
-                        addr = bgpPeer.find(str(QName(ns, "Address"))).text
-                        if bgpPeer.find(str(QName(ns1, "PeersRange"))) is not None: # FIXME: is better to check for type BGPPeerPassive
-                            name = bgpPeer.find(str(QName(ns1, "Name"))).text
-                            ip_range = bgpPeer.find(str(QName(ns1, "PeersRange"))).text
+                    peers = router.find(ns1_tag.Peers)
+                    for bgpPeer in peers.findall(ns_tag.BGPPeer):
+                        addr = bgpPeer.find(ns_tag.Address).text
+                        if bgpPeer.find(ns1_tag.PeersRange) is not None: # FIXME: is better to check for type BGPPeerPassive
+                            name = bgpPeer.find(ns1_tag.Name).text
+                            ip_range = bgpPeer.find(ns1_tag.PeersRange).text
                             ip_range_group = ip_range.split(';') if ip_range and ip_range != "" else []
                             bgp_peers_with_range[name] = {
                                 'name': name,
                                 'ip_range': ip_range_group
                             }
-                            if bgpPeer.find(str(QName(ns, "Address"))) is not None:
-                                bgp_peers_with_range[name]['src_address'] = bgpPeer.find(str(QName(ns, "Address"))).text
-                            if bgpPeer.find(str(QName(ns1, "PeerAsn"))) is not None:
-                                bgp_peers_with_range[name]['peer_asn'] = bgpPeer.find(str(QName(ns1, "PeerAsn"))).text
+                            if bgpPeer.find(ns_tag.Address) is not None:
+                                bgp_peers_with_range[name]['src_address'] = bgpPeer.find(ns_tag.Address).text
+                            if bgpPeer.find(ns1_tag.PeerAsn) is not None:
+                                bgp_peers_with_range[name]['peer_asn'] = bgpPeer.find(ns1_tag.PeerAsn).text
                 else:
-                    for peer in bgp_sessions:
-                        bgp_session = bgp_sessions[peer]
-                        if hostname.lower() == bgp_session['name'].lower():
-                            bgp_session['asn'] = asn
-                    for peer in bgp_internal_sessions:
-                        bgp_internal_session = bgp_internal_sessions[peer]
-                        if hostname.lower() == bgp_internal_session['name'].lower():
-                            bgp_internal_session['asn'] = asn
-                    for peer in bgp_voq_chassis_sessions:
-                        bgp_session = bgp_voq_chassis_sessions[peer]
-                        if hostname.lower() == bgp_session['name'].lower():
-                            bgp_session['asn'] = asn
+                    for bgp_session in sessions_by_name.get(hostname.lower(), []):
+                        bgp_session['asn'] = asn
 
     bgp_monitors = { key: bgp_sessions[key] for key in bgp_sessions if 'asn' in bgp_sessions[key] and bgp_sessions[key]['name'] == 'BGPMonitor' }
     def filter_bad_asn(table):
@@ -856,13 +881,13 @@ def parse_meta(meta, hname):
     switch_type = None
     max_cores = None
     kube_data = {}
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
+    device_metas = meta.find(ns_tag.Devices)
+    for device in device_metas.findall(ns1_tag.DeviceMetadata):
+        if device.find(ns1_tag.Name).text.lower() == hname.lower():
+            properties = device.find(ns1_tag.Properties)
+            for device_property in properties.findall(ns1_tag.DeviceProperty):
+                name = device_property.find(ns1_tag.Name).text
+                value = device_property.find(ns1_tag.Value).text
                 value_group = value.strip().split(';') if value and value != "" else []
                 if name == "DhcpResources":
                     dhcp_servers = value_group
@@ -900,14 +925,14 @@ def parse_meta(meta, hname):
 
 
 def parse_linkmeta(meta, hname):
-    link = meta.find(str(QName(ns, "Link")))
+    link = meta.find(ns_tag.Link)
     linkmetas = {}
-    for linkmeta in link.findall(str(QName(ns1, "LinkMetadata"))):
+    for linkmeta in link.findall(ns1_tag.LinkMetadata):
         port = None
         fec_disabled = None
 
         # Sample: ARISTA05T1:Ethernet1/33;switch-t0:fortyGigE0/4
-        key = linkmeta.find(str(QName(ns1, "Key"))).text
+        key = linkmeta.find(ns1_tag.Key).text
         endpoints = key.split(';')
         for endpoint in endpoints:
             t = endpoint.split(':')
@@ -923,10 +948,10 @@ def parse_linkmeta(meta, hname):
         lower_tor_hostname = ''
         auto_negotiation = None
 
-        properties = linkmeta.find(str(QName(ns1, "Properties")))
-        for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-            name = device_property.find(str(QName(ns1, "Name"))).text
-            value = device_property.find(str(QName(ns1, "Value"))).text
+        properties = linkmeta.find(ns1_tag.Properties)
+        for device_property in properties.findall(ns1_tag.DeviceProperty):
+            name = device_property.find(ns1_tag.Name).text
+            value = device_property.find(ns1_tag.Value).text
             if name == "FECDisabled":
                 fec_disabled = value
             elif name == "GeminiPeeringLink":
@@ -956,13 +981,13 @@ def parse_asic_meta(meta, hname):
     switch_id = None
     switch_type = None
     max_cores = None
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
+    device_metas = meta.find(ns_tag.Devices)
+    for device in device_metas.findall(ns1_tag.DeviceMetadata):
+        if device.find(ns1_tag.Name).text.lower() == hname.lower():
+            properties = device.find(ns1_tag.Properties)
+            for device_property in properties.findall(ns1_tag.DeviceProperty):
+                name = device_property.find(ns1_tag.Name).text
+                value = device_property.find(ns1_tag.Value).text
                 if name == "SubRole":
                     sub_role = value
                 elif name == "SwitchId":
@@ -977,31 +1002,31 @@ def parse_deviceinfo(meta, hwsku):
     port_speeds = {}
     port_descriptions = {}
     sys_ports = {}
-    for device_info in meta.findall(str(QName(ns, "DeviceInfo"))):
-        dev_sku = device_info.find(str(QName(ns, "HwSku"))).text
+    for device_info in meta.findall(ns_tag.DeviceInfo):
+        dev_sku = device_info.find(ns_tag.HwSku).text
         if dev_sku == hwsku:
-            interfaces = device_info.find(str(QName(ns, "EthernetInterfaces"))).findall(str(QName(ns1, "EthernetInterface")))
-            interfaces = interfaces + device_info.find(str(QName(ns, "ManagementInterfaces"))).findall(str(QName(ns1, "ManagementInterface")))
+            interfaces = device_info.find(ns_tag.EthernetInterfaces).findall(ns1_tag.EthernetInterface)
+            interfaces = interfaces + device_info.find(ns_tag.ManagementInterfaces).findall(ns1_tag.ManagementInterface)
             for interface in interfaces:
-                alias = interface.find(str(QName(ns, "InterfaceName"))).text
-                speed = interface.find(str(QName(ns, "Speed"))).text
-                desc  = interface.find(str(QName(ns, "Description")))
+                alias = interface.find(ns_tag.InterfaceName).text
+                speed = interface.find(ns_tag.Speed).text
+                desc  = interface.find(ns_tag.Description)
                 if desc != None:
                     port_descriptions[port_alias_map.get(alias, alias)] = desc.text
                 port_speeds[port_alias_map.get(alias, alias)] = speed
 
-            sysports = device_info.find(str(QName(ns, "SystemPorts")))
+            sysports = device_info.find(ns_tag.SystemPorts)
             if sysports is not None:
-                for sysport in sysports.findall(str(QName(ns, "SystemPort"))):
-                    portname = sysport.find(str(QName(ns, "Name"))).text
-                    hostname = sysport.find(str(QName(ns, "Hostname")))
-                    asic_name = sysport.find(str(QName(ns, "AsicName")))
-                    system_port_id = sysport.find(str(QName(ns, "SystemPortId"))).text
-                    switch_id = sysport.find(str(QName(ns, "SwitchId"))).text
-                    core_id = sysport.find(str(QName(ns, "CoreId"))).text
-                    core_port_id = sysport.find(str(QName(ns, "CorePortId"))).text
-                    speed = sysport.find(str(QName(ns, "Speed"))).text
-                    num_voq = sysport.find(str(QName(ns, "NumVoq"))).text
+                for sysport in sysports.findall(ns_tag.SystemPort):
+                    portname = sysport.find(ns_tag.Name).text
+                    hostname = sysport.find(ns_tag.Hostname)
+                    asic_name = sysport.find(ns_tag.AsicName)
+                    system_port_id = sysport.find(ns_tag.SystemPortId).text
+                    switch_id = sysport.find(ns_tag.SwitchId).text
+                    core_id = sysport.find(ns_tag.CoreId).text
+                    core_port_id = sysport.find(ns_tag.CorePortId).text
+                    speed = sysport.find(ns_tag.Speed).text
+                    num_voq = sysport.find(ns_tag.NumVoq).text
                     key = portname
                     if asic_name is not None:
                        key = "%s|%s" % (asic_name.text, key)
@@ -1160,6 +1185,114 @@ def enable_internal_bgp_session(bgp_sessions, filename, asic_name):
             (local_sub_role == BACKEND_ASIC_SUB_ROLE and peer_sub_role == FRONTEND_ASIC_SUB_ROLE)):
             bgp_sessions[peer_ip].update({'admin_status': 'up'})
 
+###############################################################################
+#
+# Parsed minigraph cache
+#
+###############################################################################
+
+# Results of parse_asic_meta() and file digests for the lifetime of the process
+_asic_meta_cache = {}
+_file_digest_cache = {}
+
+def _minigraph_cache_enabled():
+    return os.environ.get(MINIGRAPH_CACHE_ENV, '1') != '0'
+
+def _file_digest(filename):
+    if not filename or not os.path.isfile(filename):
+        return None
+    stat = os.stat(filename)
+    stat_key = (os.path.abspath(filename), stat.st_mtime, stat.st_size)
+    if stat_key not in _file_digest_cache:
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        _file_digest_cache[stat_key] = digest.hexdigest()
+    return _file_digest_cache[stat_key]
+
+def _source_file(module_file):
+    """ Get the source file of a module, its __file__ may be the compiled file """
+    return os.path.splitext(module_file)[0] + '.py'
+
+def _minigraph_cache_file(filename, kind, *key):
+    """ Get the snapshot file name for the minigraph file and the parse arguments.
+    The content of the minigraph, of the port/hwsku config files and of the
+    parser sources is part of the key, so a snapshot made by another parser is not used.
+    """
+    minigraph_digest = _file_digest(filename)
+    if minigraph_digest is None:
+        return None
+    key_parts = [MINIGRAPH_CACHE_VERSION, sys.version_info.major, kind, minigraph_digest,
+                 _file_digest(_source_file(__file__)), _file_digest(_source_file(portconfig.__file__))]
+    for item in key:
+        key_parts.append(item)
+        if item is not None and os.path.isfile(str(item)):
+            key_parts.append(_file_digest(item))
+    key_digest = hashlib.sha256(repr(key_parts).encode()).hexdigest()
+    # Minigraph files with the same name in different directories don't evict each other's snapshots
+    path_digest = hashlib.sha256(os.path.abspath(filename).encode()).hexdigest()
+    cache_dir = os.environ.get(MINIGRAPH_CACHE_DIR_ENV, MINIGRAPH_CACHE_DIR)
+    return os.path.join(cache_dir, "{}-{}.{}.{}.pickle".format(os.path.basename(filename), path_digest[:8],
+                                                               minigraph_digest[:16], key_digest[:16]))
+
+def _load_minigraph_cache(cache_file):
+    if cache_file is None or not os.path.isfile(cache_file):
+        return None
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+def _store_minigraph_cache(cache_file, snapshot):
+    """ Atomically store the snapshot and drop snapshots of the previous minigraph contents.
+    The cache is best effort, so failures to write it are ignored.
+    """
+    if cache_file is None:
+        return
+    cache_dir, cache_name = os.path.split(cache_file)
+    minigraph_name, minigraph_digest, _, _ = cache_name.rsplit('.', 3)
+    tmp_file = "{}.{}.tmp".format(cache_file, os.getpid())
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        for name in os.listdir(cache_dir):
+            if name.startswith(minigraph_name + '.') and not name.startswith("{}.{}.".format(minigraph_name, minigraph_digest)):
+                os.remove(os.path.join(cache_dir, name))
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(snapshot, f, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_file, cache_file)
+    except (IOError, OSError):
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+def _parse_asic_meta_cached(filename, asic_name):
+    """ Get (sub_role, switch_id, switch_type, max_cores) for the asic, or None if the file does not exist """
+    if not os.path.isfile(filename):
+        return None
+    use_cache = _minigraph_cache_enabled()
+    cache_file = _minigraph_cache_file(filename, 'asic_meta', asic_name) if use_cache else None
+    if cache_file is not None:
+        if cache_file in _asic_meta_cache:
+            return _asic_meta_cache[cache_file]
+        asic_meta = _load_minigraph_cache(cache_file)
+        if asic_meta is not None:
+            _asic_meta_cache[cache_file] = asic_meta
+            return asic_meta
+
+    asic_meta = (None, None, None, None)
+    root = ET.parse(filename).getroot()
+    for child in root:
+        if child.tag == ns_tag.MetadataDeclaration:
+            asic_meta = parse_asic_meta(child, asic_name)
+            break
+
+    if cache_file is not None:
+        _asic_meta_cache[cache_file] = asic_meta
+        _store_minigraph_cache(cache_file, asic_meta)
+    return asic_meta
+
 ###############################################################################
 #
 # Main functions
@@ -1168,6 +1301,11 @@ def enable_internal_bgp_session(bgp_sessions, filename, asic_name):
 def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None):
     """ Parse minigraph xml file.
 
+    The parse results are cached next to the minigraph file, keyed by the
+    content of the minigraph and port config files and by the arguments.
+    A snapshot is only reused if the port config it was built with still
+    matches the current one.
+
     Keyword arguments:
     filename -- minigraph file name
     platform -- device platform
@@ -1175,6 +1313,29 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     asic_name -- asic name; to parse multi-asic device minigraph to 
     generate asic specific configuration.
      """
+    cache_file = None
+    if _minigraph_cache_enabled():
+        cache_file = _minigraph_cache_file(filename, 'parse_xml', platform, port_config_file, asic_name, hwsku_config_file)
+        snapshot = _load_minigraph_cache(cache_file)
+        if snapshot is not None:
+            (hwsku, port_config, results) = snapshot
+            if get_port_config(hwsku=hwsku, platform=platform, port_config_file=port_config_file, asic_name=asic_name, hwsku_config_file=hwsku_config_file) == port_config:
+                port_alias_map.update(port_config[1])
+                port_alias_asic_map.update(port_config[2])
+                return results
+
+    (results, hwsku, port_config) = _parse_xml(filename, platform, port_config_file, asic_name, hwsku_config_file)
+
+    if cache_file is not None:
+        _store_minigraph_cache(cache_file, (hwsku, port_config, results))
+    return results
+
+def _parse_xml(filename, platform, port_config_file, asic_name, hwsku_config_file):
+    """ Parse minigraph xml file, see parse_xml().
+
+    Returns a tuple of the parse results, the hwsku and the port config the
+    results were built with.
+    """
 
     root = ET.parse(filename).getroot()
 
@@ -1231,53 +1392,53 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     kube_data = {}
     static_routes = {}
 
-    hwsku_qn = QName(ns, "HwSku")
-    hostname_qn = QName(ns, "Hostname")
-    docker_routing_config_mode_qn = QName(ns, "DockerRoutingConfigMode")
+    # Get the device identity and the local device nodes from DeviceMetadata
     for child in root:
-        if child.tag == str(hwsku_qn):
+        tag = child.tag
+        if tag == ns_tag.HwSku:
             hwsku = child.text
-        if child.tag == str(hostname_qn):
+        elif tag == ns_tag.Hostname:
             hostname = child.text
-        if child.tag == str(docker_routing_config_mode_qn):
+        elif tag == ns_tag.DockerRoutingConfigMode:
             docker_routing_config_mode = child.text
+        elif tag == ns_tag.MetadataDeclaration:
+            local_devices.extend(parse_meta_devices(child))
 
     (ports, alias_map, alias_asic_map) = get_port_config(hwsku=hwsku, platform=platform, port_config_file=port_config_file, asic_name=asic_name, hwsku_config_file=hwsku_config_file)
+    port_config = copy.deepcopy((ports, alias_map, alias_asic_map))
     port_alias_map.update(alias_map)
     port_alias_asic_map.update(alias_asic_map)
 
-    # Get the local device node from DeviceMetadata
-    local_devices = parse_asic_meta_get_devices(root)
-
     for child in root:
+        tag = child.tag
         if asic_name is None:
-            if child.tag == str(QName(ns, "DpgDec")):
+            if tag == ns_tag.DpgDec:
                 (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, vni, tunnel_intfs, dpg_ecmp_content, static_routes) = parse_dpg(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
+            elif tag == ns_tag.CpgDec:
                 (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors) = parse_cpg(child, hostname)
-            elif child.tag == str(QName(ns, "PngDec")):
+            elif tag == ns_tag.PngDec:
                 (neighbors, devices, console_dev, console_port, mgmt_dev, mgmt_port, port_speed_png, console_ports, mux_cable_ports, png_ecmp_content) = parse_png(child, hostname, dpg_ecmp_content)
-            elif child.tag == str(QName(ns, "UngDec")):
+            elif tag == ns_tag.UngDec:
                 (u_neighbors, u_devices, _, _, _, _, _, _) = parse_png(child, hostname, None)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
+            elif tag == ns_tag.MetadataDeclaration:
                 (syslog_servers, dhcp_servers, dhcpv6_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, cloudtype, resource_type, downstream_subrole, switch_id, switch_type, max_cores, kube_data) = parse_meta(child, hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
+            elif tag == ns_tag.LinkMetadataDeclaration:
                 linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
+            elif tag == ns_tag.DeviceInfos:
                 (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
         else:
-            if child.tag == str(QName(ns, "DpgDec")):
+            if tag == ns_tag.DpgDec:
                 (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, vni, tunnel_intfs, dpg_ecmp_content, static_routes) = parse_dpg(child, asic_name)
                 host_lo_intfs = parse_host_loopback(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
+            elif tag == ns_tag.CpgDec:
                 (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors) = parse_cpg(child, asic_name, local_devices)
-            elif child.tag == str(QName(ns, "PngDec")):
+            elif tag == ns_tag.PngDec:
                 (neighbors, devices, port_speed_png) = parse_asic_png(child, asic_name, hostname)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
+            elif tag == ns_tag.MetadataDeclaration:
                 (sub_role, switch_id, switch_type, max_cores ) = parse_asic_meta(child, asic_name)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
+            elif tag == ns_tag.LinkMetadataDeclaration:
                 linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
+            elif tag == ns_tag.DeviceInfos:
                 (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
 
     # set the host device type in asic metadata also
@@ -1699,7 +1860,7 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     if current_device['type'] in dhcp_server_enabled_device_types:
         results['DEVICE_METADATA']['localhost']['dhcp_server'] = 'enabled'
 
-    return results
+    return (results, hwsku, port_config)
 
 def get_tunnel_entries(tunnel_intfs, lo_intfs, hostname):
     lo_addr = ''
@@ -1764,32 +1925,35 @@ def parse_device_desc_xml(filename):
     return results
 
 def parse_asic_sub_role(filename, asic_name):
-    if not os.path.isfile(filename):
+    asic_meta = _parse_asic_meta_cached(filename, asic_name)
+    if asic_meta is None:
         return None
-    root = ET.parse(filename).getroot()
-    for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            sub_role, _, _, _ = parse_asic_meta(child, asic_name)
-            return sub_role
+    sub_role, _, _, _ = asic_meta
+    return sub_role
 
 def parse_asic_switch_type(filename, asic_name):
-    if os.path.isfile(filename):
-        root = ET.parse(filename).getroot()
-        for child in root:
-            if child.tag == str(QName(ns, "MetadataDeclaration")):
-                _, _, switch_type, _ = parse_asic_meta(child, asic_name)
-                return switch_type
-    return None
+    asic_meta = _parse_asic_meta_cached(filename, asic_name)
+    if asic_meta is None:
+        return None
+    _, _, switch_type, _ = asic_meta
+    return switch_type
+
+def parse_meta_devices(meta):
+    local_devices = []
+
+    device_metas = meta.find(ns_tag.Devices)
+    for device in device_metas.findall(ns1_tag.DeviceMetadata):
+        name = device.find(ns1_tag.Name).text.lower()
+        local_devices.append(name)
+
+    return local_devices
 
 def parse_asic_meta_get_devices(root):
     local_devices = []
 
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            device_metas = child.find(str(QName(ns, "Devices")))
-            for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-                name = device.find(str(QName(ns1, "Name"))).text.lower()
-                local_devices.append(name)
+        if child.tag == ns_tag.MetadataDeclaration:
+            local_devices.extend(parse_meta_devices(child))
 
     return local_devices
 
@@ -1,29 +1,121 @@
 import jinja2
+import os
+import sys
 
 from base64 import b64encode, b64decode
+from collections import OrderedDict
 
 class RedisBytecodeCache(jinja2.BytecodeCache):
-    """ A bytecode cache for jinja2 template that stores bytecode in Redis """
+    """ A tiered bytecode cache for jinja2 templates.
+
+    Bytecode is looked up in an in-process LRU, then in a directory on disk,
+    then in Redis. A hit in a slower tier populates the faster ones, freshly
+    compiled bytecode is stored in all of them. The disk tier is available
+    before Redis is up, so templates rendered during early boot are compiled
+    at most once per image.
+
+    Stale entries are rejected by jinja2 itself: the bucket checksum covers
+    the template source and the bytecode header covers the jinja2 and Python
+    versions. The jinja2 version is also part of the file name, so images with
+    different jinja2 versions do not overwrite each other's files.
+    """
 
     REDIS_HASH = 'JINJA2_CACHE'
+    CACHE_DIR = '/var/cache/sonic/jinja2'
+    LRU_SIZE = 256
 
-    def __init__(self, client):
+    # In-process LRU, shared by all instances: bucket key -> bytecode
+    _lru = OrderedDict()
+
+    def __init__(self, client, directory=CACHE_DIR, lru_size=LRU_SIZE):
         self._client = client
+        self._directory = directory
+        self._lru_size = lru_size
+        self.hits = {'memory': 0, 'disk': 0, 'redis': 0}
+        self.misses = 0
         try:
             self._client.connect(self._client.LOGLEVEL_DB, retry_on=False)
         except Exception:
             self._client = None
 
-    def load_bytecode(self, bucket):
-        if self._client is None:
+    def _get_cache_file(self, bucket):
+        return os.path.join(self._directory, 'jinja2-%s-py%d.%d-%s.cache' % (
+            jinja2.__version__, sys.version_info.major, sys.version_info.minor, bucket.key))
+
+    def _load_memory(self, bucket):
+        code = self._lru.get(bucket.key)
+        if code is None:
+            return False
+        bucket.bytecode_from_string(code)
+        if bucket.code is None:
+            return False
+        self._lru.pop(bucket.key)
+        self._lru[bucket.key] = code
+        return True
+
+    def _store_memory(self, bucket, code):
+        self._lru.pop(bucket.key, None)
+        self._lru[bucket.key] = code
+        while len(self._lru) > self._lru_size:
+            self._lru.popitem(last=False)
+
+    def _load_disk(self, bucket):
+        if self._directory is None:
+            return False
+        try:
+            with open(self._get_cache_file(bucket), 'rb') as f:
+                bucket.load_bytecode(f)
+        except (IOError, OSError, EOFError, ValueError):
+            bucket.reset()
+            return False
+        return bucket.code is not None
+
+    def _store_disk(self, bucket, code):
+        """ Write atomically, the cache directory is shared by concurrent processes """
+        if self._directory is None:
             return
+        cache_file = self._get_cache_file(bucket)
+        tmp_file = '%s.%d.tmp' % (cache_file, os.getpid())
+        try:
+            if not os.path.isdir(self._directory):
+                os.makedirs(self._directory)
+            with open(tmp_file, 'wb') as f:
+                f.write(code)
+            os.rename(tmp_file, cache_file)
+        except (IOError, OSError):
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+
+    def _load_redis(self, bucket):
+        if self._client is None:
+            return False
         code = self._client.get(self._client.LOGLEVEL_DB, self.REDIS_HASH, bucket.key)
-        if code is not None:
-            bucket.bytecode_from_string(b64decode(code.encode()))
+        if code is None:
+            return False
+        bucket.bytecode_from_string(b64decode(code.encode()))
+        return bucket.code is not None
+
+    def load_bytecode(self, bucket):
+        if self._load_memory(bucket):
+            self.hits['memory'] += 1
+        elif self._load_disk(bucket):
+            self.hits['disk'] += 1
+            self._store_memory(bucket, bucket.bytecode_to_string())
+        elif self._load_redis(bucket):
+            self.hits['redis'] += 1
+            code = bucket.bytecode_to_string()
+            self._store_memory(bucket, code)
+            self._store_disk(bucket, code)
+        else:
+            self.misses += 1
 
     def dump_bytecode(self, bucket):
+        code = bucket.bytecode_to_string()
+        self._store_memory(bucket, code)
+        self._store_disk(bucket, code)
         if self._client is None:
             return
         self._client.set(self._client.LOGLEVEL_DB, self.REDIS_HASH,
-                         bucket.key, b64encode(bucket.bytecode_to_string()).decode())
-
+                         bucket.key, b64encode(code).decode())
@@ -39,7 +39,9 @@ else:
 
 # Common modules for python2 and python3
 py_modules = [
+    'cfggen_server',
     'config_samples',
+    'ip_filters',
     'minigraph',
     'openconfig_acl',
     'portconfig',
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""cfggen_merge_benchmark
+
+Measure how sonic-cfggen merges its data sources.
+
+The t0 sample minigraph is parsed once. A synthetic config DB dump with
+--keys keys, spread over tables keyed by name and by (name, prefix) tuples,
+and a JSON overlay updating every --overlay-step-th key are generated. The
+benchmark then times what sonic-cfggen -m -d -j --print-data does with them:
+deep_update the minigraph, DB and deserialized JSON data into one dict and
+serialize the result. The output is checked against the list based
+deep_update and in place FormatConverter sonic-cfggen used to have.
+
+Example:
+    python tests/cfggen_merge_benchmark.py --keys 100000 --iterations 5
+"""
+
+from __future__ import print_function
+
+import argparse
+import copy
+import json
+import os
+import sys
+import timeit
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+MODULE_DIR = os.path.join(TESTS_DIR, '..')
+sys.path.insert(0, MODULE_DIR)
+os.environ['SONIC_MINIGRAPH_CACHE'] = '0'
+
+from minigraph import minigraph_encoder, parse_xml
+from sonic_py_common.general import load_module_from_source
+
+SAMPLE_GRAPH = os.path.join(TESTS_DIR, 't0-sample-graph.xml')
+PORT_CONFIG = os.path.join(TESTS_DIR, 't0-sample-port-config.ini')
+
+
+def list_deep_update(dst, src):
+    pending_nodes = [(dst, src)]
+    while len(pending_nodes) > 0:
+        d, s = pending_nodes.pop(0)
+        for key, value in s.items():
+            if isinstance(value, dict):
+                node = d.setdefault(key, type(value)())
+                pending_nodes.append((node, value))
+            else:
+                d[key] = value
+    return dst
+
+
+def in_place_to_serialized(data, serialize_key):
+    if type(data) is dict:
+        for key in list(data.keys()):
+            new_key = serialize_key(key)
+            if new_key != key:
+                data[new_key] = data.pop(key)
+            data[new_key] = in_place_to_serialized(data[new_key], serialize_key)
+    return data
+
+
+def in_place_to_deserialized(data, deserialize_key):
+    for table in data:
+        if type(data[table]) is dict:
+            for key in list(data[table].keys()):
+                new_key = deserialize_key(key)
+                if new_key != key:
+                    data[table][new_key] = data[table].pop(key)
+    return data
+
+
+def generate_db(keys):
+    """ Config DB content as returned by ConfigDBConnector.get_config() """
+    tables = ['PORT', 'INTERFACE', 'BGP_NEIGHBOR', 'ACL_RULE', 'VLAN_MEMBER']
+    db = dict((table, {}) for table in tables)
+    for i in range(keys):
+        table = tables[i % len(tables)]
+        if table == 'PORT':
+            db[table]['Ethernet%d' % i] = {'alias': 'etp%d' % i, 'lanes': str(i), 'mtu': '9100', 'admin_status': 'up'}
+        elif table == 'INTERFACE':
+            db[table][('Ethernet%d' % i, '10.%d.%d.0/31' % (i // 65536, i // 256 % 256))] = {}
+        elif table == 'BGP_NEIGHBOR':
+            db[table]['10.%d.%d.1' % (i // 65536, i // 256 % 256)] = {'asn': str(64600 + i % 1000), 'name': 'peer%d' % i}
+        elif table == 'ACL_RULE':
+            db[table][('DATAACL', 'RULE_%d' % i)] = {'PRIORITY': str(i), 'PACKET_ACTION': 'FORWARD', 'SRC_IP': '10.0.0.%d/32' % (i % 256)}
+        else:
+            db[table][('Vlan%d' % (i % 4000 + 1), 'Ethernet%d' % i)] = {'tagging_mode': 'tagged'}
+    return db
+
+
+def generate_json(db, step, serialize_key):
+    """ JSON overlay, as loaded with -j, updating every step-th key """
+    overlay = {}
+    for table, entries in db.items():
+        for n, (key, value) in enumerate(entries.items()):
+            if n % step == 0:
+                fields = dict((field, 'json-' + field_value) for field, field_value in value.items())
+                overlay.setdefault(table, {})[serialize_key(key)] = fields
+    return json.dumps(overlay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark merging the sonic-cfggen data sources.")
+    parser.add_argument("--keys", help="number of config DB keys", type=int, default=100000)
+    parser.add_argument("--overlay-step", help="update every n-th key from JSON", type=int, default=4)
+    parser.add_argument("--iterations", help="number of timed merges", type=int, default=5)
+    args = parser.parse_args()
+
+    sonic_cfggen = load_module_from_source('sonic_cfggen', os.path.join(MODULE_DIR, 'sonic-cfggen'))
+    FormatConverter = sonic_cfggen.FormatConverter
+    serialize_key = sonic_cfggen.ConfigDBConnector.serialize_key
+    deserialize_key = sonic_cfggen.ConfigDBConnector.deserialize_key
+
+    minigraph = parse_xml(SAMPLE_GRAPH, port_config_file=PORT_CONFIG)
+    db = generate_db(args.keys)
+    json_data = generate_json(db, args.overlay_step, serialize_key)
+
+    # The sources are parsed anew by every sonic-cfggen invocation, so they
+    # are copied outside of the timed merge which is free to consume them.
+    def sources():
+        return copy.deepcopy(minigraph), copy.deepcopy(db), json.loads(json_data)
+
+    def merge(inputs):
+        graph, db_data, overlay = inputs
+        data = {}
+        sonic_cfggen.deep_update(data, graph)
+        sonic_cfggen.deep_update(data, FormatConverter.db_to_output(db_data))
+        sonic_cfggen.deep_update(data, FormatConverter.to_deserialized(overlay))
+        return FormatConverter.to_serialized(data)
+
+    def list_merge(inputs):
+        graph, db_data, overlay = inputs
+        data = {}
+        list_deep_update(data, graph)
+        list_deep_update(data, db_data)
+        list_deep_update(data, in_place_to_deserialized(overlay, deserialize_key))
+        return in_place_to_serialized(data, serialize_key)
+
+    def timed(function):
+        timings = []
+        for _ in range(args.iterations):
+            inputs = sources()
+            timings.append(timeit.timeit(lambda: function(inputs), number=1))
+        return timings
+
+    expected = json.dumps(list_merge(sources()), cls=minigraph_encoder)
+    if json.dumps(merge(sources()), cls=minigraph_encoder) != expected:
+        print("merged output differs from the list based merge output", file=sys.stderr)
+        sys.exit(1)
+
+    baseline = timed(list_merge)
+    timings = timed(merge)
+
+    print("config: {} DB keys, {} JSON keys, {} minigraph tables".format(
+        args.keys, sum(len(table) for table in json.loads(json_data).values()), len(minigraph)))
+    print("list deep_update, in place FormatConverter: best {:.3f}s, mean {:.3f}s over {} iterations".format(
+        min(baseline), sum(baseline) / len(baseline), len(baseline)))
+    print("deque deep_update, copying FormatConverter: best {:.3f}s, mean {:.3f}s over {} iterations".format(
+        min(timings), sum(timings) / len(timings), len(timings)))
+
+
+if __name__ == "__main__":
+    main()
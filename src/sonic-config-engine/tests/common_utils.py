@@ -53,7 +53,7 @@ class YangWrapper(object):
         """
         Raise exception when yang validation failed
         """
-        if PY3x and "-m" in argument:
+        if PY3x:
             import sonic_yang
             parser=argparse.ArgumentParser(description="Render configuration file from minigraph data and jinja2 template.")
             parser.add_argument("-m", "--minigraph", help="minigraph xml file", nargs='?', const='/etc/sonic/minigraph.xml')
@@ -62,6 +62,9 @@ class YangWrapper(object):
             parser.add_argument("-p", "--port-config", help="port config file, used with -m or -k", nargs='?', const=None)
             parser.add_argument("-S", "--hwsku-config", help="hwsku config file, used with -p and -m or -k", nargs='?', const=None)
             args, unknown = parser.parse_known_args(shlex.split(argument))
+            # Only the data generated from a minigraph is validated
+            if args.minigraph is None:
+                return True
 
             print('\n    Validating yang schema')
             cmd = self.script_file + ' -m ' + args.minigraph
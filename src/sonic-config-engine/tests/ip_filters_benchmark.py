@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+"""ip_filters_benchmark
+
+Measure the ip filters on the production templates.
+
+The templates are rendered against a synthetic config with --ports ports,
+each with an IPv4 and an IPv6 address, and --neighbors BGP neighbors, half of
+them IPv4 and half IPv6. The bgpd instance template is rendered once per
+neighbor, the way bgpcfgd does. Every template is rendered both with the
+netaddr based filters sonic-cfggen used to have and with ip_filters, and the
+outputs are checked to be identical.
+
+Example:
+    python tests/ip_filters_benchmark.py --ports 512 --neighbors 256 --iterations 5
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+
+from collections import OrderedDict
+from functools import partial
+
+import netaddr
+import yaml
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+MODULE_DIR = os.path.join(TESTS_DIR, '..')
+SRC_DIR = os.path.join(TESTS_DIR, '..', '..', '..')
+sys.path.insert(0, MODULE_DIR)
+
+import ip_filters
+from sonic_py_common.general import load_module_from_source
+
+FRR_DIR = os.path.join(SRC_DIR, 'dockers', 'docker-fpm-frr', 'frr')
+TEMPLATES = [
+    os.path.join(FRR_DIR, 'frr.conf.j2'),
+    os.path.join(SRC_DIR, 'dockers', 'docker-orchagent', 'ipinip.json.j2'),
+    os.path.join(SRC_DIR, 'dockers', 'docker-orchagent', 'wait_for_link.sh.j2'),
+    os.path.join(SRC_DIR, 'files', 'image_config', 'interfaces', 'interfaces.j2'),
+]
+NEIGHBOR_TEMPLATE = 'bgpd/templates/general/instance.conf.j2'
+CONSTANTS = os.path.join(SRC_DIR, 'files', 'image_config', 'constants', 'constants.yml')
+
+
+def netaddr_is_ip(version, value):
+    if not value:
+        return False
+    try:
+        return netaddr.IPNetwork(str(value)).version == version
+    except Exception:
+        return False
+
+
+def netaddr_prefix_attr(attr, value):
+    if not value:
+        return None
+    try:
+        return str(getattr(netaddr.IPNetwork(str(value)), attr))
+    except Exception:
+        return None
+
+
+def netaddr_ip_network(value):
+    try:
+        return netaddr.IPNetwork(value).network
+    except Exception:
+        return "Invalid ip address %s" % value
+
+
+def netaddr_pfx_filter(value):
+    table = OrderedDict()
+    if not value:
+        return table
+    for key, val in value.items():
+        if not isinstance(key, tuple):
+            continue
+        intf, ip_address = key
+        if '/' not in ip_address:
+            if netaddr_is_ip(4, ip_address):
+                key = (intf, "%s/32" % ip_address)
+            elif netaddr_is_ip(6, ip_address):
+                key = (intf, "%s/128" % ip_address)
+            else:
+                raise ValueError("'%s' is invalid ip address" % ip_address)
+        table[key] = val
+    return table
+
+
+def register_netaddr_filters(env):
+    env.filters['ipv4'] = partial(netaddr_is_ip, 4)
+    env.filters['ipv6'] = partial(netaddr_is_ip, 6)
+    env.filters['pfx_filter'] = netaddr_pfx_filter
+    env.filters['ip_network'] = netaddr_ip_network
+    for attr in ['ip', 'network', 'prefixlen', 'netmask', 'broadcast']:
+        env.filters[attr] = partial(netaddr_prefix_attr, attr)
+
+
+def generate_config(ports, neighbors):
+    with open(CONSTANTS) as f:
+        constants = yaml.safe_load(f)['constants']
+    data = {
+        'DEVICE_METADATA': {'localhost': {
+            'hostname': 'switch-t1', 'bgp_asn': '65100', 'type': 'LeafRouter',
+            'docker_routing_config_mode': 'unified', 'hwsku': 'Synthetic'}},
+        'LOOPBACK_INTERFACE': OrderedDict([
+            ('Loopback0', {}),
+            (('Loopback0', '10.1.0.32/32'), {}),
+            (('Loopback0', 'fc00:1::32/128'), {}),
+        ]),
+        'MGMT_INTERFACE': {('eth0', '10.250.0.10/24'): {'gwaddr': '10.250.0.1'},
+                           ('eth0', 'fc00:2::32/64'): {'gwaddr': 'fc00:2::1'}},
+        'VLAN_INTERFACE': {'Vlan1000': {}, ('Vlan1000', '192.168.0.1/21'): {},
+                           ('Vlan1000', 'fc02:1000::1/64'): {}},
+        'PORT': OrderedDict(),
+        'INTERFACE': OrderedDict(),
+        'BGP_NEIGHBOR': OrderedDict(),
+        'constants': constants,
+    }
+    for i in range(ports):
+        port = 'Ethernet%d' % (4 * i)
+        data['PORT'][port] = {'alias': 'etp%d' % i, 'lanes': str(4 * i), 'admin_status': 'up', 'mtu': '9100'}
+        data['INTERFACE'][port] = {}
+        data['INTERFACE'][(port, '10.%d.%d.%d/31' % (i // 128, (i // 2) % 64, 2 * (i % 128)))] = {}
+        data['INTERFACE'][(port, 'fc00::%x/126' % (4 * i + 1))] = {}
+    for i in range(neighbors):
+        if i % 2:
+            addr = 'fc00::%x' % (4 * i + 2)
+        else:
+            addr = '10.%d.%d.%d' % (i // 128, (i // 2) % 64, 2 * (i % 128) + 1)
+        data['BGP_NEIGHBOR'][addr] = {'asn': str(64600 + i), 'name': 'ARISTA%02dT0' % i,
+                                      'local_addr': addr, 'keepalive': '3', 'holdtime': '10'}
+    return data
+
+
+def render_all(env, data):
+    outputs = [env.get_template(os.path.basename(template)).render(data) for template in TEMPLATES]
+    neighbor_template = env.get_template(NEIGHBOR_TEMPLATE)
+    for neighbor_addr, bgp_session in data['BGP_NEIGHBOR'].items():
+        outputs.append(neighbor_template.render(
+            neighbor_addr=neighbor_addr, bgp_session=bgp_session, bgp_asn='65100',
+            CONFIG_DB__DEVICE_METADATA=data['DEVICE_METADATA'], constants=data['constants']))
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ip filters on the production templates.")
+    parser.add_argument("--ports", help="number of ports with an IPv4 and an IPv6 address", type=int, default=512)
+    parser.add_argument("--neighbors", help="number of BGP neighbors", type=int, default=256)
+    parser.add_argument("--iterations", help="number of timed renders", type=int, default=5)
+    args = parser.parse_args()
+
+    sonic_cfggen = load_module_from_source('sonic_cfggen', os.path.join(MODULE_DIR, 'sonic-cfggen'))
+    paths = [FRR_DIR] + sorted(set(os.path.dirname(template) for template in TEMPLATES))
+    data = generate_config(args.ports, args.neighbors)
+
+    baseline_env = sonic_cfggen._get_jinja2_env(paths, bytecode_cache=False)
+    register_netaddr_filters(baseline_env)
+    env = sonic_cfggen._get_jinja2_env(paths, bytecode_cache=False)
+
+    if render_all(baseline_env, data) != render_all(env, data):
+        print("ip_filters output differs from the netaddr filters output", file=sys.stderr)
+        sys.exit(1)
+
+    baseline = timeit.repeat(lambda: render_all(baseline_env, data), number=1, repeat=args.iterations)
+    ip_filters.clear_cache()
+    timings = timeit.repeat(lambda: render_all(env, data), number=1, repeat=args.iterations)
+
+    print("config: {} ports, {} BGP neighbors, {} templates, {} neighbor renders".format(
+        args.ports, args.neighbors, len(TEMPLATES), len(data['BGP_NEIGHBOR'])))
+    print("netaddr filters: best {:.3f}s, mean {:.3f}s over {} iterations".format(
+        min(baseline), sum(baseline) / len(baseline), len(baseline)))
+    print("ip_filters: best {:.3f}s, mean {:.3f}s over {} iterations, prefix cache {} hits, {} misses".format(
+        min(timings), sum(timings) / len(timings), len(timings),
+        ip_filters.cache_stats['hits'], ip_filters.cache_stats['misses']))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""minigraph_benchmark
+
+Measure minigraph.parse_xml on large synthetic minigraphs.
+
+The synthetic minigraph is built from t0-sample-graph.xml by adding
+--links DeviceLinkBase entries (with a Device for every neighbor) and
+--sessions BGPSession entries (with a BGPRouterDeclaration for every peer).
+The minigraph snapshot cache is disabled, so every iteration is a full parse.
+
+Example:
+    python tests/minigraph_benchmark.py --links 4000 --sessions 4000 --iterations 5
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+from lxml import etree as ET
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+os.environ['SONIC_MINIGRAPH_CACHE'] = '0'
+
+import minigraph
+from minigraph import ns, ns1, ns3
+
+SAMPLE_GRAPH = os.path.join(TESTS_DIR, 't0-sample-graph.xml')
+PORT_CONFIG = os.path.join(TESTS_DIR, 't0-sample-port-config.ini')
+
+
+def _sub(parent, namespace, tag, text=None):
+    element = ET.SubElement(parent, '{%s}%s' % (namespace, tag))
+    if text is not None:
+        element.text = text
+    return element
+
+
+def generate_minigraph(filename, links, sessions):
+    root = ET.parse(SAMPLE_GRAPH).getroot()
+    hostname = root.find('{%s}Hostname' % ns).text
+    png = root.find('{%s}PngDec' % ns)
+    cpg = root.find('{%s}CpgDec' % ns)
+    link_list = png.find('{%s}DeviceInterfaceLinks' % ns)
+    devices = png.find('{%s}Devices' % ns)
+    peering_sessions = cpg.find('{%s}PeeringSessions' % ns)
+    routers = cpg.find('{%s}Routers' % ns)
+
+    for i in range(links):
+        neighbor = 'SYNTH%05dT0' % i
+        link = _sub(link_list, ns, 'DeviceLinkBase')
+        _sub(link, ns, 'ElementType', 'DeviceInterfaceLink')
+        _sub(link, ns, 'Bandwidth', '40000')
+        _sub(link, ns, 'EndDevice', neighbor)
+        _sub(link, ns, 'EndPort', 'Ethernet1')
+        _sub(link, ns, 'StartDevice', hostname)
+        _sub(link, ns, 'StartPort', 'fortyGigE0/%d' % (4 * (i % 32)))
+        device = _sub(devices, ns, 'Device')
+        device.set('{%s}type' % ns3, 'ServerTor')
+        _sub(device, ns, 'Hostname', neighbor)
+        _sub(device, ns, 'HwSku', 'Synthetic')
+
+    for i in range(sessions):
+        peer = 'SYNTH%05dT2' % i
+        session = _sub(peering_sessions, ns, 'BGPSession')
+        _sub(session, ns, 'StartRouter', hostname)
+        _sub(session, ns, 'StartPeer', '10.%d.%d.0' % (128 + i // 256, i % 256))
+        _sub(session, ns, 'EndRouter', peer)
+        _sub(session, ns, 'EndPeer', '10.%d.%d.1' % (128 + i // 256, i % 256))
+        _sub(session, ns, 'HoldTime', '180')
+        _sub(session, ns, 'KeepAliveTime', '60')
+        router = _sub(routers, ns1, 'BGPRouterDeclaration')
+        _sub(router, ns1, 'ASN', str(64700 + i % 100))
+        _sub(router, ns1, 'Hostname', peer)
+
+    ET.ElementTree(root).write(filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark minigraph.parse_xml on a synthetic minigraph.")
+    parser.add_argument("--links", help="number of DeviceLinkBase entries to add", type=int, default=2000)
+    parser.add_argument("--sessions", help="number of BGPSession entries to add", type=int, default=2000)
+    parser.add_argument("--iterations", help="number of timed parses", type=int, default=5)
+    args = parser.parse_args()
+
+    fd, filename = tempfile.mkstemp(suffix='.xml')
+    os.close(fd)
+    try:
+        generate_minigraph(filename, args.links, args.sessions)
+        size = os.path.getsize(filename)
+        results = minigraph.parse_xml(filename, port_config_file=PORT_CONFIG)
+        timings = timeit.repeat(lambda: minigraph.parse_xml(filename, port_config_file=PORT_CONFIG),
+                                number=1, repeat=args.iterations)
+    finally:
+        os.remove(filename)
+
+    print("minigraph: {} bytes, {} links, {} sessions, {} BGP neighbors parsed".format(
+        size, args.links, args.sessions, len(results.get('BGP_NEIGHBOR', {}))))
+    print("parse_xml: best {:.3f}s, mean {:.3f}s over {} iterations".format(
+        min(timings), sum(timings) / len(timings), len(timings)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 import json
 import subprocess
 import os
+import shutil
+import tempfile
 
 import tests.common_utils as utils
 
-from unittest import TestCase
+from sonic_py_common.general import load_module_from_source
+from unittest import TestCase, mock
 
 TOR_ROUTER = 'ToRRouter'
 BACKEND_TOR_ROUTER = 'BackEndToRRouter'
@@ -195,6 +198,131 @@ class TestCfgGen(TestCase):
         with open(self.output2_file) as tf:
             self.assertEqual(tf.read().strip(), 'value')
 
+    def test_template_manifest(self):
+        manifest_file = os.path.join(self.test_dir, 'manifest.json')
+        manifest = {
+            'yaml': [os.path.join(self.test_dir, 'test.yml')],
+            'additional_data': '{"key1":"value"}',
+            'jobs': 2,
+            'templates': [
+                {'template': os.path.join(self.test_dir, 'test.j2'), 'destination': self.output_file},
+                {'template': os.path.join(self.test_dir, 'test2.j2'), 'destination': self.output2_file},
+                {'template': os.path.join(self.test_dir, 'test2.j2')}
+            ]
+        }
+        with open(manifest_file, 'w') as mf:
+            json.dump(manifest, mf)
+        try:
+            output = self.run_script('--manifest ' + manifest_file)
+        finally:
+            os.remove(manifest_file)
+        self.assertEqual(output.strip(), 'value')
+        with open(self.output_file) as tf:
+            self.assertEqual(tf.read().strip(), 'value1\nvalue2')
+        with open(self.output2_file) as tf:
+            self.assertEqual(tf.read().strip(), 'value')
+
+    def test_template_manifest_config_db_order(self):
+        manifest_file = os.path.join(self.test_dir, 'manifest.json')
+        update_template = os.path.join(self.test_dir, 'update_key1.j2')
+        manifest = {
+            'additional_data': '{"key1":"value"}',
+            'jobs': 2,
+            'templates': [
+                {'template': os.path.join(self.test_dir, 'test2.j2'), 'destination': self.output_file},
+                {'template': update_template, 'destination': 'config-db'},
+                {'template': os.path.join(self.test_dir, 'test2.j2'), 'destination': self.output2_file},
+                {'template': os.path.join(self.test_dir, 'test2.j2')}
+            ]
+        }
+        with open(manifest_file, 'w') as mf:
+            json.dump(manifest, mf)
+        with open(update_template, 'w') as tf:
+            tf.write('{"key1": "updated"}')
+        try:
+            output = self.run_script('--manifest ' + manifest_file)
+        finally:
+            os.remove(manifest_file)
+            os.remove(update_template)
+        # A template sees only the updates of the "config-db" templates listed before it
+        self.assertEqual(output.strip(), 'updated')
+        with open(self.output_file) as tf:
+            self.assertEqual(tf.read().strip(), 'value')
+        with open(self.output2_file) as tf:
+            self.assertEqual(tf.read().strip(), 'updated')
+
+    def test_template_tables(self):
+        cfggen = load_module_from_source('sonic_cfggen', os.path.join(self.test_dir, '..', 'sonic-cfggen'))
+        template_file = os.path.join(self.test_dir, 'ntp.conf.j2')
+        tables = cfggen._get_template_tables(['/', self.test_dir], [template_file], ["DEVICE_METADATA['localhost']"])
+        self.assertEqual(tables, ['DEVICE_METADATA', 'INTERFACE', 'LOOPBACK_INTERFACE', 'MGMT_INTERFACE', 'NTP',
+                                  'NTP_SERVER', 'PORTCHANNEL_INTERFACE', 'VLAN_INTERFACE'])
+
+    def test_config_tables(self):
+        cfggen = load_module_from_source('sonic_cfggen', os.path.join(self.test_dir, '..', 'sonic-cfggen'))
+        db = {
+            'PORT': {'Ethernet0': {'speed': '100000'}},
+            'VLAN_MEMBER': {('Vlan1000', 'Ethernet0'): {'tagging_mode': 'untagged'}},
+            'NTP': {'global': {'src_intf': 'eth0'}},
+        }
+        # Only the methods of the connector used on the device are available
+        configdb = mock.create_autospec(cfggen.ConfigDBPipeConnector, instance=True)
+        configdb.get_table.side_effect = lambda table: db.get(table, {})
+        configdb.get_config.return_value = db
+
+        data = cfggen._get_config_tables(configdb, ['PORT', 'VLAN_MEMBER', 'SYSLOG_SERVER'])
+        self.assertEqual(data, {
+            'PORT': {'Ethernet0': {'speed': '100000'}},
+            'VLAN_MEMBER': {('Vlan1000', 'Ethernet0'): {'tagging_mode': 'untagged'}},
+        })
+        configdb.get_config.assert_not_called()
+
+        # The whole config DB is read if a table can't be read
+        configdb.get_table.side_effect = RuntimeError('connection lost')
+        self.assertEqual(cfggen._get_config_tables(configdb, ['PORT']), db)
+
+    def test_config_delta(self):
+        cfggen = load_module_from_source('sonic_cfggen', os.path.join(self.test_dir, '..', 'sonic-cfggen'))
+        current = {
+            'PORT': {'Ethernet0': {'speed': '100000', 'lanes': '1,2'}, 'Ethernet4': {'speed': '40000'}},
+            'VLAN_MEMBER': {('Vlan1000', 'Ethernet0'): {'tagging_mode': 'untagged'}},
+            'SYSLOG_SERVER': {'10.0.0.1': {}}
+        }
+        new = {
+            'PORT': {'Ethernet0': {'speed': 100000, 'lanes': '1,2'}, 'Ethernet4': {'speed': '100000'}, 'Ethernet8': {}},
+            'VLAN_MEMBER': {'Vlan1000|Ethernet0': {'tagging_mode': 'untagged'}},
+            'SYSLOG_SERVER': None,
+            'PORTCHANNEL': {'PortChannel01': {'members': ['Ethernet0', 'Ethernet4']}}
+        }
+        delta, counts = cfggen.get_config_delta(current, new)
+        self.assertEqual(delta, {
+            'PORT': {'Ethernet4': {'speed': '100000'}, 'Ethernet8': {}},
+            'SYSLOG_SERVER': None,
+            'PORTCHANNEL': {'PortChannel01': {'members': ['Ethernet0', 'Ethernet4']}}
+        })
+        self.assertEqual(counts, {'keys': 3, 'fields': 2, 'deleted': 1, 'unchanged': 2})
+
+    def test_format_converter(self):
+        cfggen = load_module_from_source('sonic_cfggen', os.path.join(self.test_dir, '..', 'sonic-cfggen'))
+        serialized = {
+            'INTERFACE': {'Ethernet0|10.0.0.0/31': {}, 'Ethernet0': {'vrf_name': 'Vrf1'}, 'Ethernet4|fc00::/126': {}},
+            'VERSIONS': 'unchanged'
+        }
+        deserialized = cfggen.FormatConverter.to_deserialized(serialized)
+        self.assertEqual(list(deserialized['INTERFACE'].keys()),
+                         ['Ethernet0', ('Ethernet0', '10.0.0.0/31'), ('Ethernet4', 'fc00::/126')])
+        self.assertEqual(deserialized['VERSIONS'], 'unchanged')
+        self.assertIn('Ethernet0|10.0.0.0/31', serialized['INTERFACE'])
+
+        data = cfggen.deep_update({'INTERFACE': {'Ethernet8': {}}}, deserialized)
+        self.assertEqual(list(data['INTERFACE'].keys()),
+                         ['Ethernet8', 'Ethernet0', ('Ethernet0', '10.0.0.0/31'), ('Ethernet4', 'fc00::/126')])
+        self.assertEqual(list(cfggen.FormatConverter.to_serialized(data)['INTERFACE'].keys()),
+                         ['Ethernet8', 'Ethernet0', 'Ethernet0|10.0.0.0/31', 'Ethernet4|fc00::/126'])
+        self.assertIn(('Ethernet0', '10.0.0.0/31'), data['INTERFACE'])
+        self.assertEqual(cfggen.FormatConverter.to_serialized(data['INTERFACE'], 'Ethernet4'),
+                         {'Ethernet4|fc00::/126': {}})
+
     def test_template_json_batch_mode(self):
         data = {"key1_1":"value1_1", "key1_2":"value1_2", "key2_1":"value2_1", "key2_2":"value2_2"}
         argument = " -a '{0}'".format(repr(data).replace('\'', '"'))
@@ -206,6 +334,20 @@ class TestCfgGen(TestCase):
         for key, value in data.items():
             self.assertEqual(output_data[key.replace("key", "jk")], value)
 
+    def test_minigraph_cache(self):
+        argument = '-m "' + self.sample_graph_t0 + '" -p "' + self.port_config + '" --print-data'
+        uncached_output = subprocess.check_output('SONIC_MINIGRAPH_CACHE=0 ' + self.script_file + ' ' + argument, shell=True)
+        cache_dir = tempfile.mkdtemp()
+        try:
+            with mock.patch.dict(os.environ, {'SONIC_MINIGRAPH_CACHE_DIR': cache_dir}):
+                first_output = self.run_script(argument)
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                second_output = self.run_script(argument)
+        finally:
+            shutil.rmtree(cache_dir)
+        self.assertEqual(json.loads(first_output), json.loads(uncached_output))
+        self.assertEqual(json.loads(second_output), json.loads(uncached_output))
+
     # FIXME: This test depends heavily on the ordering of the interfaces and
     # it is not at all intuitive what that ordering should be. Could make it
     # more robust by adding better parsing logic.
@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import tests.common_utils as utils
+
+from unittest import TestCase
+
+import cfggen_server
+
+
+def fake_main(argv):
+    if argv and argv[0] == 'fail':
+        print('failed in ' + os.getcwd(), file=sys.stderr)
+        sys.exit(3)
+    if argv and argv[0] == 'in-request':
+        print(cfggen_server.in_request())
+        return
+    print(' '.join(argv) + ' ' + os.environ.get('CFGGEN_SERVER_TEST', ''))
+
+
+class TestCfgGenServer(TestCase):
+
+    def setUp(self):
+        self.module_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmp_dir, 'cfggen.sock')
+        self.server = None
+
+    def tearDown(self):
+        if self.server is not None:
+            self.server.terminate()
+            self.server.join()
+        shutil.rmtree(self.tmp_dir)
+
+    def start_server(self):
+        self.server = multiprocessing.Process(target=cfggen_server.serve, args=(fake_main, self.socket_path))
+        self.server.start()
+        for _ in range(100):
+            if os.path.exists(self.socket_path):
+                return
+            time.sleep(0.05)
+        self.fail('server socket was not created')
+
+    def run_client(self, *argv):
+        script = 'import sys, cfggen_server; ' \
+                 'status = cfggen_server.run_remote(sys.argv[1:], %r); ' \
+                 'sys.exit(100 if status is None else status)' % self.socket_path
+        env = dict(os.environ, CFGGEN_SERVER_TEST='remote')
+        return subprocess.run([utils.PYTHON_INTERPRETTER, '-c', script] + list(argv), cwd=self.module_dir,
+                              env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+    def test_no_server_falls_back(self):
+        result = self.run_client('-d')
+        self.assertEqual(result.returncode, 100)
+        self.assertEqual(result.stdout, '')
+
+    def test_output_and_environment(self):
+        self.start_server()
+        result = self.run_client('-d', '-v', 'DEVICE_METADATA')
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, '-d -v DEVICE_METADATA remote\n')
+
+    def test_exit_code_and_cwd(self):
+        self.start_server()
+        result = self.run_client('fail')
+        self.assertEqual(result.returncode, 3)
+        self.assertEqual(result.stderr.strip(), 'failed in ' + os.path.realpath(self.module_dir))
+
+    def test_server_argv_is_not_forwarded(self):
+        self.start_server()
+        for argv in (['--server'], ['--server', self.socket_path], ['--serv=' + self.socket_path], ['-d', '--se']):
+            result = self.run_client(*argv)
+            self.assertEqual(result.returncode, 100, argv)
+            self.assertEqual(result.stdout, '')
+
+    def test_in_request(self):
+        self.assertFalse(cfggen_server.in_request())
+        self.start_server()
+        result = self.run_client('in-request')
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, 'True\n')
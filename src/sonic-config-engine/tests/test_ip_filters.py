@@ -0,0 +1,54 @@
+from collections import OrderedDict
+from unittest import TestCase
+
+import netaddr
+
+import ip_filters
+
+
+class TestIpFilters(TestCase):
+
+    def setUp(self):
+        ip_filters.clear_cache()
+
+    def test_prefix_attr_matches_netaddr(self):
+        values = ['10.0.0.5/24', '10.0.0.1/32', '10.0.0.0/31', '10.0.0.1/255.255.255.0', '10.0.0.1',
+                  'fc00::1/64', 'FC00::1/127', 'fc00::1', '::ffff:1.2.3.4/96', '::6d24:1/117']
+        for value in values:
+            prefix = netaddr.IPNetwork(value)
+            for attr in ['ip', 'network', 'prefixlen', 'netmask', 'broadcast']:
+                self.assertEqual(ip_filters.prefix_attr(attr, value), str(getattr(prefix, attr)), (value, attr))
+
+    def test_invalid(self):
+        for value in ['', None, 'abc', '10.0.0.1/33', '10.0.0.01/24', ' 10.0.0.1/24', 'fe80::1%eth0']:
+            self.assertFalse(ip_filters.is_ipv4(value))
+            self.assertFalse(ip_filters.is_ipv6(value))
+            self.assertIsNone(ip_filters.prefix_attr('ip', value))
+        self.assertEqual(ip_filters.ip_network('abc'), 'Invalid ip address abc')
+
+    def test_version(self):
+        self.assertTrue(ip_filters.is_ipv4('10.0.0.1'))
+        self.assertTrue(ip_filters.is_ipv4(netaddr.IPNetwork('10.0.0.0/8')))
+        self.assertFalse(ip_filters.is_ipv6('10.0.0.1/8'))
+        self.assertTrue(ip_filters.is_ipv6('fc00::/7'))
+        self.assertEqual(ip_filters.ip_network('fc00::1/64'), 'fc00::')
+
+    def test_pfx_filter(self):
+        table = ip_filters.pfx_filter({'Vlan1000': {}, ('Vlan1000', '192.168.0.1'): {'a': 1},
+                                       ('Vlan1000', 'fc02::1'): {}, ('Vlan1000', '192.168.0.1/21'): {}})
+        self.assertEqual(table, OrderedDict([(('Vlan1000', '192.168.0.1/32'), {'a': 1}),
+                                             (('Vlan1000', 'fc02::1/128'), {}),
+                                             (('Vlan1000', '192.168.0.1/21'), {})]))
+        with self.assertRaises(ValueError):
+            ip_filters.pfx_filter({('Vlan1000', 'abc'): {}})
+
+    def test_cache(self):
+        ip_filters.prefix_attr('ip', '10.0.0.1/24')
+        ip_filters.prefix_attr('network', '10.0.0.1/24')
+        ip_filters.is_ipv4('abc')
+        ip_filters.is_ipv6('abc')
+        self.assertEqual(ip_filters.cache_stats, {'hits': 2, 'misses': 2})
+
+        for i in range(ip_filters.PREFIX_CACHE_SIZE + 10):
+            ip_filters.parse_prefix('10.%d.%d.0/24' % (i // 256, i % 256))
+        self.assertEqual(len(ip_filters._prefix_cache), ip_filters.PREFIX_CACHE_SIZE)
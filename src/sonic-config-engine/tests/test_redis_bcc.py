@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+
+import jinja2
+
+from unittest import TestCase
+
+from redis_bcc import RedisBytecodeCache
+
+
+class FakeClient(object):
+    LOGLEVEL_DB = 'LOGLEVEL_DB'
+
+    def __init__(self, available=True):
+        self.available = available
+        self.data = {}
+
+    def connect(self, db, retry_on=False):
+        if not self.available:
+            raise Exception('redis is not available')
+
+    def get(self, db, hash_name, key):
+        return self.data.get((hash_name, key))
+
+    def set(self, db, hash_name, key, value):
+        self.data[(hash_name, key)] = value
+
+
+class TestRedisBytecodeCache(TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.dirname(os.path.realpath(__file__))
+        self.cache_dir = tempfile.mkdtemp()
+        RedisBytecodeCache._lru.clear()
+
+    def tearDown(self):
+        RedisBytecodeCache._lru.clear()
+        shutil.rmtree(self.cache_dir)
+
+    def render(self, bcc):
+        env = jinja2.Environment(loader=jinja2.FileSystemLoader(self.test_dir), bytecode_cache=bcc)
+        return env.get_template('test2.j2').render({'key1': 'value'})
+
+    def test_tiers(self):
+        client = FakeClient()
+        bcc = RedisBytecodeCache(client, directory=self.cache_dir)
+        self.assertEqual(self.render(bcc), 'value')
+        self.assertEqual(bcc.misses, 1)
+        self.assertEqual(len(client.data), 1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        # Same process: served from memory
+        bcc = RedisBytecodeCache(client, directory=self.cache_dir)
+        self.assertEqual(self.render(bcc), 'value')
+        self.assertEqual(bcc.hits, {'memory': 1, 'disk': 0, 'redis': 0})
+
+        # New process: served from disk
+        RedisBytecodeCache._lru.clear()
+        bcc = RedisBytecodeCache(client, directory=self.cache_dir)
+        self.assertEqual(self.render(bcc), 'value')
+        self.assertEqual(bcc.hits, {'memory': 0, 'disk': 1, 'redis': 0})
+
+        # Empty disk cache: served from redis and written back to disk
+        RedisBytecodeCache._lru.clear()
+        shutil.rmtree(self.cache_dir)
+        bcc = RedisBytecodeCache(client, directory=self.cache_dir)
+        self.assertEqual(self.render(bcc), 'value')
+        self.assertEqual(bcc.hits, {'memory': 0, 'disk': 0, 'redis': 1})
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_without_redis(self):
+        bcc = RedisBytecodeCache(FakeClient(available=False), directory=self.cache_dir)
+        self.assertEqual(self.render(bcc), 'value')
+        self.assertEqual(bcc.misses, 1)
+
+        RedisBytecodeCache._lru.clear()
+        bcc = RedisBytecodeCache(FakeClient(available=False), directory=self.cache_dir)
+        self.assertEqual(self.render(bcc), 'value')
+        self.assertEqual(bcc.hits['disk'], 1)
@@ -0,0 +1,62 @@
+import os
+import sys
+import swsscommon
+
+from sonic_py_common.general import load_module_from_source
+from unittest import TestCase, mock
+from pyfakefs.fake_filesystem_unittest import patchfs
+
+from tests.common.mock_configdb import MockConfigDb
+
+DBCONFIG_PATH = '/var/run/redis/sonic-db/database_config.json'
+
+class TestCaclmgrdAclTableIndex(TestCase):
+    """
+        Test caclmgrd ACL table index
+    """
+    def setUp(self):
+        swsscommon.swsscommon.ConfigDBConnector = MockConfigDb
+        test_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        modules_path = os.path.dirname(test_path)
+        scripts_path = os.path.join(modules_path, "scripts")
+        sys.path.insert(0, modules_path)
+        caclmgrd_path = os.path.join(scripts_path, 'caclmgrd')
+        self.caclmgrd = load_module_from_source('caclmgrd', caclmgrd_path)
+
+    @patchfs
+    def test_caclmgrd_acl_table_index(self, fs):
+        if not os.path.exists(DBCONFIG_PATH):
+            fs.create_file(DBCONFIG_PATH) # fake database_config.json
+
+        MockConfigDb.set_config_db({
+            "DEVICE_METADATA": {
+                "localhost": {
+                    "type": "ToRRouter",
+                }
+            },
+            "ACL_TABLE": {
+                "SSH_ONLY": {"type": "CTRLPLANE", "services": ["SSH"]},
+                "DATAACL": {"type": "L3", "ports": ["Ethernet0"]},
+            },
+        })
+
+        with mock.patch("caclmgrd.subprocess") as mocked_subprocess:
+            popen_mock = mock.Mock()
+            popen_mock.configure_mock(**{'communicate.return_value': ('', ''), 'returncode': 0})
+            mocked_subprocess.Popen.return_value = popen_mock
+
+            caclmgrd_daemon = self.caclmgrd.ControlPlaneAclManager("caclmgrd")
+            caclmgrd_daemon.load_acl_table_index('')
+
+        with mock.patch.object(MockConfigDb, "get_table") as mocked_get_table:
+            self.assertTrue(caclmgrd_daemon.is_ctrl_plane_acl_table('', "SSH_ONLY"))
+            self.assertFalse(caclmgrd_daemon.is_ctrl_plane_acl_table('', "DATAACL"))
+            self.assertFalse(caclmgrd_daemon.is_ctrl_plane_acl_table('', "UNKNOWN"))
+
+            caclmgrd_daemon.update_acl_table_index('', "SNMP_ACL", "SET", [("type", "CTRLPLANE"), ("services@", "SNMP")])
+            caclmgrd_daemon.update_acl_table_index('', "SSH_ONLY", "DEL", [])
+            caclmgrd_daemon.update_acl_table_index('', "DATAACL", "SET", [("type", "CTRLPLANE")])
+            self.assertTrue(caclmgrd_daemon.is_ctrl_plane_acl_table('', "SNMP_ACL"))
+            self.assertFalse(caclmgrd_daemon.is_ctrl_plane_acl_table('', "SSH_ONLY"))
+            self.assertTrue(caclmgrd_daemon.is_ctrl_plane_acl_table('', "DATAACL"))
+            mocked_get_table.assert_not_called()
@@ -0,0 +1,136 @@
+import os
+import sys
+import swsscommon
+
+from parameterized import parameterized
+from sonic_py_common.general import load_module_from_source
+from unittest import TestCase, mock
+from pyfakefs.fake_filesystem_unittest import patchfs
+
+from .test_iptables_restore_vectors import CACLMGRD_IPTABLES_RESTORE_TEST_VECTOR
+from tests.common.mock_configdb import MockConfigDb
+
+DBCONFIG_PATH = '/var/run/redis/sonic-db/database_config.json'
+
+class TestCaclmgrdIptablesRestore(TestCase):
+    """
+        Test caclmgrd iptables-restore backend
+    """
+    def setUp(self):
+        swsscommon.swsscommon.ConfigDBConnector = MockConfigDb
+        test_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        modules_path = os.path.dirname(test_path)
+        scripts_path = os.path.join(modules_path, "scripts")
+        sys.path.insert(0, modules_path)
+        caclmgrd_path = os.path.join(scripts_path, 'caclmgrd')
+        self.caclmgrd = load_module_from_source('caclmgrd', caclmgrd_path)
+
+    @parameterized.expand(CACLMGRD_IPTABLES_RESTORE_TEST_VECTOR)
+    @patchfs
+    def test_caclmgrd_iptables_restore(self, test_name, test_data, fs):
+        if not os.path.exists(DBCONFIG_PATH):
+            fs.create_file(DBCONFIG_PATH) # fake database_config.json
+
+        MockConfigDb.set_config_db(test_data["config_db"])
+
+        with mock.patch("caclmgrd.subprocess") as mocked_subprocess:
+            popen_mock = mock.Mock()
+            popen_mock.configure_mock(**{'communicate.return_value': ('', ''), 'returncode': 0})
+            # iptables-save lists the rules installed in the kernel
+            save_mock = mock.Mock()
+            save_mock.configure_mock(**{'communicate.return_value': (
+                "# Generated by iptables-save\n*filter\n:INPUT DROP [10:600]\n-A INPUT -j DROP\nCOMMIT\n", ''), 'returncode': 0})
+            mocked_subprocess.Popen.side_effect = lambda cmd, **kwargs: save_mock if isinstance(cmd, list) and "-t" in cmd else popen_mock
+            mocked_subprocess.PIPE = -1
+
+            caclmgrd_daemon = self.caclmgrd.ControlPlaneAclManager("caclmgrd")
+            caclmgrd_daemon.update_control_plane_acls('')
+
+            restore_calls = [c for c in mocked_subprocess.Popen.call_args_list if c[0][0][-1] == "--noflush"]
+            self.assertEqual([c[0][0][0] for c in restore_calls], ["iptables-restore", "ip6tables-restore"])
+            restore_inputs = [args[0] for args, _ in popen_mock.communicate.call_args_list if args]
+            for rules, restore_input in zip(["expected_iptables_rules", "expected_ip6tables_rules"], restore_inputs):
+                lines = restore_input.splitlines()
+                self.assertEqual(lines[0], "*filter")
+                self.assertEqual(lines[-1], "COMMIT")
+                # the expected rules must be present in the same order
+                indexes = [lines.index(line) for line in test_data[rules]]
+                self.assertEqual(indexes, sorted(indexes))
+
+            # The same rules are not applied again, the counters don't matter
+            mocked_subprocess.Popen.reset_mock()
+            save_mock.communicate.return_value = (
+                "# Generated by iptables-save\n*filter\n:INPUT DROP [20:1200]\n-A INPUT -j DROP\nCOMMIT\n", '')
+            caclmgrd_daemon.update_control_plane_acls('')
+            restore_calls = [c for c in mocked_subprocess.Popen.call_args_list if c[0][0][-1] == "--noflush"]
+            self.assertEqual(restore_calls, [])
+
+            # The rules are applied again if they were changed in the kernel
+            save_mock.communicate.return_value = ("*filter\n:INPUT ACCEPT [0:0]\nCOMMIT\n", '')
+            caclmgrd_daemon.update_control_plane_acls('')
+            restore_calls = [c for c in mocked_subprocess.Popen.call_args_list if c[0][0][-1] == "--noflush"]
+            self.assertEqual([c[0][0][0] for c in restore_calls], ["iptables-restore", "ip6tables-restore"])
+
+            # or if the installed rules can't be read
+            mocked_subprocess.Popen.reset_mock()
+            save_mock.returncode = 1
+            caclmgrd_daemon.update_control_plane_acls('')
+            restore_calls = [c for c in mocked_subprocess.Popen.call_args_list if c[0][0][-1] == "--noflush"]
+            self.assertEqual(len(restore_calls), 2)
+            self.assertEqual(caclmgrd_daemon.installed_ruleset_hash, {})
+            save_mock.returncode = 0
+
+            # The commands are run one by one if iptables-restore fails
+            caclmgrd_daemon.installed_ruleset_hash.clear()
+            popen_mock.returncode = 1
+            caclmgrd_daemon.update_control_plane_acls('')
+            self.assertIn(mock.call("iptables -A INPUT -j DROP", shell=True, universal_newlines=True, stdout=-1),
+                          mocked_subprocess.Popen.call_args_list)
+            self.assertEqual(caclmgrd_daemon.installed_ruleset_hash, {})
+
+    @patchfs
+    def test_caclmgrd_namespaces(self, fs):
+        if not os.path.exists(DBCONFIG_PATH):
+            fs.create_file(DBCONFIG_PATH) # fake database_config.json
+
+        MockConfigDb.set_config_db(CACLMGRD_IPTABLES_RESTORE_TEST_VECTOR[0][1]["config_db"])
+        ip_addr_outputs = {
+            "ip -o addr show docker0":
+                "4: docker0    inet 240.127.1.1/24 brd 240.127.1.255 scope global docker0\\       valid_lft forever preferred_lft forever\n"
+                "4: docker0    inet6 fe80::1/64 scope link \\       valid_lft forever preferred_lft forever\n"
+                "4: docker0    inet6 fd00::1/80 scope global \\       valid_lft forever preferred_lft forever",
+            "ip netns exec asic0 ip -o addr show eth0":
+                "2: eth0    inet 240.127.1.2/24 brd 240.127.1.255 scope global eth0\\       valid_lft forever preferred_lft forever\n"
+                "2: eth0    inet6 fd00::2/80 scope global \\       valid_lft forever preferred_lft forever",
+            "ip netns exec asic1 ip -o addr show eth0":
+                "2: eth0    inet 240.127.1.3/24 brd 240.127.1.255 scope global eth0\\       valid_lft forever preferred_lft forever",
+        }
+
+        def popen(cmd, **kwargs):
+            popen_mock = mock.Mock()
+            output = ip_addr_outputs.get(cmd, "") if isinstance(cmd, str) else ""
+            popen_mock.configure_mock(**{'communicate.return_value': (output, ''), 'returncode': 0})
+            return popen_mock
+
+        namespaces = {'front_ns': ['asic0'], 'back_ns': ['asic1'], 'fabric_ns': []}
+        with mock.patch("caclmgrd.subprocess") as mocked_subprocess, \
+             mock.patch("caclmgrd.multi_asic.get_all_namespaces", return_value=namespaces):
+            mocked_subprocess.Popen.side_effect = popen
+            mocked_subprocess.PIPE = -1
+
+            caclmgrd_daemon = self.caclmgrd.ControlPlaneAclManager("caclmgrd")
+            self.assertEqual(caclmgrd_daemon.namespace_mgmt_ip, "240.127.1.1")
+            self.assertEqual(caclmgrd_daemon.namespace_mgmt_ipv6, "fd00::1")
+            self.assertEqual(caclmgrd_daemon.namespace_docker_mgmt_ip, {"asic0": "240.127.1.2", "asic1": "240.127.1.3"})
+            self.assertEqual(caclmgrd_daemon.namespace_docker_mgmt_ipv6, {"asic0": "fd00::2", "asic1": ""})
+
+            # The ACLs are applied to the host and the front asic namespaces
+            mocked_subprocess.Popen.reset_mock()
+            caclmgrd_daemon.run_per_namespace(caclmgrd_daemon.update_control_plane_acls, list(caclmgrd_daemon.config_db_map.keys()))
+            restore_calls = sorted(" ".join(c[0][0]) for c in mocked_subprocess.Popen.call_args_list if c[0][0][-1] == "--noflush")
+            self.assertEqual(restore_calls, [
+                "ip netns exec asic0 ip6tables-restore --noflush",
+                "ip netns exec asic0 iptables-restore --noflush",
+                "ip6tables-restore --noflush",
+                "iptables-restore --noflush",
+            ])
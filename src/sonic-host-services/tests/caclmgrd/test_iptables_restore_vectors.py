@@ -0,0 +1,55 @@
+"""
+    caclmgrd iptables-restore test vector
+"""
+CACLMGRD_IPTABLES_RESTORE_TEST_VECTOR = [
+    [
+        "SSH_ACL_TEST",
+        {
+            "config_db": {
+                "DEVICE_METADATA": {
+                    "localhost": {
+                        "type": "ToRRouter",
+                    }
+                },
+                "ACL_TABLE": {
+                    "SSH_ONLY": {
+                        "type": "CTRLPLANE",
+                        "services": ["SSH"],
+                    },
+                },
+                "ACL_RULE": {
+                    ("SSH_ONLY", "RULE_1"): {
+                        "PRIORITY": "9999",
+                        "PACKET_ACTION": "ACCEPT",
+                        "SRC_IP": "10.0.0.0/8",
+                    },
+                },
+                "LOOPBACK_INTERFACE": {
+                    ("Loopback0", "10.1.0.32/32"): {},
+                },
+                "MGMT_INTERFACE": {},
+                "VLAN_INTERFACE": {},
+                "PORTCHANNEL_INTERFACE": {},
+                "INTERFACE": {
+                    ("Ethernet0", "fc00::1/126"): {},
+                },
+            },
+            "expected_iptables_rules": [
+                "*filter",
+                "-P INPUT ACCEPT",
+                "-A INPUT -p tcp -s 10.0.0.0/8 --dport 22 -j ACCEPT",
+                "-A INPUT -d 10.1.0.32/32 -j DROP",
+                "-A INPUT -j DROP",
+                "COMMIT",
+            ],
+            "expected_ip6tables_rules": [
+                "*filter",
+                "-F",
+                "-X",
+                "-A INPUT -d fc00::/128 -j DROP",
+                "-A INPUT -j DROP",
+                "COMMIT",
+            ],
+        }
+    ]
+]
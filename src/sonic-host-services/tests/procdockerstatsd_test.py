@@ -1,6 +1,7 @@
 import sys
 import os
 import pytest
+from unittest import mock
 
 from swsscommon import swsscommon
 from sonic_py_common.general import load_module_from_source
@@ -41,3 +42,144 @@ class TestProcDockerStatsDaemon(object):
         for test_input, expected_output in test_data:
             res = pdstatsd.convert_to_bytes(test_input)
             assert res == expected_output
+
+    def create_proc(self, proc_path, pid, comm, ppid, tty_nr, utime, stime, start_ticks, rss_pages, cmdline):
+        pid_path = proc_path / pid
+        pid_path.mkdir()
+        stat = [pid, "({})".format(comm), "S", ppid, pid, pid, str(tty_nr), "0", "0", "0", "0", "0", "0",
+                str(utime), str(stime), "0", "0", "20", "0", "1", "0", str(start_ticks), "1000", str(rss_pages)]
+        (pid_path / "stat").write_text(" ".join(stat) + "\n")
+        (pid_path / "statm").write_text("1000 {} 100 10 0 100 0\n".format(rss_pages))
+        (pid_path / "cmdline").write_text(cmdline)
+
+    def create_tree(self, tmp_path):
+        proc_path = tmp_path / "proc"
+        proc_path.mkdir()
+        (proc_path / "meminfo").write_text("MemTotal:        4000000 kB\nMemFree:          100000 kB\n")
+        (proc_path / "stat").write_text("cpu  1 2 3 4\nbtime 1600000000\n")
+        (proc_path / "uptime").write_text("1000.00 3000.00\n")
+        (proc_path / "self").mkdir()
+        self.create_proc(proc_path, "1", "systemd", "0", 0, 100, 100, 10, 1000, "/sbin/init\0splash\0")
+        self.create_proc(proc_path, "300", "bash (login)", "1", 34816, 5000, 5000, 50000, 2000, "")
+
+        cid = "a" * 12 + "b" * 52
+        containers_path = tmp_path / "containers"
+        (containers_path / cid).mkdir(parents=True)
+        (containers_path / cid / "config.v2.json").write_text('{"Name": "/swss"}')
+        (containers_path / cid / "hostconfig.json").write_text('{"NetworkMode": "host"}')
+        stopped_cid = "c" * 64
+        (containers_path / stopped_cid).mkdir()
+        (containers_path / stopped_cid / "config.v2.json").write_text('{"Name": "/telemetry"}')
+
+        cgroup_path = tmp_path / "cgroup"
+        container_cgroup = cgroup_path / "system.slice" / "docker-{}.scope".format(cid)
+        container_cgroup.mkdir(parents=True)
+        (cgroup_path / "cgroup.controllers").write_text("cpu io memory pids\n")
+        (container_cgroup / "cpu.stat").write_text("usage_usec 2000000\nuser_usec 1500000\nsystem_usec 500000\n")
+        (container_cgroup / "memory.current").write_text("104857600\n")
+        (container_cgroup / "memory.stat").write_text("anon 52428800\ninactive_file 52428800\n")
+        (container_cgroup / "memory.max").write_text("max\n")
+        (container_cgroup / "io.stat").write_text("8:0 rbytes=4096 wbytes=8192 rios=1 wios=2 dbytes=0 dios=0\n")
+        (container_cgroup / "pids.current").write_text("12\n")
+        (container_cgroup / "cgroup.procs").write_text("300\n")
+        return proc_path, containers_path, cgroup_path, container_cgroup
+
+    def test_collect_stats(self, tmp_path):
+        proc_path, containers_path, cgroup_path, container_cgroup = self.create_tree(tmp_path)
+
+        pdstatsd = procdockerstatsd.ProcDockerStats(procdockerstatsd.SYSLOG_IDENTIFIER)
+        pdstatsd.proc_path = str(proc_path)
+        pdstatsd.docker_containers_path = str(containers_path)
+        pdstatsd.cgroup_path = str(cgroup_path)
+        pdstatsd.clock_ticks = 100
+        pdstatsd.page_size = 4096
+
+        dockerdata = pdstatsd.collect_docker_stats()
+        # swss runs 2 seconds of 500 seconds since the start of its init process
+        assert dockerdata["aaaaaaaaaaaa"] == {
+            'NAME': 'swss', 'CPU%': '0.40', 'MEM_BYTES': '52428800', 'MEM_LIMIT_BYTES': '4096000000', 'MEM%': '1.28',
+            'NET_IN_BYTES': '0', 'NET_OUT_BYTES': '0', 'BLOCK_IN_BYTES': '4096', 'BLOCK_OUT_BYTES': '8192', 'PIDS': '12'
+        }
+        assert dockerdata["cccccccccccc"]['NAME'] == 'telemetry'
+        assert dockerdata["cccccccccccc"]['PIDS'] == '0'
+
+        processdata = pdstatsd.collect_process_stats()
+        # bash runs 100 seconds of 500 seconds since its start, systemd runs 2 seconds of 999.9 seconds
+        assert list(processdata.keys()) == ["300", "1"]
+        assert processdata["300"]['%CPU'] == '20.0'
+        assert processdata["300"]['TT'] == 'pts/0'
+        assert processdata["300"]['TIME'] == '00:01:40'
+        assert processdata["300"]['CMD'] == '[bash (login)]'
+        assert processdata["300"]['PPID'] == '1'
+        assert processdata["1"]['%MEM'] == '0.1'
+        assert processdata["1"]['TT'] == '?'
+        assert processdata["1"]['CMD'] == '/sbin/init splash'
+
+        # CPU usage is calculated since the previous collection
+        (container_cgroup / "cpu.stat").write_text("usage_usec 3000000\n")
+        self.create_proc(proc_path, "2", "kthreadd", "0", 0, 0, 0, 20, 0, "")
+        (proc_path / "1" / "stat").write_text("1 (systemd) S 0 1 1 0 0 0 0 0 0 0 300 100 0 0 20 0 1 0 10 1000 1000\n")
+        with mock.patch.object(procdockerstatsd.time, "monotonic", return_value=procdockerstatsd.time.monotonic() + 10):
+            processdata = pdstatsd.collect_process_stats()
+            dockerdata = pdstatsd.collect_docker_stats()
+        assert float(processdata["1"]['%CPU']) == pytest.approx(20.0, abs=0.1)
+        assert processdata["300"]['%CPU'] == '0.0'
+        assert processdata["2"]['%CPU'] == '0.0'
+        assert float(dockerdata["aaaaaaaaaaaa"]['CPU%']) == pytest.approx(10.0, abs=0.1)
+
+    def test_collect_stats_cgroup_v1(self, tmp_path):
+        proc_path, containers_path, _, _ = self.create_tree(tmp_path)
+        cid = "a" * 12 + "b" * 52
+        (containers_path / cid / "hostconfig.json").write_text('{"NetworkMode": "bridge"}')
+        (proc_path / "300" / "net").mkdir()
+        (proc_path / "300" / "net" / "dev").write_text(
+            "Inter-|   Receive                                                |  Transmit\n"
+            " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n"
+            "    lo:    1000      10    0    0    0     0          0         0     1000      10    0    0    0     0       0          0\n"
+            "  eth0:    2048      20    0    0    0     0          0         0     4096      40    0    0    0     0       0          0\n")
+
+        cgroup_path = tmp_path / "cgroup_v1"
+        for controller in ("cpuacct", "memory", "blkio", "pids"):
+            (cgroup_path / controller / "docker" / cid).mkdir(parents=True)
+        (cgroup_path / "cpuacct" / "docker" / cid / "cpuacct.usage").write_text("5000000000\n")
+        memory_cgroup = cgroup_path / "memory" / "docker" / cid
+        (memory_cgroup / "memory.usage_in_bytes").write_text("104857600\n")
+        (memory_cgroup / "memory.stat").write_text("cache 62914560\ntotal_inactive_file 41943040\n")
+        (memory_cgroup / "memory.limit_in_bytes").write_text("1048576000\n")
+        (memory_cgroup / "cgroup.procs").write_text("300\n")
+        (cgroup_path / "blkio" / "docker" / cid / "blkio.throttle.io_service_bytes").write_text(
+            "8:0 Read 4096\n8:0 Write 8192\n8:0 Sync 12288\n8:0 Async 0\n8:0 Total 12288\n"
+            "8:16 Read 1024\n8:16 Write 0\nTotal 13312\n")
+        (cgroup_path / "pids" / "docker" / cid / "pids.current").write_text("7\n")
+
+        pdstatsd = procdockerstatsd.ProcDockerStats(procdockerstatsd.SYSLOG_IDENTIFIER)
+        pdstatsd.proc_path = str(proc_path)
+        pdstatsd.docker_containers_path = str(containers_path)
+        pdstatsd.cgroup_path = str(cgroup_path)
+        pdstatsd.clock_ticks = 100
+
+        dockerdata = pdstatsd.collect_docker_stats()
+        # swss runs 5 seconds of 500 seconds since the start of its init process
+        assert dockerdata["aaaaaaaaaaaa"] == {
+            'NAME': 'swss', 'CPU%': '1.00', 'MEM_BYTES': '62914560', 'MEM_LIMIT_BYTES': '1048576000', 'MEM%': '6.00',
+            'NET_IN_BYTES': '2048', 'NET_OUT_BYTES': '4096', 'BLOCK_IN_BYTES': '5120', 'BLOCK_OUT_BYTES': '8192', 'PIDS': '7'
+        }
+        assert dockerdata["cccccccccccc"]['NAME'] == 'telemetry'
+        assert dockerdata["cccccccccccc"]['PIDS'] == '0'
+
+    def test_update_state_db_table(self):
+        pdstatsd = procdockerstatsd.ProcDockerStats(procdockerstatsd.SYSLOG_IDENTIFIER)
+        table = mock.MagicMock()
+        table.getKeys.return_value = ["1", "2", "LastUpdateTime"]
+        with mock.patch.object(pdstatsd, "get_state_db_table", return_value=table):
+            pdstatsd.update_state_db_table("PROCESS_STATS", {"1": {"CMD": "init"}, "LastUpdateTime": {"lastupdate": "now"}})
+            table._del.assert_called_once_with("2")
+            table.set.assert_any_call("1", [("CMD", "init")])
+            table.flush.assert_called_once_with()
+
+            # The previous update is used to find the stale keys
+            table.reset_mock()
+            pdstatsd.update_state_db_table("PROCESS_STATS", {"3": {"CMD": "bash"}, "LastUpdateTime": {"lastupdate": "now"}})
+            table.getKeys.assert_not_called()
+            table._del.assert_called_once_with("1")
+            assert table.flush.call_count == 1
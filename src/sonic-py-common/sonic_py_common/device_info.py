@@ -3,6 +3,7 @@ import json
 import os
 import re
 import subprocess
+import time
 
 import yaml
 from natsort import natsorted
@@ -33,6 +34,9 @@ PLATFORM_ENV_CONF_FILENAME = "platform_env.conf"
 FRONTEND_ASIC_SUB_ROLE = "FrontEnd"
 BACKEND_ASIC_SUB_ROLE = "BackEnd"
 
+# Set to '0' to read the device facts from the files and Config DB on every call
+DEVICE_INFO_CACHE_ENV = 'SONIC_DEVICE_INFO_CACHE'
+
 # Chassis STATE_DB keys
 CHASSIS_INFO_TABLE = 'CHASSIS_INFO|chassis {}'
 CHASSIS_INFO_CARD_NUM_FIELD = 'module_num'
@@ -40,6 +44,158 @@ CHASSIS_INFO_SERIAL_FIELD = 'serial'
 CHASSIS_INFO_MODEL_FIELD = 'model'
 CHASSIS_INFO_REV_FIELD = 'revision'
 
+def _is_cache_enabled():
+    return os.environ.get(DEVICE_INFO_CACHE_ENV, '1') != '0'
+
+
+class DeviceFacts(object):
+    """
+    Memoized facts about the device: parsed machine.conf, sonic_version.yml,
+    asic.conf and platform_env.conf, and the platform and hwsku read from
+    Config DB. A fact is loaded once, and checked again when it was not
+    checked for CHECK_INTERVAL seconds: facts read from a file are parsed
+    again only if the file was changed, other facts are loaded again.
+    """
+    CHECK_INTERVAL = 10  # seconds
+
+    def __init__(self):
+        self.facts = {}  # key -> (value, file signature, time of the check)
+
+    def get_file_fact(self, path, parse):
+        """
+        Retrieves the result of parsing a file
+
+        Args:
+            path: a string containing the path to the file
+            parse: a function which takes the path and parses the file
+
+        Returns:
+            The result of the parse function, None if the file doesn't exist
+        """
+        if not _is_cache_enabled():
+            return parse(path) if os.path.isfile(path) else None
+
+        key = (path, parse)
+        now = time.monotonic()
+        entry = self.facts.get(key)
+        if entry is not None and now - entry[2] < self.CHECK_INTERVAL:
+            return entry[0]
+
+        # The existence is checked with os.path.isfile() like when the cache
+        # is disabled, so callers mocking it see the same behavior
+        if not os.path.isfile(path):
+            self.facts[key] = (None, None, now)
+            return None
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            # The file can't be signed, e.g. it was just removed: don't memoize
+            self.facts.pop(key, None)
+            return parse(path)
+        signature = (file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+
+        if entry is not None and entry[1] == signature:
+            value = entry[0]
+        else:
+            value = parse(path)
+        self.facts[key] = (value, signature, now)
+        return value
+
+    def get_fact(self, name, load):
+        """
+        Retrieves a fact which doesn't come from a file. None is not memoized,
+        so the fact is loaded again until it is available
+
+        Args:
+            name: a string containing the name of the fact
+            load: a function without arguments which loads the fact
+
+        Returns:
+            The result of the load function
+        """
+        if not _is_cache_enabled():
+            return load()
+
+        now = time.monotonic()
+        entry = self.facts.get(name)
+        if entry is not None and now - entry[2] < self.CHECK_INTERVAL:
+            return entry[0]
+
+        value = load()
+        if value is None:
+            self.facts.pop(name, None)
+        else:
+            self.facts[name] = (value, None, now)
+        return value
+
+    def invalidate(self):
+        """
+        Forgets all facts, so they are loaded again on the next call
+        """
+        self.facts.clear()
+
+
+device_facts = DeviceFacts()
+
+
+def clear_cache():
+    """
+    Forgets the memoized device facts
+    """
+    device_facts.invalidate()
+
+
+def _parse_path(path):
+    return path
+
+
+def _parse_machine_conf(path):
+    machine_vars = {}
+    with open(path) as machine_conf_file:
+        for line in machine_conf_file:
+            tokens = line.split('=')
+            if len(tokens) < 2:
+                continue
+            machine_vars[tokens[0]] = tokens[1].strip()
+
+    return machine_vars
+
+
+def _parse_sonic_version(path):
+    data = {}
+    with open(path) as stream:
+        if yaml.__version__ >= "5.1":
+            data = yaml.full_load(stream)
+        else:
+            data = yaml.load(stream)
+
+    return data
+
+
+def _parse_num_asic(path):
+    with open(path) as asic_conf_file:
+        for line in asic_conf_file:
+            tokens = line.split('=')
+            if len(tokens) < 2:
+               continue
+            if tokens[0].lower() == 'num_asic':
+                num_npus = tokens[1].strip()
+        return int(num_npus)
+
+
+def _parse_supervisor(path):
+    with open(path) as platform_env_conf_file:
+        for line in platform_env_conf_file:
+            tokens = line.split('=')
+            if len(tokens) < 2:
+               continue
+            if tokens[0].lower() == 'supervisor':
+                val = tokens[1].strip()
+                if val == '1':
+                    return True
+        return False
+
+
 def get_localhost_info(field, config_db=None):
     try:
         # TODO: enforce caller to provide config_db explicitly and remove its default value
@@ -69,18 +225,11 @@ def get_machine_info():
         A dictionary containing the key/value pairs as found in the machine
         configuration file
     """
-    if not os.path.isfile(MACHINE_CONF_PATH):
+    machine_vars = device_facts.get_file_fact(MACHINE_CONF_PATH, _parse_machine_conf)
+    if machine_vars is None:
         return None
 
-    machine_vars = {}
-    with open(MACHINE_CONF_PATH) as machine_conf_file:
-        for line in machine_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-                continue
-            machine_vars[tokens[0]] = tokens[1].strip()
-
-    return machine_vars
+    return dict(machine_vars)
 
 def get_platform(**kwargs):
     """
@@ -121,9 +270,9 @@ def get_platform(**kwargs):
         config_db = kwargs['config_db']
         if config_db is None:
             return None
-    else:
-        config_db = None
-    return get_localhost_info('platform', config_db=config_db)
+        return get_localhost_info('platform', config_db=config_db)
+
+    return device_facts.get_fact('platform', lambda: get_localhost_info('platform'))
 
 
 def get_hwsku():
@@ -134,7 +283,7 @@ def get_hwsku():
         A string containing the device's hardware SKU identifier
     """
 
-    return get_localhost_info('hwsku')
+    return device_facts.get_fact('hwsku', lambda: get_localhost_info('hwsku'))
 
 
 def get_platform_and_hwsku():
@@ -171,7 +320,7 @@ def get_asic_conf_file_path():
             yield os.path.join(HOST_DEVICE_PATH, platform, ASIC_CONF_FILENAME)
 
     for asic_conf_file_path in asic_conf_path_candidates():
-        if os.path.isfile(asic_conf_file_path):
+        if device_facts.get_file_fact(asic_conf_file_path, _parse_path):
             return asic_conf_file_path
 
     return None
@@ -194,7 +343,7 @@ def get_platform_env_conf_file_path():
         platform_env_conf_path_candidates.append(os.path.join(HOST_DEVICE_PATH, platform, PLATFORM_ENV_CONF_FILENAME))
 
     for platform_env_conf_file_path in platform_env_conf_path_candidates:
-        if os.path.isfile(platform_env_conf_file_path):
+        if device_facts.get_file_fact(platform_env_conf_file_path, _parse_path):
             return platform_env_conf_file_path
 
     return None
@@ -331,17 +480,11 @@ def get_path_to_port_config_file(hwsku=None, asic=None):
     return None
 
 def get_sonic_version_info():
-    if not os.path.isfile(SONIC_VERSION_YAML_PATH):
+    data = device_facts.get_file_fact(SONIC_VERSION_YAML_PATH, _parse_sonic_version)
+    if data is None:
         return None
 
-    data = {}
-    with open(SONIC_VERSION_YAML_PATH) as stream:
-        if yaml.__version__ >= "5.1":
-            data = yaml.full_load(stream)
-        else:
-            data = yaml.load(stream)
-
-    return data
+    return dict(data) if isinstance(data, dict) else data
 
 def get_sonic_version_file():
     if not os.path.isfile(SONIC_VERSION_YAML_PATH):
@@ -412,14 +555,8 @@ def get_num_npus():
     asic_conf_file_path = get_asic_conf_file_path()
     if asic_conf_file_path is None:
         return 1
-    with open(asic_conf_file_path) as asic_conf_file:
-        for line in asic_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'num_asic':
-                num_npus = tokens[1].strip()
-        return int(num_npus)
+    num_npus = device_facts.get_file_fact(asic_conf_file_path, _parse_num_asic)
+    return 1 if num_npus is None else num_npus
 
 
 def is_multi_npu():
@@ -445,16 +582,7 @@ def is_supervisor():
     platform_env_conf_file_path = get_platform_env_conf_file_path()
     if platform_env_conf_file_path is None:
         return False
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'supervisor':
-                val = tokens[1].strip()
-                if val == '1':
-                    return True
-        return False
+    return bool(device_facts.get_file_fact(platform_env_conf_file_path, _parse_supervisor))
 
 
 def get_npu_id_from_name(npu_name):
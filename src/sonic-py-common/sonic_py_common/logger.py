@@ -1,11 +1,23 @@
+import atexit
 import os
 import sys
 import syslog
+import threading
+import time
+
+# TODO: Remove this if/else block once we no longer support Python 2
+if sys.version_info.major == 3:
+    import queue
+else:
+    import Queue as queue
 
 """
 Logging functionality for SONiC Python applications
 """
 
+# TODO: Remove this once we no longer support Python 2
+_monotonic = getattr(time, 'monotonic', time.time)
+
 
 class Logger(object):
     """
@@ -26,6 +38,8 @@ class Logger(object):
     DEFAULT_LOG_FACILITY = LOG_FACILITY_USER
     DEFAULT_LOG_OPTION = LOG_OPTION_NDELAY
 
+    DEFAULT_QUEUE_SIZE = 10000
+
     def __init__(self, log_identifier=None, log_facility=DEFAULT_LOG_FACILITY, log_option=DEFAULT_LOG_OPTION):
         self._syslog = syslog
 
@@ -38,9 +52,138 @@ class Logger(object):
         # Set the default minimum log priority to LOG_PRIORITY_NOTICE
         self.set_min_log_priority(self.LOG_PRIORITY_NOTICE)
 
+        # Rate limiting is disabled by default
+        self._rate_limit = None
+        self._rate_limit_burst = None
+        self._rate_limit_lock = threading.Lock()
+        self._call_sites = {}  # (file name, line number) -> [tokens, time of the last update, suppressed messages]
+
+        # Messages are sent to syslog synchronously, unless the async writer is started
+        self._queue = None
+        self._writer = None
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
     def __del__(self):
         self._syslog.closelog()
 
+    #
+    # Methods for rate limiting
+    #
+
+    def set_rate_limit(self, rate, burst=None):
+        """
+        Limits the rate of the messages logged from every call site, i.e. a
+        line of code calling the logger, with a token bucket. The messages
+        over the limit are not logged; the number of suppressed messages is
+        logged with the next message allowed from the same call site
+
+        Args:
+            rate: The number of messages per second allowed from a call site,
+                  None to disable rate limiting
+            burst: The number of messages which could be logged from a call
+                   site at once, defaults to max(1, rate)
+
+        Raises:
+            ValueError: if rate is not positive
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("Log rate limit must be positive, got {}".format(rate))
+        with self._rate_limit_lock:
+            self._rate_limit = rate
+            self._rate_limit_burst = burst if burst is not None else (max(1, rate) if rate is not None else None)
+            self._call_sites.clear()
+
+    def _get_call_site(self):
+        # Skip the frames of the logger itself, e.g. log_error() -> log()
+        logger_file = Logger.log.__code__.co_filename
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_code.co_filename == logger_file:
+            frame = frame.f_back
+        if frame is None:
+            return None
+        return (frame.f_code.co_filename, frame.f_lineno)
+
+    def _allow(self, call_site):
+        """
+        Takes a token from the bucket of the call site
+
+        Returns:
+            A tuple (allowed, number of messages suppressed since the last allowed one)
+        """
+        now = _monotonic()
+        with self._rate_limit_lock:
+            bucket = self._call_sites.get(call_site)
+            if bucket is None:
+                bucket = self._call_sites[call_site] = [self._rate_limit_burst, now, 0]
+            else:
+                bucket[0] = min(self._rate_limit_burst, bucket[0] + (now - bucket[1]) * self._rate_limit)
+                bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False, 0
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+            return True, suppressed
+
+    #
+    # Methods for asynchronous logging
+    #
+
+    def start_async_writer(self, queue_size=DEFAULT_QUEUE_SIZE):
+        """
+        Sends the messages to syslog from a background thread, so logging
+        doesn't block the caller. When more than <queue_size> messages are
+        waiting, new messages are dropped and the number of dropped messages
+        is logged once the queue has room again. Messages printed to the
+        console are still printed by the caller
+
+        Args:
+            queue_size: The maximum number of messages waiting to be sent
+        """
+        if self._writer is not None:
+            return
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer = threading.Thread(target=self._write_messages, name='logger-writer')
+        self._writer.daemon = True
+        self._writer.start()
+        atexit.register(self.stop_async_writer)
+
+    def stop_async_writer(self):
+        """
+        Sends the waiting messages to syslog, stops the background thread and
+        goes back to logging synchronously
+        """
+        if self._writer is None:
+            return
+        writer, self._writer = self._writer, None
+        self._queue.put(None)
+        writer.join()
+        self._queue = None
+
+    def _write_messages(self):
+        message_queue = self._queue
+        while True:
+            message = message_queue.get()
+            if message is None:
+                break
+            self._syslog.syslog(*message)
+
+            with self._dropped_lock:
+                dropped, self._dropped = self._dropped, 0
+            if dropped:
+                self._syslog.syslog(self.LOG_PRIORITY_WARNING, "{} log messages dropped, the log queue was full".format(dropped))
+
+    def _send(self, priority, msg):
+        if self._writer is None:
+            self._syslog.syslog(priority, msg)
+            return
+        try:
+            self._queue.put_nowait((priority, msg))
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
     #
     # Methods for setting minimum log priority
     #
@@ -85,14 +228,45 @@ class Logger(object):
         """
         self.set_min_log_priority(self.LOG_PRIORITY_DEBUG)
 
+    def is_enabled_for(self, priority):
+        """
+        Checks whether messages with priority <priority> are logged
+
+        Args:
+            priority: The priority of the messages
+        """
+        return self._min_log_priority >= priority
+
     #
     # Methods for logging messages
     #
 
     def log(self, priority, msg, also_print_to_console=False):
+        """
+        Logs <msg> if its priority is high enough, and it is not over the
+        rate limit of its call site
+
+        Args:
+            priority: The priority of the message
+            msg: The message, or a function without arguments which returns
+                 the message. The function is called only if the message is
+                 logged, so expensive formatting could be deferred:
+                 log_debug(lambda: "Rules: {}".format(rules))
+            also_print_to_console: Whether to print the message to stdout
+        """
         if self._min_log_priority >= priority:
+            if self._rate_limit is not None:
+                allowed, suppressed = self._allow(self._get_call_site())
+                if not allowed:
+                    return
+                if suppressed:
+                    self._send(priority, "{} similar messages suppressed".format(suppressed))
+
+            if callable(msg):
+                msg = msg()
+
             # Send message to syslog
-            self._syslog.syslog(priority, msg)
+            self._send(priority, msg)
 
             # Send message to console
             if also_print_to_console:
@@ -2,11 +2,13 @@ import glob
 import os
 import subprocess
 
+import swsssdk
 from natsort import natsorted
 from swsscommon import swsscommon
 
 from .device_info import get_asic_conf_file_path
 from .device_info import is_supervisor, is_chassis
+from .device_info import device_facts, get_num_npus
 
 ASIC_NAME_PREFIX = 'asic'
 NAMESPACE_PATH_GLOB = '/run/netns/*'
@@ -19,7 +21,10 @@ PORT_CHANNEL_CFG_DB_TABLE = 'PORTCHANNEL'
 PORT_CFG_DB_TABLE = 'PORT'
 BGP_NEIGH_CFG_DB_TABLE = 'BGP_NEIGHBOR'
 BGP_INTERNAL_NEIGH_CFG_DB_TABLE = 'BGP_INTERNAL_NEIGHBOR'
+BGP_VOQ_CHASSIS_NEIGH_CFG_DB_TABLE = 'BGP_VOQ_CHASSIS_NEIGHBOR'
 NEIGH_DEVICE_METADATA_CFG_DB_TABLE = 'DEVICE_NEIGHBOR_METADATA'
+TOPOLOGY_CFG_DB_TABLES = (PORT_CFG_DB_TABLE, PORT_CHANNEL_CFG_DB_TABLE,
+                          BGP_INTERNAL_NEIGH_CFG_DB_TABLE, BGP_VOQ_CHASSIS_NEIGH_CFG_DB_TABLE)
 DEFAULT_NAMESPACE = ''
 PORT_ROLE = 'role'
 
@@ -82,19 +87,7 @@ def get_num_asics():
     Returns:
         Num of asics
     """
-    asic_conf_file_path = get_asic_conf_file_path()
-
-    if asic_conf_file_path is None:
-        return 1
-
-    with open(asic_conf_file_path) as asic_conf_file:
-        for line in asic_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-                continue
-            if tokens[0].lower() == 'num_asic':
-                num_asics = tokens[1].strip()
-        return int(num_asics)
+    return get_num_npus()
 
 
 def is_multi_asic():
@@ -188,7 +181,10 @@ def get_namespaces_from_linux():
     Returns:
         List of the namespaces present in the system
     """
-    current_ns = get_current_namespace()
+    # The namespace of the process doesn't change, avoid running 'ip netns identify' on every call.
+    # None is not memoized, so the global namespace is memoized as DEFAULT_NAMESPACE
+    current_ns = device_facts.get_fact('current_namespace',
+                                       lambda: get_current_namespace() or DEFAULT_NAMESPACE)
     if current_ns:
         return [current_ns]
 
@@ -274,18 +270,63 @@ def get_port_table(namespace=None):
 
     return all_ports
 
+
+def load_topology_for_asic(namespace):
+    """
+    Reads the tables describing the ports, the port channels and the
+    internal BGP sessions of an ASIC from its config DB. Only these tables
+    are read, in two pipelined round trips: the keys of the tables, then
+    all their entries. The redis client of the swsssdk connector is used,
+    as the one of the swsscommon connector can't pipeline commands
+
+    Returns:
+        a dict: table name -> dict of the table entries
+    """
+    config_db = swsssdk.ConfigDBConnector(namespace=namespace)
+    config_db.connect()
+    separator = config_db.TABLE_NAME_SEPARATOR
+    pipe = config_db.get_redis_client(config_db.db_name).pipeline()
+    for table in TOPOLOGY_CFG_DB_TABLES:
+        pipe.keys('{}{}*'.format(table, separator))
+    keys = [key for table_keys in pipe.execute() for key in table_keys]
+
+    for key in keys:
+        pipe.hgetall(key)
+    topology = {table: {} for table in TOPOLOGY_CFG_DB_TABLES}
+    for key, raw_data in zip(keys, pipe.execute()):
+        entry = config_db.raw_to_typed(raw_data)
+        if entry is not None:
+            table, row = key.split(separator, 1)
+            topology[table][config_db.deserialize_key(row)] = entry
+    return topology
+
+
+def get_topology_for_asic(namespace):
+    """
+    Retrieves the topology tables of an ASIC. They are memoized in
+    device_info.device_facts and read again from the config DB when they
+    were not read for DeviceFacts.CHECK_INTERVAL seconds, or after
+    device_info.clear_cache(). Setting SONIC_DEVICE_INFO_CACHE=0 in the
+    environment disables the memoization
+
+    Returns:
+        a dict: table name -> dict of the table entries. It is shared, so
+        the callers mustn't modify it
+    """
+    return device_facts.get_fact(('topology', namespace),
+                                 lambda: load_topology_for_asic(namespace))
+
+
 def get_port_entry_for_asic(port, namespace):
 
-    config_db = connect_config_db_for_ns(namespace)
-    ports = config_db.get_entry(PORT_CFG_DB_TABLE, port)
-    return ports
+    ports = get_topology_for_asic(namespace)[PORT_CFG_DB_TABLE]
+    return dict(ports.get(port, {}))
 
 
 def get_port_table_for_asic(namespace):
 
-    config_db = connect_config_db_for_ns(namespace)
-    ports = config_db.get_table(PORT_CFG_DB_TABLE)
-    return ports
+    ports = get_topology_for_asic(namespace)[PORT_CFG_DB_TABLE]
+    return {port: dict(entry) for port, entry in ports.items()}
 
 
 def get_namespace_for_port(port_name):
@@ -294,7 +335,7 @@ def get_namespace_for_port(port_name):
     port_namespace = None
 
     for ns in ns_list:
-        ports = get_port_table_for_asic(ns)
+        ports = get_topology_for_asic(ns)[PORT_CFG_DB_TABLE]
         if port_name in ports:
             port_namespace = ns
             break
@@ -347,8 +388,7 @@ def is_port_channel_internal(port_channel, namespace=None):
     ns_list = get_namespace_list(namespace)
 
     for ns in ns_list:
-        config_db = connect_config_db_for_ns(ns)
-        port_channels = config_db.get_entry(PORT_CHANNEL_CFG_DB_TABLE, port_channel)
+        port_channels = get_topology_for_asic(ns)[PORT_CHANNEL_CFG_DB_TABLE].get(port_channel)
 
         if port_channels:
             if 'members' in port_channels:
@@ -373,8 +413,7 @@ def get_back_end_interface_set(namespace=None):
     if len(bk_end_intf_list):
         ns_list = get_namespace_list(namespace)
         for ns in ns_list:
-            config_db = connect_config_db_for_ns(ns)
-            port_channels = config_db.get_table(PORT_CHANNEL_CFG_DB_TABLE)
+            port_channels = get_topology_for_asic(ns)[PORT_CHANNEL_CFG_DB_TABLE]
             # a back-end LAG must be configured with all of its member from back-end interfaces.
             # mixing back-end and front-end interfaces is miss configuration and not allowed.
             # To determine if a LAG is back-end LAG, just need to check its first member is back-end or not
@@ -394,18 +433,11 @@ def is_bgp_session_internal(bgp_neigh_ip, namespace=None):
     ns_list = get_namespace_list(namespace)
 
     for ns in ns_list:
-
-        config_db = connect_config_db_for_ns(ns)
-        bgp_sessions = config_db.get_entry(
-            BGP_INTERNAL_NEIGH_CFG_DB_TABLE, bgp_neigh_ip
-        )
-        if bgp_sessions:
+        topology = get_topology_for_asic(ns)
+        if topology[BGP_INTERNAL_NEIGH_CFG_DB_TABLE].get(bgp_neigh_ip):
             return True
 
-        bgp_sessions = config_db.get_entry(
-            'BGP_VOQ_CHASSIS_NEIGHBOR', bgp_neigh_ip
-        )
-        if bgp_sessions:
+        if topology[BGP_VOQ_CHASSIS_NEIGH_CFG_DB_TABLE].get(bgp_neigh_ip):
             return True
 
     return False
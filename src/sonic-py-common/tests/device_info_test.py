@@ -56,8 +56,9 @@ class TestDeviceInfo(object):
     @pytest.fixture(scope="class", autouse=True)
     def sanitize_environment(self):
         # Clear environment variables, in case a variable is set in the test
-        # environment (e.g., PLATFORM) which could modify the behavior of sonic-py-common
-        with mock.patch.dict(os.environ, {}, clear=True):
+        # environment (e.g., PLATFORM) which could modify the behavior of sonic-py-common.
+        # The device facts are not memoized, as the tests mock the files
+        with mock.patch.dict(os.environ, {device_info.DEVICE_INFO_CACHE_ENV: '0'}, clear=True):
             yield
 
     def test_get_machine_info(self):
@@ -69,6 +70,17 @@ class TestDeviceInfo(object):
                 assert result == EXPECTED_GET_MACHINE_INFO_RESULT
                 open_mocked.assert_called_once_with("/host/machine.conf")
 
+    def test_get_machine_info_with_cache(self):
+        # Callers mocking os.path.isfile get the same result when the facts are memoized
+        with mock.patch.dict(os.environ, {device_info.DEVICE_INFO_CACHE_ENV: '1'}), \
+                mock.patch("os.path.isfile", return_value=True):
+            device_info.clear_cache()
+            open_mocked = mock.mock_open(read_data=MACHINE_CONF_CONTENTS)
+            with mock.patch("{}.open".format(BUILTINS), open_mocked):
+                assert device_info.get_machine_info() == EXPECTED_GET_MACHINE_INFO_RESULT
+                open_mocked.assert_called_once_with("/host/machine.conf")
+        device_info.clear_cache()
+
     def test_get_platform(self):
         with mock.patch("sonic_py_common.device_info.get_machine_info") as get_machine_info_mocked:
             get_machine_info_mocked.return_value = EXPECTED_GET_MACHINE_INFO_RESULT
@@ -83,6 +95,51 @@ class TestDeviceInfo(object):
                      "revision": SonicV2Connector.TEST_REV}
             assert result == truth
 
+    def test_device_facts(self, tmpdir):
+        machine_conf = tmpdir.join("machine.conf")
+        machine_conf.write(MACHINE_CONF_CONTENTS)
+        asic_conf = tmpdir.join("asic.conf")
+        asic_conf.write("NUM_ASIC=3\nDEV_ID_ASIC_0=03:00.0\n")
+
+        with mock.patch.dict(os.environ, {device_info.DEVICE_INFO_CACHE_ENV: '1'}), \
+                mock.patch("sonic_py_common.device_info.MACHINE_CONF_PATH", str(machine_conf)), \
+                mock.patch("sonic_py_common.device_info.CONTAINER_PLATFORM_PATH", str(tmpdir)), \
+                mock.patch("sonic_py_common.device_info._parse_machine_conf", wraps=device_info._parse_machine_conf) as parse_mocked, \
+                mock.patch("sonic_py_common.device_info.time.monotonic") as monotonic_mocked:
+            monotonic_mocked.return_value = 100
+            device_info.clear_cache()
+            assert device_info.get_machine_info() == EXPECTED_GET_MACHINE_INFO_RESULT
+            assert device_info.get_platform() == "x86_64-mlnx_msn2700-r0"
+            assert device_info.get_num_npus() == 3
+            assert device_info.is_multi_npu()
+            assert parse_mocked.call_count == 1
+
+            # The result is a copy, callers can't modify the memoized facts
+            device_info.get_machine_info()['onie_platform'] = 'modified'
+            assert device_info.get_platform() == "x86_64-mlnx_msn2700-r0"
+
+            # The files are not checked again before the check interval expires
+            machine_conf.write(MACHINE_CONF_CONTENTS.replace("msn2700-r0", "msn2700-r1") + "\n")
+            asic_conf.remove()
+            assert device_info.get_platform() == "x86_64-mlnx_msn2700-r0"
+            assert device_info.get_num_npus() == 3
+
+            # The changed files are parsed again after the check interval
+            monotonic_mocked.return_value += device_info.DeviceFacts.CHECK_INTERVAL
+            assert device_info.get_platform() == "x86_64-mlnx_msn2700-r1"
+            assert device_info.get_num_npus() == 1
+            assert parse_mocked.call_count == 2
+
+            # An unchanged file is not parsed again
+            monotonic_mocked.return_value += device_info.DeviceFacts.CHECK_INTERVAL
+            assert device_info.get_platform() == "x86_64-mlnx_msn2700-r1"
+            assert parse_mocked.call_count == 2
+
+            device_info.clear_cache()
+            assert device_info.get_platform() == "x86_64-mlnx_msn2700-r1"
+            assert parse_mocked.call_count == 3
+        device_info.clear_cache()
+
     @classmethod
     def teardown_class(cls):
         print("TEARDOWN")
@@ -0,0 +1,87 @@
+import sys
+
+# TODO: Remove this if/else block once we no longer support Python 2
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    # Expect the 'mock' package for python 2
+    # https://pypi.python.org/pypi/mock
+    import mock
+
+import pytest
+
+from sonic_py_common import logger
+from sonic_py_common.logger import Logger
+
+
+class TestLogger(object):
+    def get_logger(self):
+        log = Logger(log_identifier='logger_test')
+        log._syslog = mock.MagicMock()
+        return log
+
+    def get_messages(self, log):
+        return [call[0][1] for call in log._syslog.syslog.call_args_list]
+
+    def log_error(self, log, i):
+        log.log_error('error {}'.format(i))
+
+    def test_lazy_message(self):
+        log = self.get_logger()
+        format_message = mock.MagicMock(return_value='formatted')
+        log.log_debug(format_message)
+        assert not format_message.called
+        assert not log.is_enabled_for(Logger.LOG_PRIORITY_DEBUG)
+
+        log.set_min_log_priority_debug()
+        log.log_debug(format_message)
+        format_message.assert_called_once_with()
+        log._syslog.syslog.assert_called_once_with(Logger.LOG_PRIORITY_DEBUG, 'formatted')
+
+    def test_rate_limit(self):
+        log = self.get_logger()
+        log.set_rate_limit(1, burst=2)
+        with mock.patch('sonic_py_common.logger._monotonic', return_value=100.0) as monotonic:
+            for i in range(5):
+                self.log_error(log, i)
+            log.log_notice('other call site')
+            assert self.get_messages(log) == ['error 0', 'error 1', 'other call site']
+
+            monotonic.return_value = 101.0
+            for i in range(5, 7):
+                self.log_error(log, i)
+            assert self.get_messages(log)[3:] == ['3 similar messages suppressed', 'error 5']
+
+        log.set_rate_limit(None)
+        for i in range(5):
+            log.log_error('error')
+        assert len(self.get_messages(log)) == 10
+
+    def test_rate_limit_must_be_positive(self):
+        log = self.get_logger()
+        for rate in (0, -1):
+            with pytest.raises(ValueError):
+                log.set_rate_limit(rate)
+        log.log_error('error')
+        assert self.get_messages(log) == ['error']
+
+    def test_async_writer(self):
+        log = self.get_logger()
+        log.start_async_writer()
+        for i in range(100):
+            log.log_error('error {}'.format(i))
+        log.stop_async_writer()
+        assert self.get_messages(log) == ['error {}'.format(i) for i in range(100)]
+
+        log.log_error('sync')
+        assert self.get_messages(log)[-1] == 'sync'
+
+    def test_async_writer_queue_full(self):
+        log = self.get_logger()
+        log.start_async_writer(queue_size=1)
+        with mock.patch.object(logger.queue.Queue, 'put_nowait', side_effect=logger.queue.Full):
+            log.log_error('dropped')
+            log.log_error('dropped')
+        log.log_error('written')
+        log.stop_async_writer()
+        assert self.get_messages(log) == ['written', '2 log messages dropped, the log queue was full']
@@ -0,0 +1,175 @@
+import sys
+
+# TODO: Remove this if/else block once we no longer support Python 2
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    # Expect the 'mock' package for python 2
+    # https://pypi.python.org/pypi/mock
+    import mock
+
+import fnmatch
+
+import pytest
+
+from sonic_py_common import device_info, multi_asic
+
+CONFIG_DB = {
+    'asic0': {
+        'PORT': {
+            'Ethernet0': {'alias': 'Ethernet1/1', 'role': 'Ext'},
+            'Ethernet-BP0': {'alias': 'Eth4-ASIC0', 'role': 'Int'},
+        },
+        'PORTCHANNEL': {
+            'PortChannel0002': {'members': ['Ethernet-BP0']},
+            'PortChannel1002': {'members': ['Ethernet0']},
+        },
+        'BGP_INTERNAL_NEIGHBOR': {
+            '10.1.0.1': {'asn': '65100'},
+        },
+    },
+    'asic1': {
+        'PORT': {
+            'Ethernet-BP256': {'alias': 'Eth0-ASIC1', 'role': 'Int'},
+        },
+        'PORTCHANNEL': {
+            'PortChannel4001': {'members': ['Ethernet-BP256']},
+        },
+        'BGP_VOQ_CHASSIS_NEIGHBOR': {
+            '10.2.0.1': {'asn': '65100'},
+        },
+    },
+}
+
+
+class MockPipeline(object):
+    """ Pipeline of the redis client of the swsssdk connector, the commands are run by execute() """
+    def __init__(self, db, executed):
+        self.db = db
+        self.executed = executed
+        self.commands = []
+
+    def keys(self, pattern):
+        self.commands.append(lambda: [key for key in self.db if fnmatch.fnmatchcase(key, pattern)])
+
+    def hgetall(self, key):
+        self.commands.append(lambda: dict(self.db[key]))
+
+    def execute(self):
+        self.executed.append(len(self.commands))
+        results = [command() for command in self.commands]
+        self.commands = []
+        return results
+
+
+class MockConfigDBConnector(object):
+    """ swsssdk ConfigDBConnector over a namespace of CONFIG_DB """
+    TABLE_NAME_SEPARATOR = '|'
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.db_name = None
+        self.executed = []
+
+    def connect(self):
+        self.db_name = 'CONFIG_DB'
+
+    def get_redis_client(self, db_name):
+        assert db_name == 'CONFIG_DB'
+        db = {}
+        for table, entries in CONFIG_DB[self.namespace].items():
+            for key, entry in entries.items():
+                db[table + '|' + key] = {field + '@' if isinstance(value, list) else field:
+                                         ','.join(value) if isinstance(value, list) else value
+                                         for field, value in entry.items()}
+        client = mock.MagicMock()
+        client.pipeline.side_effect = lambda: MockPipeline(db, self.executed)
+        return client
+
+    def raw_to_typed(self, raw_data):
+        if not raw_data:
+            return None
+        # Fields of list values end with '@'
+        return {field.rstrip('@'): value.split(',') if field.endswith('@') else value
+                for field, value in raw_data.items()}
+
+    @staticmethod
+    def deserialize_key(key):
+        return key
+
+
+class TestMultiAsic(object):
+    @pytest.fixture(autouse=True)
+    def multi_asic_device(self):
+        device_info.clear_cache()
+        self.config_dbs = {}
+        with mock.patch('sonic_py_common.multi_asic.get_num_npus', return_value=2), \
+                mock.patch('sonic_py_common.multi_asic.get_current_namespace', return_value=''), \
+                mock.patch('sonic_py_common.multi_asic.glob.glob', return_value=['/run/netns/asic1', '/run/netns/asic0']), \
+                mock.patch('sonic_py_common.multi_asic.swsssdk.ConfigDBConnector') as connector:
+            connector.side_effect = self.config_db_for_ns
+            yield connector
+        device_info.clear_cache()
+
+    def config_db_for_ns(self, namespace):
+        config_db = MockConfigDBConnector(namespace)
+        self.config_dbs[namespace] = config_db
+        return config_db
+
+    def test_get_port_table(self):
+        assert multi_asic.get_namespace_list() == ['asic0', 'asic1']
+        assert sorted(multi_asic.get_port_table()) == ['Ethernet-BP0', 'Ethernet-BP256', 'Ethernet0']
+        assert multi_asic.get_port_entry('Ethernet-BP256', None) == {'alias': 'Eth0-ASIC1', 'role': 'Int'}
+        assert multi_asic.get_port_entry('Ethernet4', None) == {}
+        assert multi_asic.get_namespace_for_port('Ethernet-BP256') == 'asic1'
+        with pytest.raises(ValueError):
+            multi_asic.get_namespace_for_port('Ethernet4')
+
+    def test_port_roles(self):
+        assert multi_asic.is_port_internal('Ethernet-BP0')
+        assert not multi_asic.is_port_internal('Ethernet0', 'asic0')
+        assert multi_asic.get_external_ports(['Ethernet0', 'Ethernet-BP0', 'Ethernet-BP256']) == {'Ethernet0'}
+        assert multi_asic.is_port_channel_internal('PortChannel4001')
+        assert not multi_asic.is_port_channel_internal('PortChannel1002')
+        assert multi_asic.get_back_end_interface_set() == {'Ethernet-BP0', 'Ethernet-BP256',
+                                                           'PortChannel0002', 'PortChannel4001'}
+        assert multi_asic.get_back_end_interface_set('asic1') == {'Ethernet-BP256', 'PortChannel4001'}
+
+    def test_is_bgp_session_internal(self):
+        assert multi_asic.is_bgp_session_internal('10.1.0.1')
+        assert multi_asic.is_bgp_session_internal('10.2.0.1')
+        assert not multi_asic.is_bgp_session_internal('10.2.0.1', 'asic0')
+        assert not multi_asic.is_bgp_session_internal('10.3.0.1')
+
+    def test_topology_is_read_once(self, multi_asic_device):
+        for port in ['Ethernet0', 'Ethernet-BP0', 'Ethernet-BP256'] * 10:
+            multi_asic.is_port_internal(port)
+        multi_asic.get_back_end_interface_set()
+        multi_asic.is_bgp_session_internal('10.3.0.1')
+        assert multi_asic_device.call_count == 2
+
+        # the returned entries are copies, the memoized topology is not modified
+        multi_asic.get_port_entry('Ethernet0', 'asic0')['role'] = 'Int'
+        assert not multi_asic.is_port_internal('Ethernet0')
+
+        device_info.clear_cache()
+        multi_asic.is_port_internal('Ethernet0')
+        assert multi_asic_device.call_count == 3
+
+    def test_topology_is_read_in_two_round_trips(self, multi_asic_device):
+        multi_asic.is_port_internal('Ethernet0', 'asic0')
+        multi_asic_device.assert_called_once_with(namespace='asic0')
+        # The keys of the 4 topology tables, then the 5 entries of asic0
+        assert self.config_dbs['asic0'].executed == [4, 5]
+
+    def test_current_namespace_is_memoized(self):
+        with mock.patch('sonic_py_common.multi_asic.get_current_namespace', return_value=None) as get_current_namespace:
+            for i in range(3):
+                assert multi_asic.get_namespaces_from_linux() == ['asic0', 'asic1']
+        assert get_current_namespace.call_count == 1
+
+    def test_topology_is_not_memoized_when_cache_is_disabled(self, multi_asic_device):
+        with mock.patch.dict('os.environ', {device_info.DEVICE_INFO_CACHE_ENV: '0'}):
+            multi_asic.is_port_internal('Ethernet0', 'asic0')
+            multi_asic.is_port_internal('Ethernet0', 'asic0')
+        assert multi_asic_device.call_count == 2
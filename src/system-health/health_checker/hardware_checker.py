@@ -7,9 +7,12 @@ from .health_checker import HealthChecker
 class HardwareChecker(HealthChecker):
     """
     Check system hardware status. For now, it checks ASIC, PSU and fan status.
+    The hardware data is read from STATE_DB once and then kept up to date with the changes of the subscribed tables,
+    so a check doesn't read the DB unless the checker was invalidated.
     """
 
     ASIC_TEMPERATURE_KEY = 'TEMPERATURE_INFO|ASIC'
+    TEMPERATURE_TABLE_NAME = 'TEMPERATURE_INFO'
     FAN_TABLE_NAME = 'FAN_INFO'
     PSU_TABLE_NAME = 'PSU_INFO'
 
@@ -17,16 +20,59 @@ class HardwareChecker(HealthChecker):
         HealthChecker.__init__(self)
         self._db = SonicV2Connector(host="127.0.0.1")
         self._db.connect(self._db.STATE_DB)
+        # STATE_DB key -> fields of the ASIC temperature, fan and PSU entries, None if they have to be read again
+        self._data = None
 
     def get_category(self):
         return 'Hardware'
 
     def check(self, config):
         self.reset()
+        if self._data is None:
+            self._data = self._load_data()
         self._check_asic_status(config)
         self._check_fan_status(config)
         self._check_psu_status(config)
 
+    def get_subscribed_tables(self):
+        return [HardwareChecker.TEMPERATURE_TABLE_NAME, HardwareChecker.FAN_TABLE_NAME, HardwareChecker.PSU_TABLE_NAME]
+
+    def process_event(self, table, key, op, fvs):
+        if self._data is None:
+            # Everything is read on the next check anyway
+            return False
+
+        db_key = '{}|{}'.format(table, key)
+        if not db_key.startswith((HardwareChecker.ASIC_TEMPERATURE_KEY, HardwareChecker.FAN_TABLE_NAME,
+                                  HardwareChecker.PSU_TABLE_NAME)):
+            return False
+
+        old_data = self._data.get(db_key)
+        if op == 'SET':
+            self._data[db_key] = dict(fvs)
+        else:
+            self._data.pop(db_key, None)
+        return self._data.get(db_key) != old_data
+
+    def invalidate(self):
+        self._data = None
+
+    def _load_data(self):
+        """
+        Read the ASIC temperature, fan and PSU entries from STATE_DB.
+        :return: A dictionary: STATE_DB key -> fields of the entry
+        """
+        data = {}
+        for pattern in (HardwareChecker.ASIC_TEMPERATURE_KEY, HardwareChecker.FAN_TABLE_NAME,
+                        HardwareChecker.PSU_TABLE_NAME):
+            keys = self._db.keys(self._db.STATE_DB, pattern + '*')
+            for key in keys or []:
+                data[key] = self._db.get_all(self._db.STATE_DB, key)
+        return data
+
+    def _get_keys(self, prefix):
+        return [key for key in self._data if key.startswith(prefix)]
+
     def _check_asic_status(self, config):
         """
         Check if ASIC temperature is in valid range.
@@ -36,13 +82,10 @@ class HardwareChecker(HealthChecker):
         if config.ignore_devices and 'asic' in config.ignore_devices:
             return
 
-        ASIC_TEMPERATURE_KEY_LIST = self._db.keys(self._db.STATE_DB,
-                                                  HardwareChecker.ASIC_TEMPERATURE_KEY + '*')
+        ASIC_TEMPERATURE_KEY_LIST = self._get_keys(HardwareChecker.ASIC_TEMPERATURE_KEY)
         for asic_key in ASIC_TEMPERATURE_KEY_LIST:
-            temperature = self._db.get(self._db.STATE_DB, asic_key,
-                                                          'temperature')
-            temperature_threshold = self._db.get(self._db.STATE_DB, asic_key,
-                                                          'high_threshold')
+            temperature = self._data[asic_key].get('temperature')
+            temperature_threshold = self._data[asic_key].get('high_threshold')
             asic_name = asic_key.split('|')[1]
             if not temperature:
                 self.set_object_not_ok('ASIC', asic_name,
@@ -77,7 +120,7 @@ class HardwareChecker(HealthChecker):
         if config.ignore_devices and 'fan' in config.ignore_devices:
             return
 
-        keys = self._db.keys(self._db.STATE_DB, HardwareChecker.FAN_TABLE_NAME + '*')
+        keys = self._get_keys(HardwareChecker.FAN_TABLE_NAME)
         if not keys:
             self.set_object_not_ok('Fan', 'Fan', 'Failed to get fan information')
             return
@@ -91,7 +134,7 @@ class HardwareChecker(HealthChecker):
             name = key_list[1]
             if config.ignore_devices and name in config.ignore_devices:
                 continue
-            data_dict = self._db.get_all(self._db.STATE_DB, key)
+            data_dict = self._data[key]
             presence = data_dict.get('presence', 'false')
             if presence.lower() != 'true':
                 self.set_object_not_ok('Fan', name, '{} is missing'.format(name))
@@ -153,7 +196,7 @@ class HardwareChecker(HealthChecker):
         if config.ignore_devices and 'psu' in config.ignore_devices:
             return
 
-        keys = self._db.keys(self._db.STATE_DB, HardwareChecker.PSU_TABLE_NAME + '*')
+        keys = self._get_keys(HardwareChecker.PSU_TABLE_NAME)
         if not keys:
             self.set_object_not_ok('PSU', 'PSU', 'Failed to get PSU information')
             return
@@ -168,7 +211,7 @@ class HardwareChecker(HealthChecker):
             if config.ignore_devices and name in config.ignore_devices:
                 continue
 
-            data_dict = self._db.get_all(self._db.STATE_DB, key)
+            data_dict = self._data[key]
             presence = data_dict.get('presence', 'false')
             if presence.lower() != 'true':
                 self.set_object_not_ok('PSU', name, '{} is missing or not available'.format(name))
@@ -45,6 +45,33 @@ class HealthChecker(object):
         """
         pass
 
+    def get_subscribed_tables(self):
+        """
+        Get the STATE_DB tables whose changes the checker wants to be notified about via process_event.
+        :return: List of table names.
+        """
+        return []
+
+    def process_event(self, table, key, op, fvs):
+        """
+        Handle a change in a subscribed table. A checker that keeps state between checks should update it here and
+        report whether it has to be checked again.
+        :param table: Table name.
+        :param key: Key of the changed entry, without the table name.
+        :param op: 'SET' or 'DEL'.
+        :param fvs: A dictionary of the entry fields.
+        :return: True if the check result might have changed.
+        """
+        return False
+
+    def invalidate(self):
+        """
+        Drop the state kept between checks, so the next check reads everything again. Called for the periodic full
+        rescan and when the configuration changes.
+        :return:
+        """
+        pass
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -72,7 +99,6 @@ class HealthChecker(object):
         self.add_info(object_name, self.INFO_FIELD_OBJECT_TYPE, object_type)
         self.add_info(object_name, self.INFO_FIELD_OBJECT_MSG, message)
         self.add_info(object_name, self.INFO_FIELD_OBJECT_STATUS, self.STATUS_NOT_OK)
-        HealthChecker.summary = HealthChecker.STATUS_NOT_OK
 
     def set_object_ok(self, object_type, object_name):
         """
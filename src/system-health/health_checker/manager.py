@@ -1,3 +1,6 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from .config import Config
 from .health_checker import HealthChecker
 from .service_checker import ServiceChecker
@@ -11,9 +14,31 @@ class HealthCheckerManager(object):
     """
     boot_timeout = None
 
+    # Maximum number of checkers running at the same time
+    MAX_WORKERS = 8
+
+    CHECKER_STATUS_FINISHED = 'finished'
+    CHECKER_STATUS_TIMEOUT = 'timeout'
+
     def __init__(self):
         self._checkers = []
         self.config = Config()
+        self._executor = ThreadPoolExecutor(max_workers=HealthCheckerManager.MAX_WORKERS)
+        # Checker name -> (future, start time) of the checks which are running
+        self._running = {}
+        # Checker name -> statistic of its last check
+        self._results = {}
+        # Checker name -> {'status': finished or timeout, 'duration': seconds} of its last check
+        self.checker_stats = {}
+        # Summary of the last combined statistic, OK or Not OK
+        self.summary = HealthChecker.STATUS_OK
+        # Checkers whose subscribed tables changed since their last check
+        self._changed_checkers = set()
+        # Checker name -> events received while the checker is running, they are passed to it once it finishes
+        self._pending_events = {}
+        # Names of the checkers to invalidate once their running check finishes
+        self._pending_invalidate = set()
+        self._last_full_rescan = None
         self.initialize()
 
     def initialize(self):
@@ -26,27 +51,175 @@ class HealthCheckerManager(object):
 
     def check(self, chassis):
         """
-        Load new configuration if any and perform the system health check for all existing checkers.
+        Load new configuration if any and perform the system health check for all existing checkers. If the
+        configuration changed or the full rescan interval elapsed, the checkers drop the state they keep between checks
+        and read everything again.
         :param chassis: A chassis object.
         :return: A dictionary that contains the status for all objects that was checked.
         """
-        HealthChecker.summary = HealthChecker.STATUS_OK
-        stats = {}
+        last_mtime = self.config._last_mtime
         self.config.load_config()
 
-        for checker in self._checkers:
-            self._do_check(checker, stats)
+        now = time.monotonic()
+        if (self._last_full_rescan is None or self.config._last_mtime != last_mtime or
+                now - self._last_full_rescan >= self.config.full_rescan_interval):
+            for checker in self._checkers:
+                if str(checker) in self._running:
+                    self._pending_invalidate.add(str(checker))
+                else:
+                    checker.invalidate()
+            self._last_full_rescan = now
 
+        self._results = {}
+        self.checker_stats = {}
+        self._changed_checkers.clear()
+        checkers = list(self._checkers)
         if self.config.user_defined_checkers:
             for udc in self.config.user_defined_checkers:
-                checker = UserDefinedChecker(udc)
-                self._do_check(checker, stats)
+                checkers.append(UserDefinedChecker(udc))
+        self._check_concurrently(checkers)
 
-        led_status = 'normal' if HealthChecker.summary == HealthChecker.STATUS_OK else 'fault'
-        self._set_system_led(chassis, self.config, led_status)
+        stats, self.summary = self._get_stats(chassis)
+        return stats
+
+    def check_changed(self, chassis):
+        """
+        Perform the system health check again only for the checkers notified about a change via process_event, and
+        combine it with the last statistic of the other checkers.
+        :param chassis: A chassis object.
+        :return: A dictionary that contains the status for all objects that was checked, None if nothing changed.
+        """
+        if not self._changed_checkers:
+            return None
+
+        checkers = [checker for checker in self._checkers if checker in self._changed_checkers]
+        self._changed_checkers.clear()
+        self._check_concurrently(checkers)
 
+        stats, self.summary = self._get_stats(chassis)
         return stats
 
+    def get_subscribed_tables(self):
+        """
+        Get the STATE_DB tables the checkers want to be notified about.
+        :return: A set of table names.
+        """
+        tables = set()
+        for checker in self._checkers:
+            tables.update(checker.get_subscribed_tables())
+        return tables
+
+    def process_event(self, table, key, op, fvs):
+        """
+        Pass a change of a STATE_DB table to the checkers subscribed to it. A checker which is running, e.g. after a
+        timeout, gets the change once its check finishes, so its state isn't modified while it is being checked.
+        :param table: Table name.
+        :param key: Key of the changed entry, without the table name.
+        :param op: 'SET' or 'DEL'.
+        :param fvs: A dictionary of the entry fields.
+        :return: True if a checker has to be checked again.
+        """
+        changed = False
+        for checker in self._checkers:
+            if table not in checker.get_subscribed_tables():
+                continue
+            name = str(checker)
+            if name in self._running:
+                self._pending_events.setdefault(name, []).append((table, key, op, fvs))
+                self._changed_checkers.add(checker)
+                changed = True
+            elif checker.process_event(table, key, op, fvs):
+                self._changed_checkers.add(checker)
+                changed = True
+        return changed
+
+    def _process_pending_events(self, checker):
+        """
+        Pass to a checker whose check finished the invalidation and the events received while it was running.
+        :param checker: A checker object.
+        :return:
+        """
+        name = str(checker)
+        if name in self._pending_invalidate:
+            self._pending_invalidate.discard(name)
+            checker.invalidate()
+            self._changed_checkers.add(checker)
+        for table, key, op, fvs in self._pending_events.pop(name, []):
+            if checker.process_event(table, key, op, fvs):
+                self._changed_checkers.add(checker)
+
+    def _check_concurrently(self, checkers):
+        """
+        Run the checkers on the thread pool and wait for them until the checker timeout. A checker which doesn't finish
+        in time is reported as timed out; it is not started again until its running check finishes.
+        :param checkers: A list of checker objects.
+        :return:
+        """
+        start = time.monotonic()
+        for checker in checkers:
+            name = str(checker)
+            if name not in self._running:
+                self._running[name] = (self._executor.submit(self._run_checker, checker), start)
+
+        wait([self._running[str(checker)][0] for checker in checkers], timeout=self.config.checker_timeout)
+
+        now = time.monotonic()
+        for checker in checkers:
+            name = str(checker)
+            future, checker_start = self._running[name]
+            if future.done():
+                del self._running[name]
+                self._process_pending_events(checker)
+                self._results[name], duration = future.result()
+                self.checker_stats[name] = {'status': HealthCheckerManager.CHECKER_STATUS_FINISHED,
+                                            'duration': duration}
+            else:
+                error_msg = 'Health check for {} timed out after {} seconds'.format(checker, int(now - checker_start))
+                self._results[name] = {'Internal': {name: {
+                    HealthChecker.INFO_FIELD_OBJECT_STATUS: HealthChecker.STATUS_NOT_OK,
+                    HealthChecker.INFO_FIELD_OBJECT_MSG: error_msg,
+                    HealthChecker.INFO_FIELD_OBJECT_TYPE: "Internal"
+                }}}
+                self.checker_stats[name] = {'status': HealthCheckerManager.CHECKER_STATUS_TIMEOUT,
+                                            'duration': now - checker_start}
+
+    def _run_checker(self, checker):
+        """
+        Run a checker on a thread of the pool.
+        :param checker: A checker object.
+        :return: A tuple of the check statistic and the duration of the check in seconds.
+        """
+        start = time.monotonic()
+        stats = {}
+        self._do_check(checker, stats)
+        return stats, time.monotonic() - start
+
+    def _get_stats(self, chassis):
+        """
+        Combine the statistic of all checkers, compute the summary and update the system LED. The summary is computed
+        only here, from the combined statistic, so a checker still running after a timeout can't change it.
+        :param chassis: A chassis object.
+        :return: A tuple of a dictionary that contains the status for all objects that was checked, and the summary.
+        """
+        stats = {}
+        summary = HealthChecker.STATUS_OK
+        for result in self._results.values():
+            for category, info in result.items():
+                if category not in stats:
+                    stats[category] = dict(info)
+                else:
+                    stats[category].update(info)
+                for obj_data in info.values():
+                    if obj_data.get(HealthChecker.INFO_FIELD_OBJECT_STATUS) == HealthChecker.STATUS_NOT_OK:
+                        summary = HealthChecker.STATUS_NOT_OK
+
+        # Kept up to date for the callers reading the summary from HealthChecker
+        HealthChecker.summary = summary
+        led_status = 'normal' if summary == HealthChecker.STATUS_OK else 'fault'
+        self._set_system_led(chassis, self.config, led_status)
+
+        return stats, summary
+
     def _do_check(self, checker, stats):
         """
         Do check for a particular checker and collect the check statistic.
@@ -63,7 +236,6 @@ class HealthCheckerManager(object):
             else:
                 stats[category].update(info)
         except Exception as e:
-            HealthChecker.summary = HealthChecker.STATUS_NOT_OK
             error_msg = 'Failed to perform health check for {} due to exception - {}'.format(checker, repr(e))
             entry = {str(checker): {
                 HealthChecker.INFO_FIELD_OBJECT_STATUS: HealthChecker.STATUS_NOT_OK,
@@ -1,11 +1,14 @@
+import copy
 import docker
 import os
 import pickle
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 from swsscommon import swsscommon
 from sonic_py_common import multi_asic
 from sonic_py_common.logger import Logger
+from .config import Config
 from .health_checker import HealthChecker
 from . import utils
 
@@ -16,8 +19,13 @@ logger = Logger(log_identifier=SYSLOG_IDENTIFIER)
 class ServiceChecker(HealthChecker):
     """
     Checker that checks critical system service status via monit service.
+    The status of the critical processes is got from supervisorctl of every container once, and then only for the
+    containers which were restarted or had a critical process state change published to PROCESS_STATE table by
+    supervisor-proc-exit-listener.
     """
 
+    PROCESS_STATE_TABLE_NAME = 'PROCESS_STATE'
+
     # Cache file to save container_critical_processes
     CRITICAL_PROCESS_CACHE = '/tmp/critical_process_cache'
 
@@ -33,6 +41,16 @@ class ServiceChecker(HealthChecker):
     CHECK_CMD = 'monit summary -B'
     MIN_CHECK_CMD_LINES = 3
 
+    # Command to get the status of the processes in a container
+    SUPERVISORCTL_STATUS_CMD = 'docker exec {} bash -c "supervisorctl status"'
+
+    # Maximum seconds to wait for a command, e.g. a hung docker exec. The commands run one after the other share the
+    # checker timeout, see _get_command_timeout()
+    COMMAND_TIMEOUT = 20
+
+    # Maximum number of containers whose processes are queried at the same time
+    MAX_PROCESS_STATUS_WORKERS = 8
+
     # Expect status for different system service category.
     EXPECT_STATUS_DICT = {
         'System': 'Running',
@@ -53,6 +71,13 @@ class ServiceChecker(HealthChecker):
 
         self.config_db = None
 
+        # Container name -> check result of its critical processes
+        self.container_process_info = {}
+        # Containers whose critical processes have to be checked again
+        self.changed_containers = set()
+        self.running_containers = set()
+        self.command_timeout = ServiceChecker.COMMAND_TIMEOUT
+
         self.load_critical_process_cache()
 
     def get_expected_running_containers(self, feature_table):
@@ -206,19 +231,30 @@ class ServiceChecker(HealthChecker):
     def get_category(self):
         return 'Services'
 
+    def get_subscribed_tables(self):
+        return [ServiceChecker.PROCESS_STATE_TABLE_NAME]
+
+    def process_event(self, table, key, op, fvs):
+        # The key is <container name>|<process name>
+        self.changed_containers.add(key.split('|')[0])
+        return True
+
+    def invalidate(self):
+        self.container_process_info = {}
+
     def check_by_monit(self, config):
         """
         et and analyze the output of $CHECK_CMD, collect status for file system or customize checker if any.
         :param config: Health checker configuration.
         :return:
         """
-        output = utils.run_command(ServiceChecker.CHECK_MONIT_SERVICE_CMD)
+        output = utils.run_command(ServiceChecker.CHECK_MONIT_SERVICE_CMD, timeout=self.command_timeout)
         if not output or output.strip() != 'active':
             self.set_object_not_ok('Service', 'monit', 'monit service is not running')
             return
 
-        output = utils.run_command(ServiceChecker.CHECK_CMD)
-        lines = output.splitlines()
+        output = utils.run_command(ServiceChecker.CHECK_CMD, timeout=self.command_timeout)
+        lines = output.splitlines() if output else []
         if not lines or len(lines) < ServiceChecker.MIN_CHECK_CMD_LINES:
             self.set_object_not_ok('Service', 'monit', 'monit service is not ready')
             return
@@ -272,12 +308,49 @@ class ServiceChecker(HealthChecker):
             self.set_object_not_ok('Service', 'system', 'no critical process found')
             return
 
+        # A restarted container has new processes, check them again
+        self.changed_containers.update(current_running_containers.difference(self.running_containers))
+        self.running_containers = current_running_containers
+
+        # The cached result of a container which is not running is stale, its processes are checked again
+        for container in set(self.container_process_info.keys()).difference(
+                current_running_containers.intersection(self.container_critical_processes.keys())):
+            self.container_process_info.pop(container)
+
+        # A container whose processes are not OK is checked again every time, its processes may recover or fail in a
+        # way which isn't published to PROCESS_STATE
+        containers_to_check = [container for container in self.container_critical_processes
+                               if container not in self.container_process_info or container in self.changed_containers
+                               or not self._is_container_ok(container)]
+        process_status_dict = self.get_process_status(containers_to_check)
+
         for container, critical_process_list in self.container_critical_processes.items():
-            self.check_process_existence(container, critical_process_list, config, feature_table)
+            if container not in process_status_dict:
+                self._info.update(copy.deepcopy(self.container_process_info[container]))
+                continue
+
+            self.check_process_existence(container, critical_process_list, config, feature_table,
+                                         process_status_dict[container])
+            prefix = '{}:'.format(container)
+            self.container_process_info[container] = copy.deepcopy(
+                {name: info for name, info in self._info.items() if name.startswith(prefix)})
+        self.changed_containers.clear()
 
         for bad_container in self.bad_containers:
             self.set_object_not_ok('Service', bad_container, 'Syntax of critical_processes file is incorrect')
 
+    def _is_container_ok(self, container):
+        """Check whether the cached result of the critical processes of a container is OK
+
+        Args:
+            container (str): Container name
+
+        Returns:
+            True if all the critical processes of the container were OK at the last check
+        """
+        return all(info.get(HealthChecker.INFO_FIELD_OBJECT_STATUS) == HealthChecker.STATUS_OK
+                   for info in self.container_process_info.get(container, {}).values())
+
     def check(self, config):
         """Check critical system service status.
 
@@ -285,9 +358,25 @@ class ServiceChecker(HealthChecker):
             config (object): Health checker configuration.
         """
         self.reset()
+        self.command_timeout = self._get_command_timeout(config)
         self.check_by_monit(config)
         self.check_services(config)
 
+    def _get_command_timeout(self, config):
+        """Get the timeout of a command so the check finishes within the checker timeout. The timeout is split between
+           the two monit commands, the rounds of supervisorctl status commands and the rest of the check.
+
+        Args:
+            config (object): Health checker configuration.
+
+        Returns:
+            The command timeout in seconds
+        """
+        checker_timeout = config.checker_timeout if config else Config.DEFAULT_CHECKER_TIMEOUT
+        workers = ServiceChecker.MAX_PROCESS_STATUS_WORKERS
+        status_rounds = max(1, (len(self.container_critical_processes) + workers - 1) // workers)
+        return min(ServiceChecker.COMMAND_TIMEOUT, float(checker_timeout) / (status_rounds + 3))
+
 
     def _parse_supervisorctl_status(self, process_status):
         """Expected input:
@@ -308,7 +397,28 @@ class ServiceChecker(HealthChecker):
             data[items[0].strip()] = items[1].strip()
         return data
 
-    def check_process_existence(self, container_name, critical_process_list, config, feature_table):
+    def get_process_status(self, containers):
+        """Get the output of supervisorctl status of the containers concurrently, so a slow or hung container
+           doesn't delay the others
+
+        Args:
+            containers (list): Container names
+
+        Returns:
+            process_status_dict: A dictionary {<container_name>:<output of supervisorctl status or None>}
+        """
+        if not containers:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(len(containers), ServiceChecker.MAX_PROCESS_STATUS_WORKERS)) as executor:
+            outputs = executor.map(self._run_supervisorctl_status, containers)
+            return dict(zip(containers, outputs))
+
+    def _run_supervisorctl_status(self, container_name):
+        cmd = ServiceChecker.SUPERVISORCTL_STATUS_CMD.format(container_name)
+        return utils.run_command(cmd, timeout=self.command_timeout)
+
+    def check_process_existence(self, container_name, critical_process_list, config, feature_table, process_status):
         """Check whether the process in the specified container is running or not.
 
         Args:
@@ -316,6 +426,7 @@ class ServiceChecker(HealthChecker):
             critical_process_list (list): Critical processes
             config (object): Health checker configuration.
             feature_table (object): Feature table
+            process_status (str): Output of supervisorctl status in the container, None if it failed
         """
         feature_name = self.container_feature_dict[container_name]
         if feature_name in feature_table:
@@ -327,8 +438,6 @@ class ServiceChecker(HealthChecker):
                 # We are using supervisorctl status to check the critical process status. We cannot leverage psutil here because
                 # it not always possible to get process cmdline in supervisor.conf. E.g, cmdline of orchagent is "/usr/bin/orchagent",
                 # however, in supervisor.conf it is "/usr/bin/orchagent.sh"
-                cmd = 'docker exec {} bash -c "supervisorctl status"'.format(container_name)
-                process_status = utils.run_command(cmd)
                 if process_status is None:
                     for process_name in critical_process_list:
                         self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "'{}' is not running".format(process_name))
@@ -44,7 +44,8 @@ class UserDefinedChecker(HealthChecker):
         """
         self.reset()
 
-        output = utils.run_command(self._cmd)
+        # The command is killed when the manager stops waiting for it, so a hung command doesn't pile up
+        output = utils.run_command(self._cmd, timeout=config.checker_timeout if config else None)
         if not output:
             self.set_object_not_ok('UserDefine', str(self), 'Failed to get output of command \"{}\"'.format(self._cmd))
             return
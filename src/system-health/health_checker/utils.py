@@ -1,15 +1,27 @@
+import os
+import signal
 import subprocess
 
 
-def run_command(command):
+def run_command(command, timeout=None):
     """
     Utility function to run an shell command and return the output.
     :param command: Shell command string.
-    :return: Output of the shell command.
+    :param timeout: Seconds to wait for the command. The command and its children are killed when it expires.
+    :return: Output of the shell command, None if it failed or timed out.
     """
     try:
-        process = subprocess.Popen(command, shell=True, universal_newlines=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        return process.communicate()[0]
+        process = subprocess.Popen(command, shell=True, universal_newlines=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   start_new_session=timeout is not None)
+    except Exception:
+        return None
+
+    try:
+        return process.communicate(timeout=timeout)[0]
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.communicate()
+        return None
     except Exception:
         return None
 
@@ -11,6 +11,8 @@
 import copy
 import os
 import sys
+import threading
+import time
 from swsscommon import swsscommon
 
 from mock import Mock, MagicMock, patch
@@ -505,3 +507,253 @@ def test_utils():
 
     output = utils.run_command('ls')
     assert output
+
+
+def test_hardware_checker_events():
+    MockConnector.data.clear()
+    MockConnector.data.update({
+        'TEMPERATURE_INFO|ASIC': {
+            'temperature': '20',
+            'high_threshold': '21'
+        },
+        'FAN_INFO|fan1': {
+            'presence': 'True',
+            'status': 'True',
+            'speed': '60',
+            'speed_target': '60',
+            'speed_tolerance': '20'
+        },
+        'PSU_INFO|PSU 1': {
+            'presence': 'True',
+            'status': 'True',
+            'temp': '55',
+            'temp_threshold': '100',
+            'voltage': '10',
+            'voltage_min_threshold': '8',
+            'voltage_max_threshold': '15',
+        }
+    })
+
+    checker = HardwareChecker()
+    config = Config()
+    checker.check(config)
+    assert checker._info['fan1'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+
+    with patch.object(MockConnector, 'keys') as mock_keys:
+        fan1 = dict(MockConnector.data['FAN_INFO|fan1'], status='False')
+        assert checker.process_event('FAN_INFO', 'fan1', 'SET', fan1)
+        assert not checker.process_event('FAN_INFO', 'fan1', 'SET', fan1)
+        assert not checker.process_event('TEMPERATURE_INFO', 'PSU 1 Temp', 'SET', {'temperature': '20'})
+        checker.check(config)
+        assert checker._info['fan1'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+
+        assert checker.process_event('PSU_INFO', 'PSU 1', 'DEL', {})
+        checker.check(config)
+        assert 'PSU 1' not in checker._info
+        assert not mock_keys.called
+
+    checker.invalidate()
+    checker.check(config)
+    assert checker._info['fan1'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+    assert checker._info['PSU 1'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+
+
+@patch('swsscommon.swsscommon.ConfigDBConnector.connect', MagicMock())
+@patch('health_checker.service_checker.ServiceChecker._get_container_folder', MagicMock(return_value=test_path))
+@patch('health_checker.service_checker.ServiceChecker.check_by_monit', MagicMock())
+@patch('sonic_py_common.multi_asic.is_multi_asic', MagicMock(return_value=False))
+@patch('docker.DockerClient')
+@patch('health_checker.utils.run_command')
+@patch('swsscommon.swsscommon.ConfigDBConnector')
+def test_service_checker_process_events(mock_config_db, mock_run, mock_docker_client):
+    mock_db_data = MagicMock()
+    mock_db_data.get_table = MagicMock(return_value={
+        'snmp': {'state': 'enabled', 'has_global_scope': 'True', 'has_per_asic_scope': 'False'},
+        'lldp': {'state': 'enabled', 'has_global_scope': 'True', 'has_per_asic_scope': 'False'}
+    })
+    mock_config_db.return_value = mock_db_data
+    mock_containers = []
+    for name in ['snmp', 'lldp']:
+        mock_container = MagicMock()
+        mock_container.name = name
+        mock_containers.append(mock_container)
+    mock_docker_client.return_value.containers.list = MagicMock(return_value=mock_containers)
+    mock_run.return_value = mock_supervisorctl_output
+
+    checker = ServiceChecker()
+    config = Config()
+    checker.check(config)
+    assert mock_run.call_count == 2
+    assert checker._info['lldp:snmp-subagent'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+
+    # The processes which are not OK are checked again every time
+    mock_run.return_value = mock_supervisorctl_output.replace('EXITED', 'RUNNING')
+    checker.check(config)
+    assert mock_run.call_count == 4
+    assert checker._info['lldp:snmp-subagent'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+    assert checker._info['snmp:snmp-subagent'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+
+    # The processes which are OK are not checked again without a change
+    mock_run.return_value = mock_supervisorctl_output
+    checker.check(config)
+    assert mock_run.call_count == 4
+    assert checker._info['lldp:snmp-subagent'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+
+    assert checker.get_subscribed_tables() == ['PROCESS_STATE']
+    assert checker.process_event('PROCESS_STATE', 'lldp|snmp-subagent', 'SET', {'state': 'EXITED'})
+    checker.check(config)
+    assert mock_run.call_count == 5
+    assert checker._info['lldp:snmp-subagent'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+    assert checker._info['snmp:snmp-subagent'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+
+    checker.invalidate()
+    checker.check(config)
+    assert mock_run.call_count == 7
+    assert checker._info['snmp:snmp-subagent'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+
+    mock_run.return_value = mock_supervisorctl_output.replace('EXITED', 'RUNNING')
+    checker.check(config)
+    assert mock_run.call_count == 9
+    assert checker._info['snmp:snmpd'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+
+    # The cached result of a stopped container is not used
+    mock_docker_client.return_value.containers.list = MagicMock(return_value=mock_containers[1:])
+    mock_run.return_value = None
+    checker.check(config)
+    assert mock_run.call_count == 10
+    assert checker._info['snmp'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+    assert checker._info['snmp:snmpd'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+    assert checker._info['lldp:snmpd'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+
+
+@patch('swsscommon.swsscommon.ConfigDBConnector', MagicMock())
+@patch('health_checker.service_checker.ServiceChecker.check', MagicMock())
+@patch('health_checker.service_checker.ServiceChecker.get_info', MagicMock(return_value={}))
+@patch('health_checker.hardware_checker.HardwareChecker.process_event', MagicMock(return_value=True))
+@patch('health_checker.hardware_checker.HardwareChecker.invalidate')
+@patch('health_checker.hardware_checker.HardwareChecker.check')
+@patch('health_checker.hardware_checker.HardwareChecker.get_info')
+def test_manager_check_changed(mock_hw_info, mock_hw_check, mock_hw_invalidate):
+    chassis = MagicMock()
+    manager = HealthCheckerManager()
+    assert manager.get_subscribed_tables() == {'TEMPERATURE_INFO', 'FAN_INFO', 'PSU_INFO', 'PROCESS_STATE'}
+
+    mock_hw_info.return_value = {'fan1': {'type': 'Fan', 'message': '', 'status': 'OK'}}
+    stat = manager.check(chassis)
+    assert stat['Hardware']['fan1']['status'] == 'OK'
+    assert manager.summary == HealthChecker.summary == HealthChecker.STATUS_OK
+    assert mock_hw_invalidate.call_count == 1
+    assert manager.check_changed(chassis) is None
+
+    assert not manager.process_event('VLAN_TABLE', 'Vlan1000', 'SET', {})
+    assert manager.process_event('FAN_INFO', 'fan1', 'SET', {'status': 'False'})
+    mock_hw_info.return_value = {'fan1': {'type': 'Fan', 'message': 'fan1 is broken', 'status': 'Not OK'}}
+    stat = manager.check_changed(chassis)
+    assert stat['Hardware']['fan1']['status'] == 'Not OK'
+    assert manager.summary == HealthChecker.summary == HealthChecker.STATUS_NOT_OK
+    assert mock_hw_check.call_count == 2
+    assert manager.check_changed(chassis) is None
+
+    # The full rescan is done only when the interval elapsed
+    manager.check(chassis)
+    assert mock_hw_invalidate.call_count == 1
+    manager.config.full_rescan_interval = 0
+    manager.check(chassis)
+    assert mock_hw_invalidate.call_count == 2
+
+
+@patch('swsscommon.swsscommon.ConfigDBConnector', MagicMock())
+@patch('health_checker.hardware_checker.HardwareChecker.check', MagicMock())
+@patch('health_checker.hardware_checker.HardwareChecker.get_info', MagicMock(return_value={}))
+@patch('health_checker.service_checker.ServiceChecker.get_info', MagicMock(return_value={}))
+@patch('health_checker.service_checker.ServiceChecker.check')
+def test_manager_checker_timeout(mock_service_check):
+    release = threading.Event()
+    mock_service_check.side_effect = lambda config: release.wait(5)
+    chassis = MagicMock()
+    manager = HealthCheckerManager()
+    manager.config.checker_timeout = 0.1
+
+    start = time.monotonic()
+    stat = manager.check(chassis)
+    assert time.monotonic() - start < 5
+    assert stat['Internal']['ServiceChecker']['status'] == 'Not OK'
+    assert 'timed out' in stat['Internal']['ServiceChecker']['message']
+    assert manager.checker_stats['ServiceChecker']['status'] == HealthCheckerManager.CHECKER_STATUS_TIMEOUT
+    assert manager.checker_stats['HardwareChecker']['status'] == HealthCheckerManager.CHECKER_STATUS_FINISHED
+    assert manager.summary == HealthChecker.summary == HealthChecker.STATUS_NOT_OK
+
+    # The hung checker is not started again while it is running
+    manager.check(chassis)
+    assert mock_service_check.call_count == 1
+
+    release.set()
+    stat = manager.check(chassis)
+    assert 'Internal' not in stat
+    assert manager.checker_stats['ServiceChecker']['status'] == HealthCheckerManager.CHECKER_STATUS_FINISHED
+    assert manager.summary == HealthChecker.summary == HealthChecker.STATUS_OK
+
+
+@patch('swsscommon.swsscommon.ConfigDBConnector', MagicMock())
+@patch('health_checker.service_checker.ServiceChecker.check', MagicMock())
+@patch('health_checker.service_checker.ServiceChecker.get_info', MagicMock(return_value={}))
+@patch('health_checker.hardware_checker.HardwareChecker.get_info', MagicMock(return_value={}))
+@patch('health_checker.hardware_checker.HardwareChecker.invalidate')
+@patch('health_checker.hardware_checker.HardwareChecker.process_event')
+@patch('health_checker.hardware_checker.HardwareChecker.check')
+def test_manager_queues_events_of_running_checker(mock_hw_check, mock_hw_process_event, mock_hw_invalidate):
+    release = threading.Event()
+    mock_hw_check.side_effect = lambda config: release.wait(5)
+    mock_hw_process_event.return_value = True
+    chassis = MagicMock()
+    manager = HealthCheckerManager()
+    manager.config.checker_timeout = 0.1
+
+    manager.check(chassis)
+    assert manager.checker_stats['HardwareChecker']['status'] == HealthCheckerManager.CHECKER_STATUS_TIMEOUT
+    assert mock_hw_invalidate.call_count == 1
+
+    # The timed out checker is still running, its state is not modified
+    assert manager.process_event('FAN_INFO', 'fan1', 'SET', {'status': 'False'})
+    manager.config.full_rescan_interval = 0
+    manager.check(chassis)
+    assert mock_hw_process_event.call_count == 0
+    assert mock_hw_invalidate.call_count == 1
+
+    release.set()
+    manager.config.full_rescan_interval = 3600
+    manager.check(chassis)
+    assert manager.checker_stats['HardwareChecker']['status'] == HealthCheckerManager.CHECKER_STATUS_FINISHED
+    mock_hw_process_event.assert_called_once_with('FAN_INFO', 'fan1', 'SET', {'status': 'False'})
+    assert mock_hw_invalidate.call_count == 2
+
+    # The checker is checked again with the events it received while it was running
+    manager.check_changed(chassis)
+    assert mock_hw_check.call_count == 2
+    assert manager.check_changed(chassis) is None
+
+
+def test_service_checker_command_timeout():
+    config = Config()
+    checker = ServiceChecker()
+    checker.container_critical_processes = {'container{}'.format(i): ['process'] for i in range(10)}
+    assert checker._get_command_timeout(config) == 6
+    assert checker._get_command_timeout(None) == 6
+    config.checker_timeout = 300
+    assert checker._get_command_timeout(config) == ServiceChecker.COMMAND_TIMEOUT
+
+
+def test_set_object_not_ok_keeps_summary():
+    # The summary is computed by the manager only, checkers running on the thread pool don't change it
+    HealthChecker.summary = HealthChecker.STATUS_OK
+    checker = HardwareChecker()
+    checker.set_object_not_ok('Fan', 'fan1', 'fan1 is broken')
+    assert checker.get_info()['fan1'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+    assert HealthChecker.summary == HealthChecker.STATUS_OK
+
+
+def test_run_command_timeout():
+    start = time.monotonic()
+    assert utils.run_command('sleep 10; echo done', timeout=0.1) is None
+    assert time.monotonic() - start < 5
+    assert utils.run_command('echo done', timeout=5) == 'done\n'